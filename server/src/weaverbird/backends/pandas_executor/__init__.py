@@ -1,2 +1,13 @@
 # ruff: noqa
-from .pipeline_executor import PipelineExecutionFailure, execute_pipeline, preview_pipeline
+from .cache import PipelineCache
+from .dag import PipelineDag, compile_pipeline, execute_pipeline_as_dag
+from .domain_retriever import CachingDomainRetriever
+from .instrumentation import Instrumentation, InstrumentationLevel
+from .pipeline_executor import (
+    PipelineExecutionFailure,
+    execute_pipeline,
+    execute_pipeline_async,
+    preview_pipeline,
+    preview_pipeline_async,
+)
+from .streaming import chunked, stream_pipeline
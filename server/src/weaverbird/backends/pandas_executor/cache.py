@@ -0,0 +1,86 @@
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from threading import Lock
+
+from pandas import DataFrame
+
+from weaverbird.backends.pandas_executor.steps.utils.combination import step_domains
+from weaverbird.pipeline import PipelineStep
+from weaverbird.pipeline.fingerprint import fingerprint_steps
+from weaverbird.pipeline.steps.utils.combination import Reference
+
+DomainVersionGetter = Callable[[str | Reference], Hashable]
+
+
+class PipelineCache:
+    """
+    A cache of intermediate results of the pandas executor.
+
+    Results are keyed by the fingerprint of the pipeline prefix which produced them (see `Pipeline.fingerprint`), along
+    with the version of every domain read by that prefix. When executing a pipeline with a cache, only the steps after
+    the longest cached prefix are executed.
+
+    Least recently used results are evicted once the total size of cached DataFrames exceeds `max_size_in_bytes`.
+    Cached DataFrames are copied on the way in and out, so that steps modifying their input in place can not alter
+    them.
+    """
+
+    def __init__(self, max_size_in_bytes: int, domain_version: DomainVersionGetter | None = None) -> None:
+        self.max_size_in_bytes = max_size_in_bytes
+        self._domain_version = domain_version or (lambda domain: None)
+        self._entries: OrderedDict[str, tuple[DataFrame, int]] = OrderedDict()
+        self._size_in_bytes = 0
+        self._lock = Lock()
+
+    @property
+    def size_in_bytes(self) -> int:
+        return self._size_in_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def prefix_keys(self, steps: Sequence[PipelineStep]) -> list[str]:
+        """Returns the cache key of every prefix of `steps`, the nth key being the one of the n+1 first steps"""
+        versions_digest = hashlib.sha256()
+        keys = []
+        for step, prefix_digest in zip(steps, fingerprint_steps(steps).prefix_digests, strict=True):
+            for domain in step_domains(step):
+                versions_digest.update(repr((domain, self._domain_version(domain))).encode())
+            keys.append(f"{prefix_digest}:{versions_digest.hexdigest()}")
+        return keys
+
+    def get(self, key: str) -> DataFrame | None:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0].copy()
+
+    def get_longest_prefix(self, keys: Sequence[str]) -> tuple[int, DataFrame | None]:
+        """
+        Returns the length of the longest prefix having a cached result, along with this result.
+        """
+        for length in range(len(keys), 0, -1):
+            if (df := self.get(keys[length - 1])) is not None:
+                return length, df
+        return 0, None
+
+    def put(self, key: str, df: DataFrame) -> None:
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_size_in_bytes:
+            return
+        df = df.copy()
+        with self._lock:
+            if (previous := self._entries.pop(key, None)) is not None:
+                self._size_in_bytes -= previous[1]
+            self._entries[key] = (df, size)
+            self._size_in_bytes += size
+            while self._size_in_bytes > self.max_size_in_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_in_bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_in_bytes = 0
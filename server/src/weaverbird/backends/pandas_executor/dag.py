@@ -0,0 +1,214 @@
+"""
+Execution of a pipeline as a directed acyclic graph of steps.
+
+`append` and `join` steps make a pipeline a tree, in which the same sub-pipeline often appears several times. Each
+step of a pipeline (or of any of its sub-pipelines) becomes a node of the graph, identified by the fingerprint of the
+steps leading to it: structurally identical sub-pipelines, or sub-pipelines sharing their first steps, share their
+nodes, which are executed once.
+"""
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+
+from geopandas import GeoDataFrame
+from pandas import DataFrame
+
+from weaverbird.backends.pandas_executor.pipeline_executor import PipelineExecutionFailure, execute_pipeline
+from weaverbird.backends.pandas_executor.steps import steps_executors
+from weaverbird.backends.pandas_executor.steps.utils.combination import SubPipelinesExecutor, combined_pipelines
+from weaverbird.backends.pandas_executor.types import (
+    DomainRetriever,
+    PipelineExecutionReport,
+    StepExecutionReport,
+)
+from weaverbird.pipeline import Pipeline, PipelineStep
+from weaverbird.pipeline.fingerprint import fingerprint_steps
+from weaverbird.pipeline.steps import DomainStep
+from weaverbird.pipeline.steps.utils.combination import PipelineOrDomainNameOrReference, Reference
+from weaverbird.utils import StopWatch
+
+
+@dataclass(kw_only=True)
+class DagNode:
+    key: str
+    step: PipelineStep
+    # Index of the step in its pipeline
+    index: int
+    # Node whose result is the input of the step, None for the first step of a pipeline
+    parent: str | None
+    # Keys of the nodes of each sub-pipeline of the step (append and join steps)
+    sub_pipelines: list[list[str]] = field(default_factory=list)
+    # Index of the step of the main pipeline whose sub-pipelines first required this node, None if the node is a step
+    # of the main pipeline
+    main_step_index: int | None = None
+
+    @property
+    def dependencies(self) -> list[str]:
+        return ([self.parent] if self.parent is not None else []) + [keys[-1] for keys in self.sub_pipelines]
+
+
+@dataclass(kw_only=True)
+class PipelineDag:
+    pipeline: Pipeline
+    # Nodes are in a topological order: a node comes after all its dependencies
+    nodes: dict[str, DagNode]
+    # Keys of the nodes of the main pipeline
+    main_keys: list[str]
+
+
+def _as_steps(pipeline: PipelineOrDomainNameOrReference) -> list[PipelineStep]:
+    if isinstance(pipeline, str | Reference):
+        return [DomainStep(domain=pipeline)]
+    return pipeline
+
+
+def _compile_steps(
+    steps: list[PipelineStep], nodes: dict[str, DagNode], main_step_index: int | None = None
+) -> list[str]:
+    keys = fingerprint_steps(steps).prefix_digests
+    for index, (step, key) in enumerate(zip(steps, keys, strict=True)):
+        if key in nodes:
+            continue
+        sub_pipelines = [
+            _compile_steps(
+                _as_steps(pipeline), nodes, main_step_index=index if main_step_index is None else main_step_index
+            )
+            for pipeline in combined_pipelines(step)
+        ]
+        nodes[key] = DagNode(
+            key=key,
+            step=step,
+            index=index,
+            parent=keys[index - 1] if index > 0 else None,
+            sub_pipelines=sub_pipelines,
+            main_step_index=main_step_index,
+        )
+    return keys
+
+
+def compile_pipeline(pipeline: Pipeline) -> PipelineDag:
+    """Compiles a pipeline and all its sub-pipelines into a single graph of steps"""
+    nodes: dict[str, DagNode] = {}
+    main_keys = _compile_steps(pipeline.steps, nodes)
+    return PipelineDag(pipeline=pipeline, nodes=nodes, main_keys=main_keys)
+
+
+def _execute_node(
+    node: DagNode, df: DataFrame | None, sub_pipelines_results: list[DataFrame], domain_retriever: DomainRetriever
+) -> tuple[DataFrame, StepExecutionReport]:
+    # Sub-pipelines have already been executed as nodes of the graph: the step only has to consume their results
+    sub_pipelines_executor = SubPipelinesExecutor(execute_pipeline)
+    for pipeline, result in zip(combined_pipelines(node.step), sub_pipelines_results, strict=True):
+        sub_pipelines_executor.set_result(pipeline, result)
+
+    stopwatch = StopWatch()
+    with stopwatch:
+        df = steps_executors[node.step.name](
+            node.step, df, domain_retriever=domain_retriever, execute_pipeline=sub_pipelines_executor
+        )
+    return df, StepExecutionReport(
+        step_index=node.index,
+        memory_used_in_bytes=df.memory_usage().sum(),
+        time_spent_in_ms=int(stopwatch.interval * 1000),
+    )
+
+
+def _failure(dag: PipelineDag, node: DagNode, exception: Exception) -> PipelineExecutionFailure:
+    failure = PipelineExecutionFailure(node.step, node.index, exception)
+    if node.main_step_index is None:
+        return failure
+    main_step = dag.pipeline.steps[node.main_step_index]
+    return PipelineExecutionFailure(main_step, node.main_step_index, failure)
+
+
+def _pipeline_report(
+    dag: PipelineDag, keys: Iterable[str], reports: dict[str, StepExecutionReport]
+) -> PipelineExecutionReport:
+    steps_reports = []
+    for key in keys:
+        node = dag.nodes[key]
+        sub_pipelines_reports = [
+            _pipeline_report(dag, sub_keys, reports)
+            for pipeline, sub_keys in zip(combined_pipelines(node.step), node.sub_pipelines, strict=True)
+            # Like in `execute_pipeline`, domains are not reported as pipelines
+            if not isinstance(pipeline, str | Reference)
+        ]
+        steps_reports.append(reports[key].model_copy(update={"sub_pipelines_reports": sub_pipelines_reports}))
+    return PipelineExecutionReport(steps_reports=steps_reports)
+
+
+def execute_pipeline_as_dag(
+    pipeline: Pipeline, domain_retriever: DomainRetriever, *, pool: Executor | None = None
+) -> tuple[DataFrame, PipelineExecutionReport]:
+    """
+    Executes a pipeline as a graph of steps (see `compile_pipeline`), giving the same result as `execute_pipeline`.
+
+    Steps shared by several (sub-)pipelines are executed once, and their result is passed to each of the steps
+    consuming it as a shallow copy. Results are released as soon as all the steps consuming them are executed.
+
+    With a `pool`, steps are executed in it as soon as their inputs are available, so that independent branches run
+    concurrently. Process pools require a picklable domain retriever, and copy the intermediate results between
+    processes.
+
+    The reports of shared steps are repeated in each of the pipelines they belong to.
+    """
+    dag = compile_pipeline(pipeline)
+    results: dict[str, DataFrame] = {}
+    reports: dict[str, StepExecutionReport] = {}
+    # Number of steps which still have to consume the result of each node. The output of the pipeline is consumed by
+    # the caller
+    remaining_consumers = Counter(key for node in dag.nodes.values() for key in node.dependencies)
+    remaining_consumers[dag.main_keys[-1]] += 1
+
+    def node_inputs(node: DagNode) -> tuple[DataFrame | None, list[DataFrame]]:
+        df = results[node.parent].copy(deep=False) if node.parent is not None else None
+        sub_pipelines_results = [results[keys[-1]] for keys in node.sub_pipelines]
+        for key in node.dependencies:
+            remaining_consumers[key] -= 1
+            if remaining_consumers[key] == 0:
+                del results[key]
+        return df, sub_pipelines_results
+
+    if pool is None:
+        for key, node in dag.nodes.items():
+            try:
+                results[key], reports[key] = _execute_node(node, *node_inputs(node), domain_retriever)
+            except Exception as e:
+                raise _failure(dag, node, e) from e
+    else:
+        dependents: dict[str, set[str]] = defaultdict(set)
+        missing_dependencies: dict[str, int] = {}
+        for key, node in dag.nodes.items():
+            missing_dependencies[key] = len(set(node.dependencies))
+            for dependency in node.dependencies:
+                dependents[dependency].add(key)
+        ready = [key for key, count in missing_dependencies.items() if count == 0]
+        futures: dict[Future, str] = {}
+        try:
+            while ready or futures:
+                for key in ready:
+                    node = dag.nodes[key]
+                    futures[pool.submit(_execute_node, node, *node_inputs(node), domain_retriever)] = key
+                ready = []
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = futures.pop(future)
+                    try:
+                        results[key], reports[key] = future.result()
+                    except Exception as e:
+                        raise _failure(dag, dag.nodes[key], e) from e
+                    for dependent in dependents[key]:
+                        missing_dependencies[dependent] -= 1
+                        if missing_dependencies[dependent] == 0:
+                            ready.append(dependent)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    df = results[dag.main_keys[-1]]
+    if isinstance(df, GeoDataFrame):
+        # GeoDataFrame.to_json does not support orient='records'
+        df = DataFrame(df)
+    return df, _pipeline_report(dag, dag.main_keys, reports)
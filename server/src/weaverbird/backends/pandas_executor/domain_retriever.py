@@ -0,0 +1,111 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+
+from pandas import DataFrame
+
+from weaverbird.backends.pandas_executor.types import DomainRetriever
+from weaverbird.pipeline.steps.utils.combination import Reference
+
+
+@dataclass(kw_only=True)
+class _CachedDomain:
+    df: DataFrame
+    size_in_bytes: int
+    retrieved_at: float
+
+
+class CachingDomainRetriever:
+    """
+    A `DomainRetriever` keeping the domains returned by another retriever in memory, so that a domain referenced
+    several times (in `join` or `append` steps for instance) is only retrieved once.
+
+    Least recently used domains are evicted once their total size exceeds `max_size_in_bytes`, and domains are
+    retrieved again once they are older than `ttl_in_seconds`. Both are unlimited by default.
+
+    Callers get a deep copy of the cached DataFrame, like with `PipelineCache`, so that modifying it in place (with
+    `.loc` for instance) does not alter the cached domain. With `deep_copy=False`, they get a cheaper shallow copy,
+    which is only safe if the DataFrames are never modified in place, e.g. with pandas' copy-on-write mode.
+    """
+
+    def __init__(
+        self,
+        domain_retriever: DomainRetriever,
+        *,
+        max_size_in_bytes: int | None = None,
+        ttl_in_seconds: float | None = None,
+        deep_copy: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._domain_retriever = domain_retriever
+        self.max_size_in_bytes = max_size_in_bytes
+        self.ttl_in_seconds = ttl_in_seconds
+        self._deep_copy = deep_copy
+        self._clock = clock
+        self._domains: OrderedDict[str | Reference, _CachedDomain] = OrderedDict()
+        self._size_in_bytes = 0
+        self._lock = Lock()
+        # One lock per domain, so that concurrent calls for the same domain only retrieve it once
+        self._retrieval_locks: dict[str | Reference, Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size_in_bytes(self) -> int:
+        return self._size_in_bytes
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+    def _pop(self, domain: str | Reference) -> None:
+        if (cached := self._domains.pop(domain, None)) is not None:
+            self._size_in_bytes -= cached.size_in_bytes
+
+    def _get(self, domain: str | Reference) -> DataFrame | None:
+        if (cached := self._domains.get(domain)) is None:
+            return None
+        if self.ttl_in_seconds is not None and self._clock() - cached.retrieved_at > self.ttl_in_seconds:
+            self._pop(domain)
+            return None
+        self._domains.move_to_end(domain)
+        self.hits += 1
+        return cached.df.copy(deep=self._deep_copy)
+
+    def _put(self, domain: str | Reference, df: DataFrame) -> None:
+        size = int(df.memory_usage(deep=True).sum())
+        if self.max_size_in_bytes is not None and size > self.max_size_in_bytes:
+            return
+        self._pop(domain)
+        self._domains[domain] = _CachedDomain(df=df, size_in_bytes=size, retrieved_at=self._clock())
+        self._size_in_bytes += size
+        while self.max_size_in_bytes is not None and self._size_in_bytes > self.max_size_in_bytes:
+            _, evicted = self._domains.popitem(last=False)
+            self._size_in_bytes -= evicted.size_in_bytes
+
+    def __call__(self, domain: str | Reference) -> DataFrame:
+        with self._lock:
+            if (df := self._get(domain)) is not None:
+                return df
+            retrieval_lock = self._retrieval_locks.setdefault(domain, Lock())
+
+        with retrieval_lock:
+            with self._lock:
+                # The domain may have been retrieved by another thread in the meantime
+                if (df := self._get(domain)) is not None:
+                    return df
+                self.misses += 1
+            df = self._domain_retriever(domain)
+            with self._lock:
+                self._put(domain, df)
+        return df.copy(deep=self._deep_copy)
+
+    def invalidate(self, domain: str | Reference | None = None) -> None:
+        """Drops a domain from the cache, or every domain if none is given"""
+        with self._lock:
+            if domain is None:
+                self._domains.clear()
+                self._size_in_bytes = 0
+            else:
+                self._pop(domain)
@@ -0,0 +1,182 @@
+"""
+Instrumentation of the steps executed by the pandas executor.
+
+The instrumentation level determines what is measured after each step, from nothing at all to the memory used by the
+objects (strings, mostly) stored in the result, which can take as long as the step itself on large results.
+
+Steps can also be profiled (see `StepProfiler`), which slows their execution down significantly.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+from pandas import DataFrame
+
+from weaverbird.backends.pandas_executor.types import StepExecutionReport, StepProfile
+from weaverbird.pipeline import PipelineStep
+
+
+class InstrumentationLevel(str, Enum):
+    # Neither logs steps nor measures memory
+    OFF = "off"
+    # Logs the time spent in steps and the shape of their results. Memory used by objects is not accounted for
+    CHEAP = "cheap"
+    # Also logs the steps' details and the memory used by their results, including objects (estimated from a sample)
+    DEEP = "deep"
+
+
+# Called with the step, its index and its input, before the step is executed
+BeforeStepCallback = Callable[[PipelineStep, int, DataFrame | None], None]
+# Called with the step, its index, its result and its report, after the step is executed
+AfterStepCallback = Callable[[PipelineStep, int, DataFrame, StepExecutionReport], None]
+
+
+def estimate_memory_usage(df: DataFrame, sample_size: int | None = None) -> int:
+    """
+    Returns the memory used by a DataFrame, including the objects it contains.
+
+    With a `sample_size`, the memory used by objects is extrapolated from about `sample_size` evenly spaced rows.
+    """
+    if sample_size is None or len(df) <= sample_size:
+        return int(df.memory_usage(deep=True).sum())
+    sample = df.iloc[:: len(df) // sample_size]
+    objects_memory = sample.memory_usage(deep=True, index=False).sum() - sample.memory_usage(index=False).sum()
+    return int(df.memory_usage().sum() + objects_memory * len(df) / len(sample))
+
+
+def _numpy_columns(df: DataFrame) -> list[np.ndarray]:
+    return [
+        df.iloc[:, position].to_numpy(copy=False)
+        for position, dtype in enumerate(df.dtypes)
+        if dtype.kind in "biufcmMO"
+    ]
+
+
+def _copied_columns(columns_in: list[np.ndarray] | None, df_out: DataFrame) -> int | None:
+    if columns_in is None:
+        return None
+    return sum(
+        1
+        for column_out in _numpy_columns(df_out)
+        if not any(np.may_share_memory(column_out, column_in) for column_in in columns_in)
+    )
+
+
+class StepProfiler:
+    """
+    Profiles the execution of a step, as a context manager.
+
+    tracemalloc is started if it is not tracing yet. As it traces the whole process, steps executed concurrently
+    share their peak memory.
+    """
+
+    def __init__(
+        self,
+        step: PipelineStep,
+        index: int,
+        df_in: DataFrame | None,
+        *,
+        profile_calls: bool = False,
+        calls_stats_directory: Path | None = None,
+    ) -> None:
+        self.step = step
+        self.index = index
+        # Gathered before the step is executed, as steps can replace the columns of their input
+        self._numpy_columns_in = None if df_in is None else _numpy_columns(df_in)
+        self._rows_in = None if df_in is None else len(df_in)
+        self._columns_in = None if df_in is None else len(df_in.columns)
+        self._calls_profile = cProfile.Profile() if profile_calls else None
+        self._calls_stats_directory = calls_stats_directory
+
+    def __enter__(self) -> "StepProfiler":
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._memory_at_start = tracemalloc.get_traced_memory()[0]
+        self._wall_time_at_start = time.perf_counter()
+        self._cpu_time_at_start = time.thread_time()
+        if self._calls_profile is not None:
+            self._calls_profile.enable()
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        if self._calls_profile is not None:
+            self._calls_profile.disable()
+        self._cpu_time = time.thread_time() - self._cpu_time_at_start
+        self._wall_time = time.perf_counter() - self._wall_time_at_start
+        self._peak_memory = tracemalloc.get_traced_memory()[1] - self._memory_at_start
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def _calls_stats(self) -> str | None:
+        if self._calls_profile is None:
+            return None
+        if self._calls_stats_directory is not None:
+            self._calls_profile.dump_stats(self._calls_stats_directory / f"{self.index}-{self.step.name}.pstats")
+        stream = io.StringIO()
+        pstats.Stats(self._calls_profile, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(20)
+        return stream.getvalue()
+
+    def profile(self, df_out: DataFrame) -> StepProfile:
+        """Returns the profile of the step, given its result"""
+        return StepProfile(
+            rows_in=self._rows_in,
+            columns_in=self._columns_in,
+            rows_out=len(df_out),
+            columns_out=len(df_out.columns),
+            wall_time_in_ms=self._wall_time * 1000,
+            cpu_time_in_ms=self._cpu_time * 1000,
+            peak_memory_in_bytes=max(self._peak_memory, 0),
+            copied_columns=_copied_columns(self._numpy_columns_in, df_out),
+            calls_stats=self._calls_stats(),
+        )
+
+
+@dataclass(kw_only=True)
+class Instrumentation:
+    level: InstrumentationLevel = InstrumentationLevel.CHEAP
+    # User-supplied callbacks are called whatever the level
+    before_step: list[BeforeStepCallback] = field(default_factory=list)
+    after_step: list[AfterStepCallback] = field(default_factory=list)
+    # Number of rows from which the memory used by objects is estimated at the deep level, None to scan every row
+    memory_sample_size: int | None = 1000
+    # Adds a profile to the report of each step (see `StepProfiler`). Steps of sub-pipelines are not profiled: their
+    # cost is part of the profile of the step consuming them
+    profile: bool = False
+    # With `profile`, also profiles the functions called by each step with cProfile, keeping the stats of the slowest
+    # ones in the profile. They are also dumped in `calls_stats_directory` if set, one pstats file per step
+    profile_calls: bool = False
+    calls_stats_directory: Path | None = None
+
+    def step_profiler(self, step: PipelineStep, index: int, df: DataFrame | None) -> StepProfiler | None:
+        if not self.profile:
+            return None
+        return StepProfiler(
+            step, index, df, profile_calls=self.profile_calls, calls_stats_directory=self.calls_stats_directory
+        )
+
+    def memory_usage(self, df: DataFrame) -> int:
+        """Memory used by a step's result, as reported at this level"""
+        match self.level:
+            case InstrumentationLevel.OFF:
+                return 0
+            case InstrumentationLevel.CHEAP:
+                return int(df.memory_usage().sum())
+        return estimate_memory_usage(df, self.memory_sample_size)
+
+    def notify_before_step(self, step: PipelineStep, index: int, df: DataFrame | None) -> None:
+        for callback in self.before_step:
+            callback(step, index, df)
+
+    def notify_after_step(self, step: PipelineStep, index: int, df: DataFrame, report: StepExecutionReport) -> None:
+        for callback in self.after_step:
+            callback(step, index, df, report)
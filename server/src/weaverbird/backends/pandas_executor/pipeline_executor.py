@@ -1,106 +1,348 @@
-import json
+import asyncio
 import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
+from functools import partial
 
 from geopandas import GeoDataFrame
-from pandas import DataFrame
-from pandas.io.json import build_table_schema
+from pandas import DataFrame, concat
 
+from weaverbird.backends.pandas_executor.cache import PipelineCache
+from weaverbird.backends.pandas_executor.instrumentation import Instrumentation, InstrumentationLevel
+from weaverbird.backends.pandas_executor.planner import PlannedStep, is_row_wise, plan_pipeline
+from weaverbird.backends.pandas_executor.serialization import PreviewOrient, serialize_preview
 from weaverbird.backends.pandas_executor.steps import steps_executors
+from weaverbird.backends.pandas_executor.steps.utils.combination import SubPipelinesExecutor, step_domains
 from weaverbird.backends.pandas_executor.types import (
+    AsyncDomainRetriever,
     DomainRetriever,
     PipelineExecutionReport,
     StepExecutionReport,
 )
 from weaverbird.exceptions import PipelineFailure
 from weaverbird.pipeline import Pipeline, PipelineStep
+from weaverbird.pipeline.steps.utils.combination import Reference
 from weaverbird.utils import StopWatch, convert_size
 
 logger = logging.getLogger(__name__)
 
+# Number of rows of the first chunk processed by limit-aware previews. Following chunks are twice as large as the
+# previous one
+PREVIEW_MIN_CHUNK_SIZE = 1000
+
 
 def execute_pipeline(
-    pipeline: Pipeline, domain_retriever: DomainRetriever
+    pipeline: Pipeline,
+    domain_retriever: DomainRetriever,
+    *,
+    optimize: bool = False,
+    cache: PipelineCache | None = None,
+    pool: Executor | None = None,
+    instrumentation: Instrumentation | None = None,
 ) -> tuple[DataFrame, PipelineExecutionReport]:
     """
     The main function of the module. Execute a pipeline and returns the result as a pandas DataFrame.
 
     Its domain retriever will be use to retrieve data needed from `domains` steps.
+
+    With `optimize=True`, the pipeline (and its sub-pipelines) is first turned into a logical plan (see
+    `planner.plan_pipeline`). Steps fused by the planner produce a single report, indexed after the first of them.
+
+    With a `cache`, the execution resumes from the longest cached prefix of the pipeline, and the results of the
+    executed prefixes are cached. Steps whose result comes from the cache are not reported.
+
+    With a `pool`, the sub-pipelines of `append` and `join` steps are executed concurrently in it (see
+    `SubPipelinesExecutor`). Their own sub-pipelines are executed sequentially, in the same worker. Process pools
+    require a picklable domain retriever, and do not share the cache.
+
+    `instrumentation` determines what is logged and measured after each step, and the callbacks to call around each
+    step (see `Instrumentation`). Steps are instrumented at the cheap level by default. Profiles of the steps, when
+    enabled, are part of their reports, which can be exported with `PipelineExecutionReport.model_dump_json()`.
     """
     # TODO validate the pipeline, e.g. the first step should always be a domain step
     # validate_pipeline()
-    steps = pipeline.steps
     df = None
+    start = 0
+    prefix_keys: list[str] = []
+    if cache is not None:
+        prefix_keys = cache.prefix_keys(pipeline.steps)
+        start, df = cache.get_longest_prefix(prefix_keys)
+    remaining_steps = pipeline.steps[start:]
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+
+    sub_pipelines_executor = SubPipelinesExecutor(
+        partial(
+            execute_pipeline,
+            optimize=optimize,
+            cache=None if isinstance(pool, ProcessPoolExecutor) else cache,
+            instrumentation=replace(instrumentation, profile=False),
+        ),
+        pool=pool,
+    )
+    if optimize:
+        planned_steps = plan_pipeline(Pipeline(steps=remaining_steps)).steps
+    else:
+        planned_steps = [PlannedStep(step=step, indexes=(index,)) for index, step in enumerate(remaining_steps)]
+
     stopwatch = StopWatch()
     step_reports = []
-    for index, step in enumerate(steps):
-        try:
-            with stopwatch:
-                df = steps_executors[step.name](
-                    step,
-                    df,
-                    domain_retriever=domain_retriever,
-                    execute_pipeline=execute_pipeline,
-                )
-            logger.info(
-                "[step-monitor]",
-                extra={
-                    "type": "monitoring",
-                    "step": {
-                        "type": "pandas",
-                        "index": index + 1,
-                        "name": step.name,
-                        "details": step.model_dump(),
-                        "elapsed_time": stopwatch.interval * 1000,
-                        "sizes": {
-                            "memory_used": convert_size(df.memory_usage(deep=True).sum()),
-                            "rows": len(df),
-                            "columns": len(df.columns),
-                        },
-                    },
-                },
-            )
-            step_reports.append(
-                StepExecutionReport(
+    # Indexes of the steps executed so far, and whether their result can be cached
+    executed_indexes: set[int] = set()
+    cacheable = True
+    sub_pipelines_executor.submit((planned_step.step for planned_step in planned_steps), domain_retriever)
+    try:
+        for planned_step in planned_steps:
+            step, index = planned_step.step, start + planned_step.index
+            try:
+                instrumentation.notify_before_step(step, index, df)
+                profiler = instrumentation.step_profiler(step, index, df)
+                with stopwatch, profiler or nullcontext():
+                    df = steps_executors[step.name](
+                        step,
+                        df,
+                        domain_retriever=domain_retriever,
+                        execute_pipeline=sub_pipelines_executor,
+                    )
+                    if planned_step.keep_columns is not None:
+                        df = df[[col for col in df.columns if col in planned_step.keep_columns]]
+                        cacheable = False
+                executed_indexes.update(planned_step.indexes)
+                # Planned steps may be reordered: a result is cached only once it matches a prefix of the pipeline
+                if cache is not None and cacheable and executed_indexes == set(range(len(executed_indexes))):
+                    cache.put(prefix_keys[start + len(executed_indexes) - 1], df)
+                step_report = StepExecutionReport(
                     step_index=index,
-                    memory_used_in_bytes=df.memory_usage().sum(),
+                    memory_used_in_bytes=instrumentation.memory_usage(df),
                     time_spent_in_ms=int(stopwatch.interval * 1000),
+                    sub_pipelines_reports=sub_pipelines_executor.pop_reports(),
+                    profile=profiler.profile(df) if profiler is not None else None,
                 )
-            )
-        except Exception as e:
-            raise PipelineExecutionFailure(step, index, e) from e
+                _log_step(step, index, df, stopwatch.interval, step_report, instrumentation.level)
+                instrumentation.notify_after_step(step, index, df, step_report)
+                step_reports.append(step_report)
+            except Exception as e:
+                raise PipelineExecutionFailure(step, index, e) from e
+    finally:
+        sub_pipelines_executor.cancel()
     if isinstance(df, GeoDataFrame):
         # GeoDataFrame.to_json does not support orient='records'
         df = DataFrame(df)
     return df, PipelineExecutionReport(steps_reports=step_reports)
 
 
-def preview_pipeline(pipeline: Pipeline, domain_retriever: DomainRetriever, limit: int = 50, offset: int = 0) -> str:
+def _log_step(
+    step: PipelineStep,
+    index: int,
+    df: DataFrame,
+    elapsed_time: float,
+    report: StepExecutionReport,
+    level: InstrumentationLevel,
+) -> None:
+    if level == InstrumentationLevel.OFF:
+        return
+    monitoring: dict = {
+        "type": "pandas",
+        "index": index + 1,
+        "name": step.name,
+        "elapsed_time": elapsed_time * 1000,
+        "sizes": {"rows": len(df), "columns": len(df.columns)},
+    }
+    if level == InstrumentationLevel.DEEP:
+        monitoring["details"] = step.model_dump()
+        monitoring["sizes"]["memory_used"] = convert_size(report.memory_used_in_bytes)
+    logger.info("[step-monitor]", extra={"type": "monitoring", "step": monitoring})
+
+
+def _apply_planned_steps(
+    planned_steps: list[PlannedStep], df: DataFrame | None, domain_retriever: DomainRetriever
+) -> DataFrame:
+    for planned_step in planned_steps:
+        step = planned_step.step
+        try:
+            df = steps_executors[step.name](
+                step, df, domain_retriever=domain_retriever, execute_pipeline=execute_pipeline
+            )
+            if planned_step.keep_columns is not None:
+                df = df[[col for col in df.columns if col in planned_step.keep_columns]]
+        except Exception as e:
+            raise PipelineExecutionFailure(step, planned_step.index, e) from e
+    return df
+
+
+def _is_row_wise_pipeline(pipeline: Pipeline) -> bool:
+    return pipeline.steps[0].name == "domain" and all(is_row_wise(step) for step in pipeline.steps[1:])
+
+
+def _execute_row_wise_pipeline_head(
+    pipeline: Pipeline, domain_retriever: DomainRetriever, rows: int, *, optimize: bool = False
+) -> tuple[DataFrame, int, bool]:
+    """
+    Executes a pipeline made of a domain step followed by row-wise steps on growing chunks of its domain, until it
+    produced at least `rows` rows.
+
+    Returns the rows produced, the number of rows the complete execution would produce and whether that number is
+    approximate. Unless every chunk was processed, it is estimated from the proportion of rows the processed chunks
+    kept.
+    """
+    if optimize:
+        planned_steps = plan_pipeline(pipeline).steps
+    else:
+        planned_steps = [PlannedStep(step=step, indexes=(index,)) for index, step in enumerate(pipeline.steps)]
+    domain = _apply_planned_steps(planned_steps[:1], None, domain_retriever)
+
+    results = []
+    produced = processed = 0
+    chunk_size = max(rows, PREVIEW_MIN_CHUNK_SIZE)
+    while True:
+        # Copying the slice, so that steps can add columns to it
+        chunk = domain.iloc[processed : processed + chunk_size].copy(deep=False)
+        processed += len(chunk)
+        result = _apply_planned_steps(planned_steps[1:], chunk, domain_retriever)
+        results.append(result)
+        produced += len(result)
+        if produced >= rows or processed >= len(domain):
+            break
+        chunk_size *= 2
+
+    df = concat(results) if len(results) > 1 else results[0]
+    if isinstance(df, GeoDataFrame):
+        df = DataFrame(df)
+    if processed >= len(domain):
+        return df, produced, False
+    return df, round(produced * len(domain) / processed), True
+
+
+def preview_pipeline(
+    pipeline: Pipeline,
+    domain_retriever: DomainRetriever,
+    limit: int = 50,
+    offset: int = 0,
+    *,
+    optimize: bool = False,
+    cache: PipelineCache | None = None,
+    pool: Executor | None = None,
+    instrumentation: Instrumentation | None = None,
+    exact_total: bool = True,
+    orient: PreviewOrient = "records",
+) -> str:
     """
     Execute a pipeline but returns only a slice of the results, determined by `limit` and `offset` parameters, as JSON.
 
     Return format follows the 'table' JSON table schema used by pandas (see
     https://pandas.pydata.org/pandas-docs/stable/user_guide/io.html#orient-options), with a few addition related to
-    pagination.
+    pagination. With `orient="columns"`, the data is an object containing the values of each column instead of a list
+    of rows (see `serialize_preview`).
+
+    With `exact_total=False`, pipelines made of a domain followed by row-wise steps only (see `planner.is_row_wise`)
+    are executed on chunks of the domain, until the requested slice is filled. The `total` is then estimated, which is
+    indicated by the `total_is_approximate` field (present whenever `exact_total=False`). The cache is not used for
+    such pipelines.
 
     Note: it's required to use pandas `to_json` methods, as it convert NaN and dates to an appropriate format.
     """
-    df, _ = execute_pipeline(pipeline, domain_retriever)
-
-    def _default_formatter(obj):
-        if hasattr(obj, "geom_type"):
-            return obj.geom_type
-        return obj
-
-    return json.dumps(
-        {
-            "schema": build_table_schema(df, index=False),
-            "offset": offset,
-            "limit": limit,
-            "total": df.shape[0],
-            "data": json.loads(
-                df[offset : offset + limit].to_json(orient="records", default_handler=_default_formatter)
-            ),
-        }
+    if not exact_total and _is_row_wise_pipeline(pipeline):
+        df, total, total_is_approximate = _execute_row_wise_pipeline_head(
+            pipeline, domain_retriever, offset + limit, optimize=optimize
+        )
+        return serialize_preview(
+            df, limit, offset, total=total, total_is_approximate=total_is_approximate, orient=orient
+        )
+
+    df, _ = execute_pipeline(
+        pipeline, domain_retriever, optimize=optimize, cache=cache, pool=pool, instrumentation=instrumentation
+    )
+    return serialize_preview(df, limit, offset, total_is_approximate=None if exact_total else False, orient=orient)
+
+
+class _PrefetchedDomainRetriever:
+    """Serves domains retrieved beforehand. Being a class, it can be pickled to be used in process pools"""
+
+    def __init__(self, domains: dict[str | Reference, DataFrame | Exception]) -> None:
+        self._domains = domains
+
+    def __call__(self, domain: str | Reference) -> DataFrame:
+        result = self._domains[domain]
+        # Retrieval errors are raised when the domain is requested, so that they are reported by the step reading it
+        if isinstance(result, Exception):
+            raise result
+        # A domain may be read by several steps
+        return result.copy(deep=False)
+
+
+async def _prefetch_domains(pipeline: Pipeline, domain_retriever: AsyncDomainRetriever) -> _PrefetchedDomainRetriever:
+    domains = list(dict.fromkeys(domain for step in pipeline.steps for domain in step_domains(step)))
+    results = await asyncio.gather(*(domain_retriever(domain) for domain in domains), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+    return _PrefetchedDomainRetriever(dict(zip(domains, results, strict=True)))  # type: ignore[arg-type]
+
+
+async def execute_pipeline_async(
+    pipeline: Pipeline,
+    domain_retriever: AsyncDomainRetriever,
+    *,
+    optimize: bool = False,
+    cache: PipelineCache | None = None,
+    pool: Executor | None = None,
+    instrumentation: Instrumentation | None = None,
+    executor: Executor | None = None,
+) -> tuple[DataFrame, PipelineExecutionReport]:
+    """
+    Asynchronous counterpart of `execute_pipeline`, taking an asynchronous domain retriever.
+
+    Every domain read by the pipeline (or by its sub-pipelines) is retrieved concurrently before the execution starts,
+    even the ones a `cache` would make unnecessary. The steps, which are CPU-bound, are then executed in `executor`
+    (the default executor of the event loop if not provided), so that the event loop is never blocked.
+    """
+    prefetched_domain_retriever = await _prefetch_domains(pipeline, domain_retriever)
+    return await asyncio.get_running_loop().run_in_executor(
+        executor,
+        partial(
+            execute_pipeline,
+            pipeline,
+            prefetched_domain_retriever,
+            optimize=optimize,
+            cache=cache,
+            pool=pool,
+            instrumentation=instrumentation,
+        ),
+    )
+
+
+async def preview_pipeline_async(
+    pipeline: Pipeline,
+    domain_retriever: AsyncDomainRetriever,
+    limit: int = 50,
+    offset: int = 0,
+    *,
+    optimize: bool = False,
+    cache: PipelineCache | None = None,
+    pool: Executor | None = None,
+    instrumentation: Instrumentation | None = None,
+    executor: Executor | None = None,
+    exact_total: bool = True,
+    orient: PreviewOrient = "records",
+) -> str:
+    """Asynchronous counterpart of `preview_pipeline` (see `execute_pipeline_async`)"""
+    prefetched_domain_retriever = await _prefetch_domains(pipeline, domain_retriever)
+    return await asyncio.get_running_loop().run_in_executor(
+        executor,
+        partial(
+            preview_pipeline,
+            pipeline,
+            prefetched_domain_retriever,
+            limit,
+            offset,
+            optimize=optimize,
+            cache=cache,
+            pool=pool,
+            instrumentation=instrumentation,
+            exact_total=exact_total,
+            orient=orient,
+        ),
     )
 
 
@@ -0,0 +1,102 @@
+"""
+Logical planning for the pandas executor.
+
+Before being executed, a pipeline can be turned into a `LogicalPlan`. The plan contains the same steps, rewritten so
+that they do less work on large domains:
+
+- filters are moved ahead of row-wise steps they do not depend on (predicate pushdown),
+- adjacent filters (and adjacent deletes) are fused into a single step,
+- columns that no downstream step reads are dropped right after the domain is retrieved (projection pruning).
+
+Every rewrite is conservative: whenever the planner cannot prove a rewrite is safe, the step is left as is.
+"""
+
+from dataclasses import dataclass, field
+
+from weaverbird.pipeline import Pipeline, PipelineStep
+from weaverbird.pipeline.columns import push_condition_before, required_columns, row_wise_columns
+from weaverbird.pipeline.conditions import ConditionComboAnd
+from weaverbird.pipeline.steps import DeleteStep, FilterStep
+
+
+@dataclass(kw_only=True)
+class PlannedStep:
+    step: PipelineStep
+    # Indexes, in the original pipeline, of the steps this planned step stands for
+    indexes: tuple[int, ...]
+    # If set, only these columns are kept in the output of the step
+    keep_columns: set[str] | None = None
+
+    @property
+    def index(self) -> int:
+        return self.indexes[0]
+
+
+@dataclass(kw_only=True)
+class LogicalPlan:
+    steps: list[PlannedStep] = field(default_factory=list)
+
+
+def is_row_wise(step: PipelineStep) -> bool:
+    """
+    Whether a step processes each row independently of the others, so that applying it to chunks of a DataFrame and
+    concatenating the results is the same as applying it to the whole DataFrame.
+    """
+    return step.name in ("filter", "rename", "select", "delete") or row_wise_columns(step) is not None
+
+
+def _push_down_filters(planned_steps: list[PlannedStep]) -> list[PlannedStep]:
+    result: list[PlannedStep] = []
+    for planned in planned_steps:
+        position = len(result)
+        if isinstance(planned.step, FilterStep):
+            condition = planned.step.condition
+            # The first step is always kept first
+            while position > 1:
+                if (pushed := push_condition_before(condition, result[position - 1].step)) is None:
+                    break
+                condition, position = pushed, position - 1
+            planned = PlannedStep(step=FilterStep(condition=condition), indexes=planned.indexes)
+        result.insert(position, planned)
+    return result
+
+
+def _fuse_steps(planned_steps: list[PlannedStep]) -> list[PlannedStep]:
+    result: list[PlannedStep] = []
+    for planned in planned_steps:
+        previous = result[-1] if result else None
+        if isinstance(planned.step, FilterStep) and previous and isinstance(previous.step, FilterStep):
+            result[-1] = PlannedStep(
+                step=FilterStep(condition=ConditionComboAnd(and_=[previous.step.condition, planned.step.condition])),
+                indexes=previous.indexes + planned.indexes,
+            )
+        elif isinstance(planned.step, DeleteStep) and previous and isinstance(previous.step, DeleteStep):
+            result[-1] = PlannedStep(
+                step=DeleteStep(columns=previous.step.columns + planned.step.columns),
+                indexes=previous.indexes + planned.indexes,
+            )
+        else:
+            result.append(planned)
+    return result
+
+
+def _prune_domain_columns(planned_steps: list[PlannedStep]) -> list[PlannedStep]:
+    required: set[str] | None = None
+    for planned in reversed(planned_steps[1:]):
+        required = required_columns(planned.step, required)
+    if planned_steps and planned_steps[0].step.name == "domain" and required is not None:
+        planned_steps[0].keep_columns = required
+    return planned_steps
+
+
+def plan_pipeline(pipeline: Pipeline) -> LogicalPlan:
+    """
+    Turns a pipeline into a logical plan, optimized for the pandas executor.
+
+    Executing the plan gives the same result as executing the pipeline step by step.
+    """
+    planned_steps = [PlannedStep(step=step, indexes=(index,)) for index, step in enumerate(pipeline.steps)]
+    planned_steps = _push_down_filters(planned_steps)
+    planned_steps = _fuse_steps(planned_steps)
+    planned_steps = _prune_domain_columns(planned_steps)
+    return LogicalPlan(steps=planned_steps)
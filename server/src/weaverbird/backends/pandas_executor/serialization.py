@@ -0,0 +1,62 @@
+"""
+Serialization of pipeline results to the JSON payload returned by previews.
+
+The payload is assembled from JSON fragments: the data is serialized by pandas' `to_json`, which handles NaN, dates and
+numpy types, and inserted as is, without being parsed and serialized again.
+"""
+
+import json
+from typing import Literal
+
+from pandas import DataFrame
+from pandas.io.json import build_table_schema
+
+PreviewOrient = Literal["records", "columns"]
+
+
+def _default_handler(obj):
+    if hasattr(obj, "geom_type"):
+        return obj.geom_type
+    return obj
+
+
+def _columns_json(df: DataFrame) -> str:
+    columns = (
+        f"{json.dumps(str(column))}:{df.iloc[:, position].to_json(orient='values', default_handler=_default_handler)}"
+        for position, column in enumerate(df.columns)
+    )
+    return "{" + ",".join(columns) + "}"
+
+
+def serialize_preview(
+    df: DataFrame,
+    limit: int,
+    offset: int,
+    *,
+    total: int | None = None,
+    total_is_approximate: bool | None = None,
+    orient: PreviewOrient = "records",
+) -> str:
+    """
+    Serializes the slice of `df` determined by `limit` and `offset` along with its table schema.
+
+    With `orient="records"`, the data is a list of rows, with `orient="columns"`, an object containing the list of
+    values of each column. `total` defaults to the number of rows of `df`.
+    """
+    page = df[offset : offset + limit]
+    if orient == "records":
+        data = page.to_json(orient="records", default_handler=_default_handler)
+    else:
+        data = _columns_json(page)
+
+    metadata = {
+        # The schema only depends on the dtypes of the columns, which the slice shares with `df`
+        "schema": build_table_schema(page, index=False),
+        "offset": offset,
+        "limit": limit,
+        "total": df.shape[0] if total is None else total,
+    }
+    if total_is_approximate is not None:
+        metadata["total_is_approximate"] = total_is_approximate
+    # Inserting the data in the serialized metadata object
+    return f'{json.dumps(metadata)[:-1]}, "data": {data}}}'
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-from pandas import Series
 
 from weaverbird.backends.pandas_executor.types import DomainRetriever, PipelineExecutor
 from weaverbird.pipeline.steps import AddMissingDatesStep
@@ -8,14 +7,33 @@ from weaverbird.pipeline.steps import AddMissingDatesStep
 # cf. https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases
 _FREQUENCIES = {"day": "D", "week": "W", "month": "M", "year": "Y"}
 
+_PERIOD_COLUMN = "__period__"
 
-def at_begin_period(timestamps: Series, dates_granularity: str):
-    # Returns the timezone of the Series, or None in case all objects is naive. In case of mixed
-    # objects or non-datetime series, raises an exception
-    tz = timestamps.dt.tz
-    naive_start_times = timestamps.dt.to_period(_FREQUENCIES[dates_granularity]).dt.start_time
-    # Setting the right TZ for all objects
-    return naive_start_times.dt.tz_localize(tz)
+
+def _periods_spine(periods: pd.DataFrame, groups: list[str], freq: str) -> pd.DataFrame:
+    """
+    Returns every period of each group, from its first period to its last one.
+
+    `periods` must be sorted by group, then by period.
+    """
+    if periods.empty:
+        return periods[[*groups, _PERIOD_COLUMN]]
+    ordinals = periods[_PERIOD_COLUMN].array.asi8
+    if groups:
+        group_ids = periods.groupby(groups, dropna=False, observed=True, sort=False).ngroup().to_numpy()
+        is_group_start = np.concatenate([[True], group_ids[1:] != group_ids[:-1]])
+    else:
+        is_group_start = np.arange(len(periods)) == 0
+    starts = np.flatnonzero(is_group_start)
+    ends = np.append(starts[1:], len(periods)) - 1
+    lengths = ordinals[ends] - ordinals[starts] + 1
+
+    # For each period of the spine, the row of the first period of its group and its offset from it
+    spine_rows = np.repeat(starts, lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    spine = periods[groups].iloc[spine_rows].reset_index(drop=True)
+    spine[_PERIOD_COLUMN] = pd.arrays.PeriodArray(ordinals[spine_rows] + offsets, dtype=pd.PeriodDtype(freq))
+    return spine
 
 
 def execute_addmissingdates(
@@ -24,30 +42,22 @@ def execute_addmissingdates(
     domain_retriever: DomainRetriever = None,
     execute_pipeline: PipelineExecutor = None,
 ) -> pd.DataFrame:
-    if len(step.groups) > 0:
-        groups = df.groupby(step.groups, as_index=False, dropna=False)
-    else:
-        groups = [("", df)]
-
-    result = pd.DataFrame()
-    for key, group in groups:
-        # this is used to keep the real date, if it exists, instead of the computed one by pd.Grouper
-        group = group.assign(_old_date=group[step.dates_column])
-
-        group_with_missing_dates = group.groupby(
-            pd.Grouper(key=step.dates_column, freq=_FREQUENCIES[step.dates_granularity])
-        ).agg("first")
-
-        group_with_missing_dates = group_with_missing_dates.reset_index()
-        group_with_missing_dates[step.groups] = key
-
-        group_with_missing_dates[step.dates_column] = np.where(
-            pd.isna(group_with_missing_dates["_old_date"]),
-            at_begin_period(group_with_missing_dates[step.dates_column], step.dates_granularity),
-            group_with_missing_dates["_old_date"],
-        )
-        del group_with_missing_dates["_old_date"]
-        # Each group could have duplicate indexes with the previous ones
-        # Ignoring the index prevents duplicate index values
-        result = pd.concat([result, group_with_missing_dates], ignore_index=True)
-    return result
+    freq = _FREQUENCIES[step.dates_granularity]
+    dates = df[step.dates_column]
+    df = df[dates.notna()].sort_values(step.dates_column, kind="stable")
+    keys = [*step.groups, _PERIOD_COLUMN]
+    # Rows are aggregated by group and period of their local date, keeping the first value of each column in the order
+    # of dates (and so the real date, if it exists), as a resample would do
+    periods = (
+        df.assign(**{_PERIOD_COLUMN: df[step.dates_column].dt.tz_localize(None).dt.to_period(freq)})
+        .groupby(keys, dropna=False, observed=True, sort=True)
+        .first()
+        .reset_index()
+    )
+    # A single merge with the spine of the periods of all groups adds the missing ones
+    result = _periods_spine(periods, step.groups, freq).merge(periods, on=keys, how="left")
+
+    # Missing dates are the beginning of their period, in the timezone of the dates
+    begin_periods = result[_PERIOD_COLUMN].dt.start_time.dt.tz_localize(dates.dt.tz)
+    result[step.dates_column] = result[step.dates_column].where(result[step.dates_column].notna(), begin_periods)
+    return result[[step.dates_column, *(column for column in df.columns if column != step.dates_column)]]
@@ -7,10 +7,25 @@ from weaverbird.pipeline.steps.hierarchy import HierarchyStep
 from .dissolve import execute_dissolve
 
 
-def _dissolve_one_level(df: pd.DataFrame, groups: list[str], level_col: str, level: int) -> pd.DataFrame:
-    dissolved = execute_dissolve(DissolveStep(groups=groups), df)
-    dissolved[level_col] = level
-    return dissolved
+def _dissolve_levels(df: pd.DataFrame, hierarchy: list[str], level_col: str) -> list[pd.DataFrame]:
+    """
+    Dissolves df on each level of the hierarchy, from the finest to the coarsest.
+
+    Each level is dissolved from the next finer one rather than from df, along with the rows that the finer one
+    dropped because of null values: they may still belong to a group of the coarser level.
+    """
+    levels: list[pd.DataFrame] = []
+    for idx in range(len(hierarchy)):
+        groups = hierarchy[: -idx if idx else None]
+        if levels:
+            finer_groups = hierarchy[: -idx + 1 if idx > 1 else None]
+            to_dissolve = pd.concat([levels[-1], df[df[finer_groups].isna().any(axis=1)]], ignore_index=True)
+        else:
+            to_dissolve = df
+        dissolved = execute_dissolve(DissolveStep(groups=groups), to_dissolve)
+        dissolved[level_col] = len(hierarchy) - idx - 1
+        levels.append(dissolved)
+    return levels
 
 
 def execute_hierarchy(
@@ -21,15 +36,6 @@ def execute_hierarchy(
 ) -> pd.DataFrame:
     df[step.hierarchy_level_column] = len(step.hierarchy)
     return pd.concat(
-        [df]
-        + [
-            _dissolve_one_level(
-                df,
-                step.hierarchy[: -idx if idx else None],
-                step.hierarchy_level_column,
-                len(step.hierarchy) - idx - 1,
-            )
-            for idx in range(len(step.hierarchy))
-        ],
+        [df] + _dissolve_levels(df, step.hierarchy, step.hierarchy_level_column),
         ignore_index=True,
     )
@@ -1,9 +1,108 @@
-from pandas import DataFrame, concat
+from collections.abc import Sequence
+
+import numpy as np
+from pandas import CategoricalDtype, DataFrame, Series, concat
+from pandas.api.typing import DataFrameGroupBy
 
 from weaverbird.backends.pandas_executor.types import DomainRetriever, PipelineExecutor
 from weaverbird.pipeline.steps import AggregateStep, RollupStep
+from weaverbird.pipeline.steps.aggregate import Aggregation
+
+from .aggregate import execute_aggregate, get_aggregate_fn
+
+# Functions combining the partial states of finer groups into the state of a coarser one
+_STATE_MERGE_FUNCTIONS = {"sum": "sum", "min": "min", "max": "max", "count": "sum"}
+# First and last values are found back from the position of the first and last non-null values of each group
+_POSITION_FUNCTIONS = {"first": "min", "last": "max"}
+
+
+def _state_functions(agg_function: str, column: Series) -> list[str] | None:
+    """
+    Returns the functions computing the partial states the aggregation can be derived from, level after level,
+    or None if it has to be computed from the input rows for each level (e.g. count distinct).
+    """
+    if agg_function in ("min", "max", "count"):
+        return [agg_function]
+    if agg_function in _POSITION_FUNCTIONS:
+        return [_POSITION_FUNCTIONS[agg_function]]
+    # Sums of other types (e.g. strings) depend on the order of the rows
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biuf":
+        if agg_function == "sum":
+            return ["sum"]
+        if agg_function == "avg":
+            return ["sum", "count"]
+    return None
+
 
-from .aggregate import execute_aggregate
+def _aggregate_levels(df: DataFrame, levels: list[list[str]], aggregations: Sequence[Aggregation]) -> list[DataFrame]:
+    """
+    Aggregates df on each level of columns, from the coarsest to the finest.
+
+    The finest level is computed from the input rows, and each coarser level from the partial states of the next
+    finer one, so that the input is only scanned once for decomposable aggregations.
+    """
+    if any(isinstance(df[col].dtype, CategoricalDtype) for col in levels[-1]):
+        # Unobserved categories make groups of their own, which have no partial states to be derived from
+        return [
+            execute_aggregate(
+                AggregateStep(name="aggregate", on=on, aggregations=aggregations, keep_original_granularity=False), df
+            )
+            for on in levels
+        ]
+
+    aggregated_columns = [
+        (aggregation.agg_function, col, new_col)
+        for aggregation in aggregations
+        for col, new_col in zip(aggregation.columns, aggregation.new_columns, strict=True)
+    ]
+    sources: dict[str, Series] = {}
+    state_functions: dict[str, str] = {}
+    states_names: list[list[str]] = []
+    for idx, (agg_function, col, _) in enumerate(aggregated_columns):
+        functions = _state_functions(agg_function, df[col]) or []
+        names = [f"__VQB_STATE_{idx}_{function_idx}__" for function_idx in range(len(functions))]
+        for name, function in zip(names, functions, strict=True):
+            if agg_function in _POSITION_FUNCTIONS:
+                positions = np.where(df[col].notna(), np.arange(len(df)), np.nan)
+                sources[name] = Series(positions, index=df.index)
+            else:
+                sources[name] = df[col]
+            state_functions[name] = function
+        states_names.append(names)
+
+    def _level_result(states: DataFrame, on: list[str], grouped_df: DataFrameGroupBy) -> DataFrame:
+        result = states[on]
+        for (agg_function, col, new_col), names in zip(aggregated_columns, states_names, strict=True):
+            if not names:
+                agg_serie = grouped_df[col].agg(get_aggregate_fn(agg_function, False)).set_axis(states.index)
+            elif agg_function == "avg":
+                agg_serie = states[names[0]] / states[names[1]]
+            elif agg_function in _POSITION_FUNCTIONS:
+                positions = states[names[0]]
+                values = df[col].iloc[positions.fillna(0).astype(int)].set_axis(states.index)
+                agg_serie = values.where(positions.notna(), None)
+            else:
+                agg_serie = states[names[0]]
+            result = result.assign(**{new_col: agg_serie})
+        return result
+
+    grouped_df = df.groupby(levels[-1], dropna=False)
+    groups = grouped_df.size()
+    if state_functions:
+        # Grouping on the group numbers reuses the factorization of the columns, shared with raw aggregations
+        states = DataFrame(sources, index=df.index).groupby(grouped_df.ngroup().to_numpy()).agg(state_functions)
+        states = states.set_axis(groups.index).reset_index()
+    else:
+        states = groups.reset_index()
+    results = [_level_result(states, levels[-1], grouped_df)]
+    merge_functions = {name: _STATE_MERGE_FUNCTIONS[function] for name, function in state_functions.items()}
+    for on in levels[-2::-1]:
+        # Levels are prefixes of the finest one: the finer groups are sorted by their coarser groups, in the order
+        # in which they would be sorted when aggregating the input rows (which the raw aggregations are aligned on)
+        grouped = states.groupby(on, dropna=False, sort=False)
+        states = (grouped.agg(merge_functions) if merge_functions else grouped.size()).reset_index()
+        results.insert(0, _level_result(states, on, df.groupby(on, dropna=False)))
+    return results
 
 
 def execute_rollup(
@@ -17,26 +116,16 @@ def execute_rollup(
     child_level_col = step.child_level_col or "child_level"
     parent_label_col = step.parent_label_col or "parent"
 
-    full_current_hierarchy = []
     all_results = []
     previous_level = None
     parent_col_in_results = False
 
     hierarchy_last_index = len(step.hierarchy) - 1
 
-    for idx, current_level in enumerate(step.hierarchy):
-        full_current_hierarchy.append(current_level)
-        aggregate_on_cols = (step.groupby or []) + full_current_hierarchy
-        results_for_this_level = execute_aggregate(
-            AggregateStep(
-                name="aggregate",
-                on=aggregate_on_cols,
-                aggregations=step.aggregations,
-                keep_original_granularity=False,
-            ),
-            df,
-        )
+    levels = [(step.groupby or []) + step.hierarchy[: idx + 1] for idx in range(len(step.hierarchy))]
+    levels_results = _aggregate_levels(df, levels, step.aggregations)
 
+    for idx, (current_level, results_for_this_level) in enumerate(zip(step.hierarchy, levels_results, strict=True)):
         results_for_this_level[level_col] = current_level
         results_for_this_level[child_level_col] = step.hierarchy[idx + 1] if idx < hierarchy_last_index else None
         results_for_this_level[label_col] = results_for_this_level[current_level]
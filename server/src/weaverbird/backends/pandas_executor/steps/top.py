@@ -1,3 +1,4 @@
+import numpy as np
 from pandas import DataFrame
 
 from weaverbird.backends.pandas_executor.types import DomainRetriever, PipelineExecutor
@@ -12,10 +13,18 @@ def execute_top(
 ) -> DataFrame:
     ascending = step.sort == "asc"
     if step.groups:
-        return (
-            df.groupby(step.groups)
-            .apply(lambda df: df.sort_values(step.rank_on, ascending=ascending).head(step.limit))
-            .reset_index(drop=True)
-        )
+        # The whole dataframe is sorted once: the top rows of each group are then its first ones, instead of sorting
+        # each group in a Python callback
+        ranked = df.sort_values(step.rank_on, ascending=ascending, kind="stable")
+        grouped = ranked.groupby(step.groups)
+        if step.limit >= 0:
+            is_top = grouped.cumcount() < step.limit
+        else:
+            # Like `head`, a negative limit keeps all the rows of a group but the last ones
+            is_top = grouped.cumcount(ascending=False) >= -step.limit
+        is_top_array = is_top.to_numpy()
+        # Groups are sorted by their keys, and rows with a null key are dropped, as done by groupby
+        group_numbers = grouped.ngroup().to_numpy()[is_top_array]
+        return ranked[is_top_array].iloc[np.argsort(group_numbers, kind="stable")].reset_index(drop=True)
     else:
         return df.sort_values(step.rank_on, ascending=ascending).head(step.limit)
@@ -1,64 +1,99 @@
-from pandas import DataFrame, concat
+from collections.abc import Sequence
+from itertools import combinations
+
+import numpy
+from pandas import DataFrame, RangeIndex, Series, concat
 
 from weaverbird.backends.pandas_executor.types import DomainRetriever, PipelineExecutor
 from weaverbird.pipeline.steps import AggregateStep, TotalsStep
-from weaverbird.pipeline.steps.totals import TotalDimension
+from weaverbird.pipeline.steps.aggregate import Aggregation
 
 from .aggregate import execute_aggregate
 
+_POSITION_COLUMN = "__VQB__POSITION__"
 
-def get_total_for_dimension(
-    step: TotalsStep, df: DataFrame, total_dimension: TotalDimension, dimensions_to_skip: list
-) -> DataFrame:
-    # get all group_by columns: all total_dimensions, except the current one + groups
-    # all columns that are either not aggregated, or groups, or total will be null
-    group_by_columns = step.groups + [
-        group_column.total_column for group_column in step.total_dimensions if group_column != total_dimension
-    ]
-    aggregations = []
-    for aggregation in step.aggregations:
-        agg = aggregation.model_copy(deep=True)
-        agg.columns = agg.new_columns
-        aggregations.append(agg)
 
+def _aggregate(df: DataFrame, on: list[str], aggregations: Sequence[Aggregation]) -> DataFrame:
     aggregation_step = AggregateStep(
         name="aggregate",
         keep_original_granularity=False,
         aggregations=aggregations,
-        on=group_by_columns,
+        on=on,
     )
-    aggregated_df = execute_aggregate(aggregation_step, df)
-
-    aggregated_df[total_dimension.total_column] = total_dimension.total_rows_label
-    full_aggregation = aggregated_df.copy()
-    # if we are the last dimension, we already computed all combinations
-    if total_dimension != step.total_dimensions[-1]:
-        for dimension in step.total_dimensions[step.total_dimensions.index(total_dimension) :]:
-            if dimension not in dimensions_to_skip and dimension != total_dimension:
-                full_aggregation = concat(
-                    [
-                        full_aggregation,
-                        get_total_for_dimension(step, aggregated_df, dimension, dimensions_to_skip + [dimension]),
-                    ]
-                )
-    return full_aggregation
-
-
-def get_total_for_dimensions(step: TotalsStep, df: DataFrame) -> DataFrame:
-    group_by_columns = step.groups + [dim.total_column for dim in step.total_dimensions]
+    return execute_aggregate(aggregation_step, df)
 
-    aggregation_step = AggregateStep(
-        name="aggregate",
-        keep_original_granularity=False,
-        aggregations=step.aggregations,
-        on=group_by_columns,
+
+def _grouping_sets(dimensions_count: int) -> list[tuple[int, ...]]:
+    """
+    Returns the indexes of the total dimensions of every grouping set, in lexicographic order: the grouping set
+    without its last dimension, from which it is rolled up, always comes before it.
+    """
+    return sorted(
+        grouping_set
+        for length in range(1, dimensions_count + 1)
+        for grouping_set in combinations(range(dimensions_count), length)
     )
-    aggregated_df = execute_aggregate(aggregation_step, df)
 
-    result_df = DataFrame()
-    for dimension in step.total_dimensions:
-        result_df = concat([result_df, get_total_for_dimension(step, aggregated_df, dimension, [])])
-    return result_df
+
+def _sorted_codes(column: Series) -> numpy.ndarray:
+    """Returns codes of the values of a column, ordered as the values (nulls last), as grouped by `groupby`"""
+    codes, uniques = column.factorize(sort=True)
+    return numpy.where(codes == -1, len(uniques), codes)
+
+
+def get_total_for_dimensions(step: TotalsStep, df: DataFrame) -> list[DataFrame]:
+    """
+    Returns the total rows of every combination of total dimensions.
+
+    The data is aggregated once on the groups and all the dimensions. The totals of a combination of dimensions are then
+    rolled up from those of the same combination without its last dimension, by aggregating the aggregated columns
+    again on the other dimensions.
+    """
+    key_columns = step.groups + [dimension.total_column for dimension in step.total_dimensions]
+    finest_aggregation = _aggregate(df, key_columns, step.aggregations)
+    aggregated_columns = [column for aggregation in step.aggregations for column in aggregation.new_columns]
+
+    # Totals are rolled up on codes of the key columns, which are faster to group by than their values. The position of
+    # the first row of each group in the finest aggregation is kept, to take the values of its key columns from it
+    finest_codes = DataFrame({column: _sorted_codes(finest_aggregation[column]) for column in key_columns})
+    finest_codes[_POSITION_COLUMN] = numpy.arange(len(finest_aggregation))
+    finest_codes[aggregated_columns] = finest_aggregation[aggregated_columns]
+    rollup_aggregations = [
+        *(aggregation.model_copy(update={"columns": aggregation.new_columns}) for aggregation in step.aggregations),
+        Aggregation(columns=[_POSITION_COLUMN], new_columns=[_POSITION_COLUMN], agg_function="first"),
+    ]
+
+    dimension_indexes = {dimension.total_column: index for index, dimension in enumerate(step.total_dimensions)}
+    rolled_up_codes: dict[tuple[int, ...], DataFrame] = {(): finest_codes}
+    totals = []
+    for grouping_set in _grouping_sets(len(step.total_dimensions)):
+        # Rolled up dimensions have a single value: only the other ones are grouped by
+        rolled_up_codes[grouping_set] = codes = _aggregate(
+            rolled_up_codes[grouping_set[:-1]],
+            step.groups
+            + [
+                dimension.total_column
+                for index, dimension in enumerate(step.total_dimensions)
+                if index not in grouping_set
+            ],
+            rollup_aggregations,
+        )
+
+        # All columns that are either not aggregated, or groups, or total will be null
+        positions = codes[_POSITION_COLUMN].to_numpy()
+        total = DataFrame(index=RangeIndex(len(codes)))
+        for column in key_columns:
+            if (dimension_index := dimension_indexes.get(column)) == grouping_set[-1]:
+                continue
+            if dimension_index in grouping_set:
+                total[column] = step.total_dimensions[dimension_index].total_rows_label
+            else:
+                total[column] = finest_aggregation[column].take(positions).reset_index(drop=True)
+        total[aggregated_columns] = codes[aggregated_columns]
+        rolled_up_dimension = step.total_dimensions[grouping_set[-1]]
+        total[rolled_up_dimension.total_column] = rolled_up_dimension.total_rows_label
+        totals.append(total)
+    return totals
 
 
 def execute_totals(
@@ -67,9 +102,7 @@ def execute_totals(
     domain_retriever: DomainRetriever = None,
     execute_pipeline: PipelineExecutor = None,
 ) -> DataFrame:
-    total_rows = []
-    # for total_dimension in step.total_dimensions:
-    total_rows.append(get_total_for_dimensions(step, df))
+    total_rows = get_total_for_dimensions(step, df)
 
     # rename columns in the base df, so it will match with the total in schema
     col_to_rm = set()
@@ -1,9 +1,151 @@
+from collections import Counter, deque
+from collections.abc import Hashable, Iterable, Iterator
+from concurrent.futures import Executor, Future
+from threading import Lock
+
 from pandas import DataFrame
 
-from weaverbird.backends.pandas_executor.types import DomainRetriever, PipelineExecutor
+from weaverbird.backends.pandas_executor.types import DomainRetriever, PipelineExecutionReport, PipelineExecutor
 from weaverbird.pipeline.steps.utils.combination import PipelineOrDomainNameOrReference, Reference
 
 
+def combined_pipelines(step) -> Iterator[PipelineOrDomainNameOrReference]:
+    if step.name == "append":
+        yield from step.pipelines
+    elif step.name == "join":
+        yield step.right_pipeline
+
+
+def step_domains(step) -> Iterator[str | Reference]:
+    """Yields every domain a step reads, including the ones read by its sub-pipelines"""
+    if step.name == "domain":
+        yield step.domain
+    for pipeline in combined_pipelines(step):
+        if isinstance(pipeline, list):
+            for sub_step in pipeline:
+                yield from step_domains(sub_step)
+        else:
+            yield pipeline
+
+
+def _combination_key(pipeline: PipelineOrDomainNameOrReference) -> Hashable:
+    from weaverbird.pipeline.fingerprint import fingerprint_steps
+
+    if isinstance(pipeline, str | Reference):
+        return "domain", pipeline
+    return "pipeline", fingerprint_steps(pipeline).digest
+
+
+class SubPipelinesExecutor:
+    """
+    Executes the sub-pipelines of `append` and `join` steps, keeping their execution reports.
+
+    The sub-pipelines of a pipeline's steps are known as soon as its execution starts (see `submit`). Their results
+    are only kept until their last consumer, and only sub-pipelines consumed more than once are executed once for
+    all of them. Their report is only kept once, by the first step consuming them.
+
+    With a pool, up to `max_pending` sub-pipelines are executed ahead of the steps consuming them, as they do not
+    depend on any other step. They then run concurrently with each other and with the steps of the pipeline, while
+    steps still consume their results in order.
+    """
+
+    def __init__(self, execute_pipeline: PipelineExecutor, pool: Executor | None = None, max_pending: int = 4) -> None:
+        self._execute_pipeline = execute_pipeline
+        self._pool = pool
+        self._max_pending = max_pending
+        # Sub-pipelines to execute in the pool, in the order of their first consumer
+        self._pending: deque[tuple[Hashable, PipelineOrDomainNameOrReference, DomainRetriever]] = deque()
+        self._futures: dict[Hashable, Future] = {}
+        self._consumers: Counter[Hashable] = Counter()
+        self._reports: list[PipelineExecutionReport] = []
+        self._reported: set[Hashable] = set()
+        self._lock = Lock()
+
+    def __call__(self, pipeline, domain_retriever: DomainRetriever) -> tuple[DataFrame, PipelineExecutionReport]:
+        df, report = self._execute_pipeline(pipeline, domain_retriever)
+        self._add_report(report)
+        return df, report
+
+    def _add_report(self, report: PipelineExecutionReport) -> None:
+        with self._lock:
+            self._reports.append(report)
+
+    def pop_reports(self) -> list[PipelineExecutionReport]:
+        """Returns the reports of the sub-pipelines executed since the last call"""
+        with self._lock:
+            reports, self._reports = self._reports, []
+        return reports
+
+    def submit(self, steps: Iterable, domain_retriever: DomainRetriever) -> None:
+        """Counts the consumers of the sub-pipelines of the given steps, and starts executing them in the pool if any"""
+        for step in steps:
+            for pipeline in combined_pipelines(step):
+                key = _combination_key(pipeline)
+                self._consumers[key] += 1
+                if self._pool is not None and self._consumers[key] == 1:
+                    self._pending.append((key, pipeline, domain_retriever))
+        self._submit_pending()
+
+    def _submit_pending(self) -> None:
+        from weaverbird.pipeline import Pipeline
+
+        while self._pool is not None and self._pending and len(self._futures) < self._max_pending:
+            key, pipeline, domain_retriever = self._pending.popleft()
+            if isinstance(pipeline, str | Reference):
+                self._futures[key] = self._pool.submit(domain_retriever, pipeline)
+            else:
+                self._futures[key] = self._pool.submit(
+                    self._execute_pipeline, Pipeline(steps=pipeline), domain_retriever
+                )
+
+    def set_result(self, pipeline: PipelineOrDomainNameOrReference, df: DataFrame) -> None:
+        """Provides the result of a sub-pipeline computed by other means, for one more consumer"""
+        key = _combination_key(pipeline)
+        future: Future = Future()
+        future.set_result(df)
+        self._futures[key] = future
+        self._consumers[key] += 1
+
+    def resolve(self, pipeline: PipelineOrDomainNameOrReference, domain_retriever: DomainRetriever) -> DataFrame:
+        from weaverbird.pipeline import Pipeline
+
+        key = _combination_key(pipeline)
+        if (future := self._futures.get(key)) is None:
+            # Not submitted yet (or not at all): executed now, and only kept if other steps consume it too
+            self._pending = deque(pending for pending in self._pending if pending[0] != key)
+            future = Future()
+            if isinstance(pipeline, str | Reference):
+                future.set_result(domain_retriever(pipeline))
+            else:
+                future.set_result(self._execute_pipeline(Pipeline(steps=pipeline), domain_retriever))
+            if self._consumers[key] > 1:
+                self._futures[key] = future
+
+        result = future.result()
+        if isinstance(result, tuple):
+            df, report = result
+            if key not in self._reported:
+                self._reported.add(key)
+                self._add_report(report)
+        else:
+            df = result
+
+        self._consumers[key] -= 1
+        if self._consumers[key] > 0:
+            # The same result will be consumed by other steps
+            return df.copy(deep=False)
+        del self._consumers[key]
+        self._futures.pop(key, None)
+        self._submit_pending()
+        return df
+
+    def cancel(self) -> None:
+        """Cancels the sub-pipelines which have not started yet"""
+        self._pending.clear()
+        for future in self._futures.values():
+            future.cancel()
+
+
 def resolve_pipeline_for_combination(
     pipeline: PipelineOrDomainNameOrReference,
     domain_retriever: DomainRetriever,
@@ -14,6 +156,8 @@ def resolve_pipeline_for_combination(
     """
     from weaverbird.pipeline import Pipeline
 
+    if isinstance(pipeline_executor, SubPipelinesExecutor):
+        return pipeline_executor.resolve(pipeline, domain_retriever)
     if isinstance(pipeline, str) or isinstance(pipeline, Reference):
         return domain_retriever(pipeline)
     else:
@@ -1,6 +1,3 @@
-from functools import reduce
-from typing import Any
-
 import numpy
 import pandas as pd
 from pandas import DataFrame
@@ -16,6 +13,7 @@ from weaverbird.pipeline.steps.waterfall import (
 
 _VQB_SORT_ORDER = "_vqbSortOrder"
 _VQB_GROUP = "_vqbGroup"
+_VQB_MATCH = "_vqbMatch"
 
 # Steps taken to execute a waterfall step:
 # * Filter the input dataset on "label IN [start, end]"
@@ -45,18 +43,18 @@ def execute_waterfall(
     group_columns = _group_by_columns(step)
     start_value_groups = _unique_values_groups(start_df, group_columns)
     end_value_groups = _unique_values_groups(end_df, group_columns)
-    unique_values_groups = start_value_groups.union(end_value_groups)
 
     # Backfilling missing values
     if step.backfill:
-        start_df = _backfill_missing_values(start_df, step, step.labelsColumn, group_columns, unique_values_groups)
-        end_df = _backfill_missing_values(end_df, step, step.labelsColumn, group_columns, unique_values_groups)
+        unique_values_groups = _unique_values_groups(pd.concat([start_value_groups, end_value_groups]), group_columns)
+        start_df = _backfill_missing_values(start_df, step, group_columns, unique_values_groups)
+        end_df = _backfill_missing_values(end_df, step, group_columns, unique_values_groups)
     # Otherwise, filter out rows which do not have a start and end date
     else:
         # We want to remove all value groups which are not in both the start and end dataframes
-        value_groups_to_remove = unique_values_groups - start_value_groups.intersection(end_value_groups)
-        start_df = _filter_out_rows(start_df, group_columns, value_groups_to_remove)
-        end_df = _filter_out_rows(end_df, group_columns, value_groups_to_remove)
+        common_value_groups = start_value_groups.merge(end_value_groups, on=group_columns)
+        start_df = start_df[_is_in_value_groups(start_df, group_columns, common_value_groups)]
+        end_df = end_df[_is_in_value_groups(end_df, group_columns, common_value_groups)]
 
     start_df = start_df.rename(columns={step.valueColumn: f"{step.valueColumn}_start"})
     end_df = end_df.rename(columns={step.valueColumn: f"{step.valueColumn}_end"})
@@ -98,17 +96,14 @@ def _merge(step: WaterfallStep, start_df: DataFrame, end_df: DataFrame) -> DataF
     """
     group_by_columns = _group_by_columns(step)
     start_df = (
-        start_df.groupby(by=group_by_columns)
+        start_df.groupby(by=group_by_columns, dropna=False, observed=True)
         .agg({step.valueColumn + "_start": "sum"})
-        .merge(start_df[group_by_columns], on=group_by_columns)
-        .drop_duplicates()
+        .reset_index()
     )
-
     end_df = (
-        end_df.groupby(by=group_by_columns)
+        end_df.groupby(by=group_by_columns, dropna=False, observed=True)
         .agg({step.valueColumn + "_end": "sum"})
-        .merge(end_df[group_by_columns], on=group_by_columns)
-        .drop_duplicates()
+        .reset_index()
     )
 
     # we join the result to compare them
@@ -123,7 +118,7 @@ def _merge(step: WaterfallStep, start_df: DataFrame, end_df: DataFrame) -> DataF
 
     # if there is a parent column, we need to aggregate for them
     if step.parentsColumn is not None:
-        parents_results = merged_df.groupby(step.groupby + [step.parentsColumn], as_index=False).agg(
+        parents_results = merged_df.groupby(step.groupby + [step.parentsColumn], as_index=False, dropna=False).agg(
             {RESULT_COLUMN: "sum"}
         )
         parents_results[step.labelsColumn] = parents_results[step.parentsColumn]
@@ -135,47 +130,30 @@ def _merge(step: WaterfallStep, start_df: DataFrame, end_df: DataFrame) -> DataF
     return merged_df
 
 
-def _unique_values_groups(df: DataFrame, group_columns: list[str]) -> set[tuple[str, ...]]:
-    return set(df[group_columns].drop_duplicates().to_records(index=False).tolist())
-
-
-def _filter_out_rows(
-    df: DataFrame, group_columns: list[str], value_groups_to_remove: set[tuple[str, ...]]
-) -> DataFrame:
-    if not value_groups_to_remove:
-        return df
+def _unique_values_groups(df: DataFrame, group_columns: list[str]) -> DataFrame:
+    return df[group_columns].drop_duplicates()
 
-    for value_group_to_remove in value_groups_to_remove:
-        conditions = (df[col] == val for col, val in zip(group_columns, value_group_to_remove, strict=True))
-        condition = reduce(lambda s1, s2: s1 & s2, conditions)
-        df = df[~condition]
 
-    return df
+def _is_in_value_groups(df: DataFrame, group_columns: list[str], value_groups: DataFrame) -> numpy.ndarray:
+    """Returns whether the group of each row is one of `value_groups`, which must not contain duplicates"""
+    matches = df[group_columns].merge(value_groups, on=group_columns, how="left", indicator=_VQB_MATCH)
+    return (matches[_VQB_MATCH] == "both").to_numpy()
 
 
 def _backfill_missing_values(
     df: DataFrame,
     step: WaterfallStep,
-    label_value: str,
     group_columns: list[str],
-    unique_values_groups: set[tuple[str, ...]],
+    unique_values_groups: DataFrame,
     backfill_value: int = 0,
 ) -> DataFrame:
-    missing_value_groups = unique_values_groups - _unique_values_groups(df, group_columns)
-    if not missing_value_groups:
+    missing_value_groups = unique_values_groups[
+        ~_is_in_value_groups(unique_values_groups, group_columns, _unique_values_groups(df, group_columns))
+    ]
+    if missing_value_groups.empty:
         return df
 
-    new_rows: list[dict[str, Any]] = []
-    for missing_groups in missing_value_groups:
-        new_rows.append(
-            {
-                step.labelsColumn: label_value,
-                step.valueColumn: backfill_value,
-                **dict(zip(group_columns, missing_groups, strict=True)),
-            }
-        )
-
-    return pd.concat([df, pd.DataFrame(new_rows)])
+    return pd.concat([df, missing_value_groups.assign(**{step.valueColumn: backfill_value})])
 
 
 def _compute_agg_milestone(
@@ -0,0 +1,90 @@
+"""
+Streaming execution of pipelines, for domains which do not fit in memory.
+
+Domains are retrieved as sequences of chunks, and runs of row-wise steps (see `planner.is_row_wise`) are applied chunk
+by chunk, lazily: only the chunk being processed is held in memory. Other steps (aggregations, sorts, pivots, joins,
+appends...) need all of their input, so the chunks reaching them are concatenated first.
+"""
+
+from collections.abc import Iterable, Iterator
+
+from pandas import DataFrame, concat
+
+from weaverbird.backends.pandas_executor.pipeline_executor import PipelineExecutionFailure, execute_pipeline
+from weaverbird.backends.pandas_executor.planner import is_row_wise
+from weaverbird.backends.pandas_executor.steps import steps_executors
+from weaverbird.backends.pandas_executor.types import ChunkedDomainRetriever, DomainRetriever
+from weaverbird.pipeline import Pipeline, PipelineStep
+from weaverbird.pipeline.steps.utils.combination import Reference
+
+
+def chunked(domain_retriever: DomainRetriever, chunk_size: int) -> ChunkedDomainRetriever:
+    """Turns a domain retriever into a chunked one, slicing the DataFrames it returns"""
+
+    def chunked_domain_retriever(domain: str | Reference) -> Iterator[DataFrame]:
+        df = domain_retriever(domain)
+        yield df.iloc[:chunk_size]
+        for start in range(chunk_size, len(df), chunk_size):
+            yield df.iloc[start : start + chunk_size]
+
+    return chunked_domain_retriever
+
+
+def _materialize(chunks: Iterable[DataFrame]) -> DataFrame:
+    chunks = list(chunks)
+    if len(chunks) == 0:
+        raise ValueError("A domain must be retrieved as one chunk at least")
+    # Chunks are usually indexed from 0 each
+    return chunks[0].copy(deep=False) if len(chunks) == 1 else concat(chunks, ignore_index=True)
+
+
+def _execute_step(
+    step: PipelineStep, index: int, df: DataFrame | Iterable[DataFrame] | None, domain_retriever: DomainRetriever
+) -> DataFrame:
+    try:
+        if isinstance(df, DataFrame):
+            # Copying chunks, so that steps can add columns to slices of a DataFrame
+            df = df.copy(deep=False)
+        elif df is not None:
+            df = _materialize(df)
+        return steps_executors[step.name](
+            step, df, domain_retriever=domain_retriever, execute_pipeline=execute_pipeline
+        )
+    except Exception as e:
+        raise PipelineExecutionFailure(step, index, e) from e
+
+
+def _retrieve_chunks(step: PipelineStep, index: int, domain_retriever: ChunkedDomainRetriever) -> Iterator[DataFrame]:
+    try:
+        yield from domain_retriever(step.domain)
+    except Exception as e:
+        raise PipelineExecutionFailure(step, index, e) from e
+
+
+def _execute_row_wise_step(
+    step: PipelineStep, index: int, chunks: Iterable[DataFrame], domain_retriever: DomainRetriever
+) -> Iterator[DataFrame]:
+    for chunk in chunks:
+        yield _execute_step(step, index, chunk, domain_retriever)
+
+
+def stream_pipeline(pipeline: Pipeline, domain_retriever: ChunkedDomainRetriever) -> Iterator[DataFrame]:
+    """
+    Executes a pipeline on chunks of its domains, and yields the chunks of its result as they are computed.
+
+    Only the steps which need all of their input materialize it, the steps following them then process the result as a
+    single chunk. Sub-pipelines of joins and appends are executed on their whole domains.
+    """
+
+    def materializing_domain_retriever(domain: str | Reference) -> DataFrame:
+        return _materialize(domain_retriever(domain))
+
+    chunks: Iterable[DataFrame] = ()
+    for index, step in enumerate(pipeline.steps):
+        if step.name == "domain":
+            chunks = _retrieve_chunks(step, index, domain_retriever)
+        elif is_row_wise(step):
+            chunks = _execute_row_wise_step(step, index, chunks, materializing_domain_retriever)
+        else:
+            chunks = (_execute_step(step, index, chunks, materializing_domain_retriever),)
+    yield from chunks
@@ -1,4 +1,4 @@
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any, Protocol
 
 from pandas import DataFrame
@@ -8,17 +8,44 @@ from weaverbird.pipeline import Pipeline
 from weaverbird.pipeline.steps.utils.combination import Reference
 
 
+class StepProfile(BaseModel):
+    rows_in: int | None
+    columns_in: int | None
+    rows_out: int
+    columns_out: int
+    wall_time_in_ms: float
+    # CPU time of the thread executing the step
+    cpu_time_in_ms: float
+    # Peak of the memory allocated during the step, as traced by tracemalloc
+    peak_memory_in_bytes: int
+    # Number of columns of the result whose values are not shared with the input: copied or computed by the step.
+    # Columns backed by pandas extension arrays are not taken into account
+    copied_columns: int | None
+    # Functions which took the most time during the step, as printed by pstats
+    calls_stats: str | None = None
+
+
 class StepExecutionReport(BaseModel):
     step_index: int
     time_spent_in_ms: int
     memory_used_in_bytes: int
+    # Reports of the sub-pipelines executed by the step (append and join steps), in the order of the step's pipelines
+    sub_pipelines_reports: list["PipelineExecutionReport"] = Field(default_factory=list)
+    # Only set when profiling the execution (see `Instrumentation`)
+    profile: StepProfile | None = None
 
 
 class PipelineExecutionReport(BaseModel):
     steps_reports: list[StepExecutionReport] = Field(min_length=0)
 
 
+StepExecutionReport.model_rebuild()
+
+
 DomainRetriever = Callable[[str | Reference], DataFrame]
+AsyncDomainRetriever = Callable[[str | Reference], Awaitable[DataFrame]]
+# Retrieves a domain as a sequence of DataFrames, to be concatenated
+ChunkedDomainRetriever = Callable[[str | Reference], Iterable[DataFrame]]
 PipelineExecutor = Callable[[Pipeline, DomainRetriever], tuple[DataFrame, PipelineExecutionReport]]
 
 
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from threading import Lock
+
+from weaverbird.backends.pypika_translator.dialects import SQLDialect
+from weaverbird.backends.pypika_translator.translators.base import QueryBuilderContext, SQLTranslator
+from weaverbird.pipeline import Pipeline, PipelineStep
+
+
+def translation_key(
+    *,
+    sql_dialect: SQLDialect,
+    pipeline: Pipeline,
+    tables_columns: Mapping[str, Sequence[str]],
+    db_schema: str | None = None,
+    source_rows_subset: int | None = None,
+    tables_columns_types: Mapping[str, Mapping[str, str]] | None = None,
+) -> Hashable:
+    """
+    Returns the key of the translation of a pipeline, regardless of its offset and limit.
+
+    Pipelines are identified by their fingerprint (see `Pipeline.fingerprint`): equivalent spellings of a pipeline
+    share their translation. The order of the tables does not matter, but the order of their columns does, as it is
+    the order in which they are selected.
+    """
+    tables_key = tuple(sorted((table, tuple(columns)) for table, columns in tables_columns.items()))
+    types_key = tuple(
+        sorted((table, tuple(sorted(types.items()))) for table, types in (tables_columns_types or {}).items())
+    )
+    return sql_dialect, pipeline.fingerprint().digest, tables_key, db_schema, source_rows_subset, types_key
+
+
+class TranslationCache:
+    """
+    A cache of the SQL translations of pipelines, to be given to `translate_pipeline`.
+
+    Queries are keyed by the translation key of their pipeline (see `translation_key`), along with their offset and
+    limit. The translated query builder of each pipeline is cached as well, so that the other pages of a pipeline are
+    materialized without translating it again.
+
+    Least recently used queries and query builders are evicted once there are more than `max_entries` of each.
+
+    `hits` counts the queries returned from the cache, `builder_hits` the queries materialized from a cached query
+    builder, and `misses` the pipelines which had to be translated.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._queries: OrderedDict[Hashable, str] = OrderedDict()
+        self._query_builders: OrderedDict[Hashable, QueryBuilderContext] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.builder_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def _evict(self, entries: OrderedDict) -> None:
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def get_query_str(
+        self,
+        key: Hashable,
+        *,
+        translator: Callable[[], SQLTranslator],
+        steps: Sequence[PipelineStep],
+        offset: int | None = None,
+        limit: int | None = None,
+    ) -> str:
+        """
+        Returns the cached query of a pipeline, or translates it with a translator created by `translator`.
+        """
+        query_key = (key, offset, limit)
+        with self._lock:
+            if (query := self._queries.get(query_key)) is not None:
+                self._queries.move_to_end(query_key)
+                if key in self._query_builders:
+                    self._query_builders.move_to_end(key)
+                self.hits += 1
+                return query
+            if (query_builder_context := self._query_builders.get(key)) is not None:
+                self._query_builders.move_to_end(key)
+                self.builder_hits += 1
+            else:
+                self.misses += 1
+
+        # Translations happen outside of the lock, so that different pipelines can be translated concurrently
+        sql_translator = translator()
+        if query_builder_context is None:
+            query_builder_context = sql_translator.get_pipeline_query_builder(steps=steps)
+            with self._lock:
+                self._query_builders[key] = query_builder_context
+                self._evict(self._query_builders)
+        query = sql_translator.materialize_query_str(
+            steps=steps, query_builder_context=query_builder_context, offset=offset, limit=limit
+        )
+        with self._lock:
+            self._queries[query_key] = query
+            self._evict(self._queries)
+        return query
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queries.clear()
+            self._query_builders.clear()
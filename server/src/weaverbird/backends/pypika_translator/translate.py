@@ -1,7 +1,9 @@
 from collections.abc import Mapping, Sequence
 
+from weaverbird.backends.pypika_translator.cache import TranslationCache, translation_key
 from weaverbird.backends.pypika_translator.dialects import SQLDialect
 from weaverbird.backends.pypika_translator.translators import ALL_TRANSLATORS
+from weaverbird.backends.pypika_translator.translators.base import SQLTranslator
 from weaverbird.pipeline import Pipeline
 
 
@@ -14,11 +16,28 @@ def translate_pipeline(
     source_rows_subset: int | None = None,
     offset: int | None = None,
     limit: int | None = None,
+    cache: TranslationCache | None = None,
+    tables_columns_types: Mapping[str, Mapping[str, str]] | None = None,
 ) -> str:
     translator_cls = ALL_TRANSLATORS[sql_dialect]
-    translator = translator_cls(
+
+    def translator() -> SQLTranslator:
+        return translator_cls(
+            tables_columns=tables_columns,
+            db_schema=db_schema,
+            source_rows_subset=source_rows_subset,
+            tables_columns_types=tables_columns_types,
+        )
+
+    if cache is None:
+        return translator().get_query_str(steps=pipeline.steps, offset=offset, limit=limit)
+
+    key = translation_key(
+        sql_dialect=sql_dialect,
+        pipeline=pipeline,
         tables_columns=tables_columns,
         db_schema=db_schema,
         source_rows_subset=source_rows_subset,
+        tables_columns_types=tables_columns_types,
     )
-    return translator.get_query_str(steps=pipeline.steps, offset=offset, limit=limit)
+    return cache.get_query_str(key, translator=translator, steps=pipeline.steps, offset=offset, limit=limit)
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, time
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Literal, TypeVar, Union, cast, get_args
 from uuid import uuid4
@@ -43,7 +43,9 @@ from weaverbird.backends.pypika_translator.translators.exceptions import (
     UnknownTableColumns,
 )
 from weaverbird.backends.pypika_translator.utils.formula import formula_to_term
+from weaverbird.backends.pypika_translator.utils.fusion import fuse_queries
 from weaverbird.exceptions import PipelineTranslationFailure
+from weaverbird.pipeline.columns import push_condition_before, required_columns
 from weaverbird.pipeline.conditions import (
     ComparisonCondition,
     DateBoundCondition,
@@ -158,22 +160,74 @@ class QueryBuilderContext:
         return qb
 
 
+class CTEsBuilder:
+    """Adds CTEs to query builders.
+
+    pypika's query builders are immutable: every call to `with_` copies the builder along with all its CTEs, which
+    would make the translation of a pipeline quadratic in its number of steps. The builder created by this class is
+    only copied once, when it receives its first CTE, and then extended in place.
+    """
+
+    def __init__(self, *, query_class: type[Query]) -> None:
+        self._query_class = query_class
+        self._builder: QueryBuilder | None = None
+
+    def with_(self, builder: QueryBuilder | None, selectable: Selectable, name: str) -> QueryBuilder:
+        if builder is None or builder is not self._builder:
+            # The builder is not ours (a builder provided by the caller, or returned by a combination step): it is
+            # copied, like pypika does, and further CTEs are added to the copy
+            self._builder = (builder if builder is not None else self._query_class).with_(selectable, name)
+            return self._builder
+        # The builder is only mutable while the CTE is added, so that the queries derived from it by steps (and
+        # its consumers) are still copies
+        builder.immutable = False
+        try:
+            builder.with_(selectable, name)
+        finally:
+            builder.immutable = True
+        return builder
+
+    def replace_last(self, builder: QueryBuilder, selectable: Selectable, name: str) -> QueryBuilder:
+        """Replaces the last CTE added to a builder created by this class"""
+        assert self._builder is not None and builder is self._builder
+        builder.immutable = False
+        try:
+            builder._with.pop()
+            builder.with_(selectable, name)
+        finally:
+            builder.immutable = True
+        return builder
+
+
 class FromTable:
-    """A class representing a table-like object that can be selected from"""
+    """A class representing a table-like object that can be selected from
+
+    `columns_types` are the known types of its columns, among the fields of `DataTypeMapping`.
+    """
 
     def __init__(
-        self, *, table_name: str, builder: QueryBuilder | None, query_class: type[Query], schema: str | None = None
+        self,
+        *,
+        table_name: str,
+        builder: QueryBuilder | None,
+        query_class: type[Query],
+        schema: str | None = None,
+        columns_types: Mapping[str, str] | None = None,
     ) -> None:
         self._table_name = table_name
         self._schema = schema
         self._pypika_table = Table(self._table_name, schema=schema)
         self._builder = builder
         self._query_class = query_class
+        self._columns_types: Mapping[str, str] = columns_types or {}
 
     @property
     def name(self) -> str:
         return self._table_name
 
+    def column_type(self, column: str) -> str | None:
+        return self._columns_types.get(column)
+
     def table(self) -> Table:
         return self._pypika_table
 
@@ -243,6 +297,58 @@ class SQLTranslator(ABC):
     FROM_DATE_OP: FromDateOp
     REGEXP_OP: RegexOp
     TO_DATE_OP: ToDateOp
+    # Row-wise steps whose query can be fused with the one of the previous step rather than getting its own CTE (see
+    # `fuse_queries`). Set it to an empty set to disable the fusion of steps
+    FUSABLE_STEPS: frozenset[str] = frozenset(
+        {
+            "absolutevalue",
+            "comparetext",
+            "concatenate",
+            "convert",
+            "delete",
+            "fillna",
+            "filter",
+            "formula",
+            "fromdate",
+            "ifthenelse",
+            "lowercase",
+            "rename",
+            "replacetext",
+            "select",
+            "substring",
+            "text",
+            "todate",
+            "trim",
+            "uppercase",
+        }
+    )
+    # Steps a filter can be moved ahead of, so that it is merged with the domain step and applied when scanning the
+    # table (see `_push_down_filters`). Set it to an empty set to keep filters where they are
+    FILTER_PUSHDOWN_STEPS: frozenset[str] = frozenset(
+        {
+            "absolutevalue",
+            "comparetext",
+            "concatenate",
+            "convert",
+            "delete",
+            "fillna",
+            "formula",
+            "fromdate",
+            "ifthenelse",
+            "lowercase",
+            "rename",
+            "replacetext",
+            "select",
+            "text",
+            "trim",
+            "uppercase",
+        }
+    )
+    # Steps updating columns in place, which select them after the other ones. Their query can not be the last one of
+    # a pipeline in place of a filter, as it is not wrapped in a CTE selecting the columns in order
+    _REORDERING_STEPS = frozenset(
+        {"convert", "fillna", "fromdate", "lowercase", "replace", "replacetext", "todate", "trim", "uppercase"}
+    )
     EVOLUTION_DATE_UNIT: dict["EVOLUTION_TYPE", str] = {
         "vsLastYear": "years",
         "vsLastMonth": "months",
@@ -257,13 +363,24 @@ class SQLTranslator(ABC):
         db_schema: str | None = None,
         known_instances: dict[int, str] | None = None,
         source_rows_subset: int | None = None,
+        tables_columns_types: Mapping[str, Mapping[str, str]] | None = None,
     ) -> None:
         self._tables_columns: Mapping[str, Sequence[str]] = tables_columns or {}
+        # Known types of the columns of tables, among the fields of DataTypeMapping (e.g. "date" or "timestamp"). Date
+        # filters applied when scanning a table compare its date and timestamp columns without casting them
+        self._tables_columns_types: Mapping[str, Mapping[str, str]] = tables_columns_types or {}
         self._db_schema_name = db_schema
         self._db_schema: Schema | None = Schema(db_schema) if db_schema is not None else None
         self._known_instances: dict[int, str] = known_instances or {}
         self._step_count = 0
+        # Index in the pipeline of each translated step, which differs from the step count once filters are pushed
+        # down or merged with the domain step
+        self._step_indexes: list[int] = []
         self._source_rows_subset = source_rows_subset
+        # Columns of the domain to select, and columns read from the output of each step, by step id, if they do not
+        # all have to be (see `_read_columns_by_step`)
+        self._domain_columns: set[str] | None = None
+        self._read_columns: dict[int, set[str] | None] = {}
         self.__id = uuid4().int
 
     def __init_subclass__(cls) -> None:
@@ -308,7 +425,11 @@ class SQLTranslator(ABC):
         # If we have a reference, self._extract_columns_from_domain_step raises
         assert isinstance(domain_step.domain, str)
         table = FromTable(
-            table_name=domain_step.domain, builder=None, query_class=self.QUERY_CLS, schema=self._db_schema
+            table_name=domain_step.domain,
+            builder=None,
+            query_class=self.QUERY_CLS,
+            schema=self._db_schema,
+            columns_types=self._tables_columns_types.get(domain_step.domain),
         )
         step_method: Callable[..., StepContext] = getattr(self, second_step.name)
 
@@ -328,6 +449,80 @@ class SQLTranslator(ABC):
 
         return ctx
 
+    def _push_down_filters(self: Self, steps: Sequence["PipelineStep"]) -> list[tuple[int, "PipelineStep"]]:
+        """
+        Moves the first filter of a pipeline right after its domain step when every step in between is one of
+        `FILTER_PUSHDOWN_STEPS` and does not write the columns it reads, rewriting renamed columns. The filter is then
+        merged with the domain step (see `_merge_first_steps`), which lets warehouses prune partitions and clusters of
+        the table.
+
+        Returns the steps along with their index in the pipeline. Nothing is moved if there already is a filter or top
+        step right after the domain step, as the domain step is only merged with one of them.
+        """
+        indexed_steps = list(enumerate(steps))
+        if len(steps) < 3 or not isinstance(steps[0], DomainStep) or isinstance(steps[1], FilterStep | TopStep):
+            return indexed_steps
+        # Filters can not be moved ahead of another filter: only the first one is a candidate
+        position = next((i for i, step in enumerate(steps) if isinstance(step, FilterStep)), None)
+        if position is None:
+            return indexed_steps
+        if position == len(steps) - 1 and steps[position - 1].name in self._REORDERING_STEPS:
+            return indexed_steps
+        filter_step = steps[position]
+        assert isinstance(filter_step, FilterStep)
+        condition = filter_step.condition
+        for step in reversed(steps[1:position]):
+            if (
+                step.name not in self.FILTER_PUSHDOWN_STEPS
+                or (pushed := push_condition_before(condition, step)) is None
+            ):
+                return indexed_steps
+            condition = pushed
+        return [
+            indexed_steps[0],
+            (position, FilterStep(condition=condition)),
+            *indexed_steps[1:position],
+            *indexed_steps[position + 1 :],
+        ]
+
+    @staticmethod
+    def _unsuffixed_columns(columns: set[str]) -> set[str]:
+        """
+        Returns the names right columns of a join can have before being suffixed with "_right", which they are when
+        a left column has the same name: that left column must be kept for the right one to keep its name.
+        """
+        unsuffixed = set()
+        for column in columns:
+            while column.endswith("_right"):
+                column = column.removesuffix("_right")
+                unsuffixed.add(column)
+        return unsuffixed
+
+    def _read_columns_by_step(
+        self: Self, steps: Sequence["PipelineStep"], read_columns: set[str] | None
+    ) -> list[set[str] | None]:
+        """
+        Returns the columns read from the output of each step, given the ones read from the output of the pipeline
+        (None meaning that any of them may be read).
+
+        Columns of the domain which are not read are not selected from the table (projection pruning), and thus not
+        carried through the CTEs of the following steps.
+        """
+        read_columns_by_step = [read_columns]
+        for step in reversed(steps[1:]):
+            if read_columns is not None and step.name == "append":
+                # Columns are appended by name: the appended pipelines provide the other ones
+                pass
+            elif read_columns is not None and step.name == "join":
+                read_columns = read_columns | self._unsuffixed_columns(read_columns) | {left for left, _ in step.on}
+            else:
+                read_columns = required_columns(step, read_columns)
+            read_columns_by_step.append(read_columns)
+        return read_columns_by_step[::-1]
+
+    def _read_columns_of_step(self: Self, step: "PipelineStep") -> set[str] | None:
+        return self._read_columns.get(id(step))
+
     def _ensure_term_uses_wrapper(self: Self, term: Term):
         """(ugly) monkey patch to make sure pypika term uses the right wrapper"""
         from functools import partial
@@ -345,13 +540,28 @@ class SQLTranslator(ABC):
         steps: Sequence["PipelineStep"],
         query_builder: QueryBuilder | None = None,
         unwrap_last_step: bool = False,
+        read_columns: set[str] | None = None,
     ) -> QueryBuilderContext:
+        """
+        Translates steps into a query builder. If `read_columns` is set, only these columns of the output of the steps
+        will be read, and the other ones may not be selected.
+        """
         if len(steps) <= 0:
             raise ValueError("No steps provided")
         assert steps[0].name == "domain" or steps[0].name == "customsql", (
             f"First step must be one of domain or customsql step, got '{steps[0].name}'"
         )
         self._step_count = 0
+        indexed_steps = self._push_down_filters(steps)
+        read_columns_by_step = self._read_columns_by_step([step for _, step in indexed_steps], read_columns)
+        self._domain_columns = read_columns_by_step[0]
+        self._read_columns = {}
+        for (_, step), step_read_columns in zip(indexed_steps, read_columns_by_step, strict=True):
+            # The same step can not be told apart at different positions
+            self._read_columns[id(step)] = None if id(step) in self._read_columns else step_read_columns
+        self._step_indexes = [index for index, _ in indexed_steps]
+        steps = [step for _, step in indexed_steps]
+        ctes_builder = CTEsBuilder(query_class=self.QUERY_CLS)
 
         # A single custom SQL step must always be wrapped in a CTE, as we cannot apply offset and
         # limit on it directly
@@ -361,6 +571,8 @@ class SQLTranslator(ABC):
         if len(steps) > 1 and isinstance(steps[0], DomainStep) and isinstance(steps[1], FilterStep | TopStep):
             ctx = self._merge_first_steps(domain_step=steps[0], second_step=steps[1])
             remaining_steps = steps[2:]
+            # Both steps are translated as a single one
+            del self._step_indexes[1]
         else:
             ctx = self._step_context_from_first_step(steps[0])
             remaining_steps = steps[1:]
@@ -374,14 +586,12 @@ class SQLTranslator(ABC):
                 )
             else:
                 # otherwise, we wrap it in a CTE
-                builder = (query_builder if query_builder is not None else self.QUERY_CLS).with_(
-                    ctx.selectable, table_name
-                )
+                builder = ctes_builder.with_(query_builder, ctx.selectable, table_name)
                 return QueryBuilderContext(
                     builder=builder, columns=ctx.columns, table_name=table_name, last_step_unwrapped=False
                 )
 
-        builder = (query_builder if query_builder is not None else self.QUERY_CLS).with_(ctx.selectable, table_name)
+        builder = ctes_builder.with_(query_builder, ctx.selectable, table_name)
 
         # In case we want to unwrap, the last step will be treated differently
         if unwrap_last_step:
@@ -390,12 +600,28 @@ class SQLTranslator(ABC):
         else:
             last_step = None
 
+        # Whether the query of the previous step can be fused with the query of the next one
+        fusable = isinstance(steps[0], DomainStep)
         for step in remaining_steps:
             step_method = self._step_method(step.name)
             from_table = FromTable(table_name=table_name, builder=None, query_class=self.QUERY_CLS)
+            previous_selectable = ctx.selectable
             ctx = step_method(step=step, prev_step_table=from_table, builder=builder, columns=ctx.columns)
+            fused = None
+            if fusable and step.name in self.FUSABLE_STEPS and ctx.builder is None:
+                fused = fuse_queries(
+                    previous_query=previous_selectable,
+                    previous_table=table_name,
+                    query=ctx.selectable,
+                    query_class=self.QUERY_CLS,
+                )
             table_name = self._next_step_name()
-            builder = (ctx.builder or builder).with_(ctx.selectable, table_name)
+            if fused is not None:
+                ctx.selectable = fused
+                builder = ctes_builder.replace_last(builder, fused, table_name)
+            else:
+                builder = ctes_builder.with_(ctx.builder or builder, ctx.selectable, table_name)
+            fusable = step.name in self.FUSABLE_STEPS
 
         if last_step is not None:
             from weaverbird.pipeline.steps import AggregateStep, AppendStep, JoinStep, UnpivotStep
@@ -409,7 +635,7 @@ class SQLTranslator(ABC):
                 ctx = step_method(step=last_step, prev_step_table=from_table, builder=builder, columns=ctx.columns)
                 table_name = self._next_step_name()
                 assert ctx.builder is not None
-                builder = ctx.builder.with_(ctx.selectable, table_name)
+                builder = ctes_builder.with_(ctx.builder, ctx.selectable, table_name)
                 return self._unwrap_combination_step(builder=builder, columns=ctx.columns, table_name=table_name)
 
             # Aggregate step without group-by and with granularity has to select from previous_step_table and from
@@ -418,7 +644,7 @@ class SQLTranslator(ABC):
                 from_table = FromTable(table_name=table_name, builder=builder, query_class=self.QUERY_CLS)
                 ctx = step_method(step=last_step, prev_step_table=from_table, builder=builder, columns=ctx.columns)
                 table_name = self._next_step_name()
-                builder = builder.with_(ctx.selectable, table_name)
+                builder = ctes_builder.with_(builder, ctx.selectable, table_name)
                 return QueryBuilderContext(
                     builder=builder, columns=ctx.columns, table_name=table_name, last_step_unwrapped=False
                 )
@@ -437,6 +663,46 @@ class SQLTranslator(ABC):
     def get_query_str(
         self: Self, *, steps: Sequence["PipelineStep"], offset: int | None = None, limit: int | None = None
     ) -> str:
+        return self.materialize_query_str(
+            steps=steps, query_builder_context=self.get_pipeline_query_builder(steps=steps), offset=offset, limit=limit
+        )
+
+    def _translation_failure(
+        self: Self, *, steps: Sequence["PipelineStep"], exc: Exception
+    ) -> PipelineTranslationFailure:
+        index = self._step_count
+        if index < len(self._step_indexes):
+            index = self._step_indexes[index]
+        step_info = {}
+        if index:
+            step_info = {
+                "step_name": steps[index].name,
+                "step_config": steps[index].model_dump(),
+            }
+        return PipelineTranslationFailure(index=index, original_exception=exc, **step_info)
+
+    def get_pipeline_query_builder(self: Self, *, steps: Sequence["PipelineStep"]) -> QueryBuilderContext:
+        """Translates a whole pipeline, to be materialized by `materialize_query_str`"""
+        try:
+            # This method is used by translate_pipeline. We are at the top level here, not in a nested
+            # builder, so we want to unwrap the last step
+            return self.get_query_builder(steps=steps, unwrap_last_step=True)
+        except NotImplementedError:
+            # That error is intentional. Some pypika steps aren't implemented, and it must raise the built-in
+            # not implemented python exception
+            raise
+        except Exception as exc:
+            raise self._translation_failure(steps=steps, exc=exc) from exc
+
+    def materialize_query_str(
+        self: Self,
+        *,
+        steps: Sequence["PipelineStep"],
+        query_builder_context: QueryBuilderContext,
+        offset: int | None = None,
+        limit: int | None = None,
+    ) -> str:
+        """Returns the SQL query of a pipeline translated by `get_pipeline_query_builder`"""
         # If a pipeline ends with a top step and limit is set, it will override the top step's limit.
         if limit and isinstance(steps[-1], TopStep):
             if limit > steps[-1].limit:
@@ -447,25 +713,13 @@ class SQLTranslator(ABC):
             limit = min(limit, self._source_rows_subset)
 
         try:
-            # This method is used by translate_pipeline. We are at the top level here, not in a nested
-            # builder, so we want to unwrap the last step
-            return (
-                self.get_query_builder(steps=steps, unwrap_last_step=True)
-                .materialize(offset=offset, limit=limit)
-                .get_sql()
-            )
+            return query_builder_context.materialize(offset=offset, limit=limit).get_sql()
         except NotImplementedError:
             # That error is intentional. Some pypika steps aren't implemented, and it must raise the built-in
             # not implemented python exception
             raise
         except Exception as exc:
-            step_info = {}
-            if self._step_count:
-                step_info = {
-                    "step_name": steps[self._step_count].name,
-                    "step_config": steps[self._step_count].model_dump(),
-                }
-            raise PipelineTranslationFailure(index=self._step_count, original_exception=exc, **step_info) from exc
+            raise self._translation_failure(steps=steps, exc=exc) from exc
 
     # All other methods implement step from https://weaverbird.toucantoco.com/docs/steps/,
     # the name of the method being the name of the step and the kwargs the rest of the params
@@ -787,7 +1041,8 @@ class SQLTranslator(ABC):
                 tables_columns=self._tables_columns,
                 db_schema=self._db_schema_name,
                 known_instances=self._known_instances,
-            ).get_query_builder(steps=pipeline, query_builder=builder)
+                tables_columns_types=self._tables_columns_types,
+            ).get_query_builder(steps=pipeline, query_builder=builder, read_columns=self._read_columns_of_step(step))
             tables.append(pipeline_ctx.table_name)
             column_lists.append(pipeline_ctx.columns)
             builder = pipeline_ctx.builder
@@ -1094,9 +1349,14 @@ class SQLTranslator(ABC):
         if isinstance(step.domain, Reference):
             raise NotImplementedError(f"[{self.DIALECT}] Cannot resolve a reference to a query")
         try:
-            return list(self._tables_columns[step.domain])
+            columns = list(self._tables_columns[step.domain])
         except KeyError as exc:
             raise UnknownTableColumns(f"Table {exc} not in table_columns") from exc
+        if self._domain_columns is not None and (
+            read_columns := [column for column in columns if column in self._domain_columns]
+        ):
+            return read_columns
+        return columns
 
     # Prefixing domain with a '_', as it is a special case and should not be returned by
     # getattr(self, step_name)
@@ -1212,11 +1472,63 @@ class SQLTranslator(ABC):
     def _cast_to_timestamp(cls, value: str | date | datetime | Field | Term) -> functions.Function:
         return functions.Cast(value, cls.DATA_TYPE_MAPPING.timestamp)
 
+    def _is_timestamp_type(self: Self, column_type: str | None) -> bool:
+        return column_type == "timestamp" or (
+            column_type == "datetime" and self.DATA_TYPE_MAPPING.datetime == self.DATA_TYPE_MAPPING.timestamp
+        )
+
+    @staticmethod
+    def _exact_day(value: date | datetime) -> date | None:
+        """Returns the day of a date, or of a naive datetime at midnight"""
+        if not isinstance(value, datetime):
+            return value
+        if value.tzinfo is None and value == datetime.combine(value.date(), time()):
+            return value.date()
+        return None
+
+    def _cast_to_date(self: Self, value: date) -> functions.Function:
+        return functions.Cast(value.isoformat(), self.DATA_TYPE_MAPPING.date)
+
+    def _sargable_date_criterion(
+        self: Self,
+        column_field: Field,
+        column_type: str | None,
+        operator_name: str,
+        value: date | datetime,
+        timestamp_value: Term,
+    ) -> Criterion | None:
+        """
+        Returns a criterion equivalent to `CAST(column_field AS TIMESTAMP) <operator_name> timestamp_value` which does
+        not cast the column, or None if its type does not allow it. `value` is the value of `timestamp_value`.
+
+        A column which is not cast can be used by warehouses to prune partitions and clusters of the table. Date
+        columns are compared to the day of the value, so that the same rows are matched.
+        """
+        import operator
+
+        op = getattr(operator, operator_name)
+        if self._is_timestamp_type(column_type):
+            return op(column_field, timestamp_value)
+        if column_type != "date" or (isinstance(value, datetime) and value.tzinfo is not None):
+            return None
+
+        if (day := self._exact_day(value)) is not None:
+            return op(column_field, self._cast_to_date(day))
+        # The value is within a day: the column is greater than it from the next day, and lower up to its day
+        day_value = self._cast_to_date(value.date() if isinstance(value, datetime) else value)
+        match operator_name:
+            case "gt" | "ge":
+                return column_field > day_value
+            case "lt" | "le":
+                return column_field <= day_value
+        return None
+
     def _get_single_condition_criterion(
         self: Self, condition: "SimpleCondition", prev_step_table: FromTable
     ) -> Criterion:
         column_field = prev_step_table[condition.column]
         self._ensure_term_uses_wrapper(column_field)
+        column_type = prev_step_table.column_type(condition.column)
 
         # NOTE: type ignore comments below are because of 'Expected type in class pattern; found
         # "Any"' mypy errors. Seems like mypy 0.990 does not like typing.Annotated
@@ -1233,6 +1545,12 @@ class SQLTranslator(ABC):
 
                 if isinstance(condition.value, date | datetime):
                     condition_value = self._cast_to_timestamp(condition.value)
+                    if (
+                        criterion := self._sargable_date_criterion(
+                            column_field, column_type, condition.operator, condition.value, condition_value
+                        )
+                    ) is not None:
+                        return criterion
                     column_field = self._cast_to_timestamp(column_field)
                 else:
                     condition_value = condition.value
@@ -1249,7 +1567,15 @@ class SQLTranslator(ABC):
                 # timestamp as well, as some backends do not support DATETIME == TIMESTAMP
                 # comparisons
                 if all(isinstance(elem, date | datetime | None) for elem in condition.value):
-                    column_field = self._cast_to_timestamp(column_field)
+                    days = [self._exact_day(elem) for elem in condition.value if elem is not None]
+                    if self._is_timestamp_type(column_type):
+                        # The column can be compared as is, which lets warehouses prune partitions of the table
+                        pass
+                    elif column_type == "date" and all(day is not None for day in days):
+                        condition_value = [self._cast_to_date(day) for day in days if day is not None]
+                        condition_value += [None] if None in condition.value else []
+                    else:
+                        column_field = self._cast_to_timestamp(column_field)
                 if condition.operator == "in":
                     if None in condition.value:
                         # handle special case of having NULL amongst selected values
@@ -1368,6 +1694,17 @@ class SQLTranslator(ABC):
                         dt = dateutil_parser.parse(condition.value)
                     dt = dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
                     value_to_compare = self._cast_to_timestamp(dt.strftime("%Y-%m-%d %H:%M:%S"))
+                    # The bound is compared as a naive UTC timestamp
+                    if (
+                        criterion := self._sargable_date_criterion(
+                            column_field,
+                            column_type,
+                            "ge" if condition.operator == "from" else "le",
+                            dt.replace(tzinfo=None, microsecond=0),
+                            value_to_compare,
+                        )
+                    ) is not None:
+                        return criterion
 
                 elif isinstance(condition.value, functions.Function):
                     value_to_compare = condition.value
@@ -1538,12 +1875,17 @@ class SQLTranslator(ABC):
         step: "JoinStep",
     ) -> StepContext:
         steps = self._pipeline_or_domain_name_or_reference_to_pipeline(step.right_pipeline)
+        if (right_read_columns := self._read_columns_of_step(step)) is not None:
+            right_read_columns = (
+                right_read_columns | self._unsuffixed_columns(right_read_columns) | {right for _, right in step.on}
+            )
 
         right_builder_ctx = self.__class__(
             tables_columns=self._tables_columns,
             db_schema=self._db_schema_name,
             known_instances=self._known_instances,
-        ).get_query_builder(steps=steps, query_builder=builder)
+            tables_columns_types=self._tables_columns_types,
+        ).get_query_builder(steps=steps, query_builder=builder, read_columns=right_read_columns)
         left_table = prev_step_table.table()
         right_table = Table(right_builder_ctx.table_name)
 
@@ -0,0 +1,143 @@
+"""
+Fusion of the queries of consecutive row-wise steps.
+
+Every step of a pipeline is translated into its own CTE, selecting from the CTE of the previous step. When both are
+plain `SELECT ... FROM table [WHERE ...]` queries, the query of a step can be merged into the query of the previous
+step, by replacing the columns it reads with the expressions the previous step selects for them:
+
+    WITH __step_0__ AS (SELECT "a", "b" FROM "table"),
+         __step_1__ AS (SELECT "a", UPPER("b") "b" FROM __step_0__ WHERE "a" > 1)
+
+becomes
+
+    WITH __step_1__ AS (SELECT "a", UPPER("b") "b" FROM "table" WHERE "a" > 1)
+"""
+
+from copy import deepcopy
+from typing import Any
+
+from pypika import AliasedQuery, Query, Table
+from pypika.queries import QueryBuilder, Selectable
+from pypika.terms import AggregateFunction, Criterion, ExistsCriterion, Field, LiteralValue, Term
+
+# Query builder attributes of a plain `SELECT ... FROM table [WHERE ...]` query, the only ones which may differ from
+# those of an empty query builder
+_PLAIN_SELECT_ATTRIBUTES = ("_from", "_selects", "_wheres")
+
+
+def _is_plain_select(query: Selectable) -> bool:
+    if not isinstance(query, QueryBuilder) or len(query._from) != 1 or not isinstance(query._from[0], Table):
+        return False
+    empty_query = type(query)()
+    return all(
+        getattr(query, attribute) == value
+        for attribute, value in vars(empty_query).items()
+        if attribute not in _PLAIN_SELECT_ATTRIBUTES
+    )
+
+
+def _terms(query: QueryBuilder) -> list[Term]:
+    return [*query._selects, *([query._wheres] if query._wheres is not None else [])]
+
+
+def _is_scalar(term: Term) -> bool:
+    """Whether a term can be moved to another query: no aggregation, window, raw SQL or subquery"""
+    return not any(
+        isinstance(node, AggregateFunction | LiteralValue | ExistsCriterion | QueryBuilder | AliasedQuery)
+        for node in term.nodes_()
+    )
+
+
+def _column_name(term: Term) -> str | None:
+    if term.alias is not None:
+        return term.alias
+    return term.name if isinstance(term, Field) else None
+
+
+def _substitute(term: Term, expressions: dict[str, Term], table: Table) -> tuple[Term, list[str]] | None:
+    """
+    Returns a copy of `term` in which the fields of `table` are replaced by their expression, along with the names of
+    the replaced fields, or None if one of them has no expression.
+    """
+    memo: dict[int, Any] = {}
+    replaced = []
+    for node in term.nodes_():
+        if not isinstance(node, Field) or (node.table is not None and node.table != table) or id(node) in memo:
+            continue
+        if (expression := expressions.get(node.name)) is None:
+            return None
+        replacement = deepcopy(expression)
+        replacement.alias = None
+        memo[id(node)] = replacement
+        replaced.append(node.name)
+    return deepcopy(term, memo), replaced
+
+
+def fuse_queries(
+    *, previous_query: Selectable, previous_table: str, query: Selectable, query_class: type[Query]
+) -> QueryBuilder | None:
+    """
+    Returns a single query equivalent to `query`, selecting from `previous_table` which is the result of
+    `previous_query`, or None if they can not be fused.
+
+    Queries are only fused when both are plain selects of scalar expressions (see `_is_plain_select` and
+    `_is_scalar`), and at most one of them filters rows. An expression of the previous query is only copied once in
+    the fused query (in addition to being selected as is), so that fusing a chain of steps does not make the query grow
+    exponentially.
+    """
+    if not (_is_plain_select(previous_query) and _is_plain_select(query)):
+        return None
+    assert isinstance(previous_query, QueryBuilder) and isinstance(query, QueryBuilder)
+    table = query._from[0]
+    if table.get_table_name() != previous_table or not all(_is_scalar(term) for term in _terms(query)):
+        return None
+    if previous_query._wheres is not None and query._wheres is not None:
+        # Both conditions would be evaluated together, in an unspecified order: the condition of the step could then
+        # be evaluated on rows excluded by the previous one
+        return None
+
+    expressions: dict[str, Term] = {}
+    for term in previous_query._selects:
+        if (name := _column_name(term)) is None or name in expressions or not _is_scalar(term):
+            return None
+        expressions[name] = term
+
+    selects: list[Term] = []
+    copied_expressions: list[str] = []
+    for term in query._selects:
+        if isinstance(term, Field) and (term.table is None or term.table == table):
+            # A column selected as is, possibly renamed
+            if (expression := expressions.get(term.name)) is None:
+                return None
+            selected = deepcopy(expression)
+            alias = term.alias or term.name
+            selected.alias = None if isinstance(selected, Field) and selected.name == alias else alias
+            selects.append(selected)
+            continue
+        if (substitution := _substitute(term, expressions, table)) is None:
+            return None
+        selects.append(substitution[0])
+        copied_expressions.extend(substitution[1])
+
+    wheres: Criterion | None = None
+    if query._wheres is not None:
+        if (substitution := _substitute(query._wheres, expressions, table)) is None:
+            return None
+        wheres = substitution[0]
+        copied_expressions.extend(substitution[1])
+
+    copied_expressions = [name for name in copied_expressions if not isinstance(expressions[name], Field)]
+    if len(copied_expressions) != len(set(copied_expressions)):
+        return None
+
+    fused = query_class.from_(previous_query._from[0]).select(*selects)
+    for criterion in (previous_query._wheres, wheres):
+        if criterion is not None:
+            fused = fused.where(criterion)
+
+    # Fields of the previous table which were not reached while substituting expressions would now refer to columns
+    # of another table
+    for term in _terms(fused):
+        if previous_table in term.get_sql(with_namespace=True, quote_char=""):
+            return None
+    return fused
@@ -1,2 +1,3 @@
 # ruff: noqa
+from .fingerprint import PipelineFingerprint
 from .pipeline import Pipeline, PipelineStep, PipelineStepWithVariables, PipelineWithVariables
@@ -0,0 +1,159 @@
+"""
+Columns read and written by pipeline steps.
+
+Backends use them to rewrite pipelines without changing their results, e.g. to move filters ahead of the steps they
+do not depend on, or to only read the columns of a domain that the next steps need. Whenever a step's columns cannot
+be known, the functions say so, and the step must be left as is.
+"""
+
+from weaverbird.pipeline.conditions import Condition, ConditionComboAnd, ConditionComboOr
+from weaverbird.pipeline.formula_ast.eval import FormulaParser
+from weaverbird.pipeline.formula_ast.types import ColumnName, Expression, Operation
+from weaverbird.pipeline.pipeline import PipelineStep
+
+
+def condition_columns(condition: Condition) -> set[str]:
+    if isinstance(condition, ConditionComboAnd):
+        return set().union(*(condition_columns(c) for c in condition.and_))
+    elif isinstance(condition, ConditionComboOr):
+        return set().union(*(condition_columns(c) for c in condition.or_))
+    return {condition.column}
+
+
+def _rename_condition_columns(condition: Condition, mapping: dict[str, str]) -> Condition:
+    if isinstance(condition, ConditionComboAnd):
+        return condition.model_copy(update={"and_": [_rename_condition_columns(c, mapping) for c in condition.and_]})
+    elif isinstance(condition, ConditionComboOr):
+        return condition.model_copy(update={"or_": [_rename_condition_columns(c, mapping) for c in condition.or_]})
+    return condition.model_copy(update={"column": mapping.get(condition.column, condition.column)})
+
+
+def _expression_columns(expr: Expression) -> set[str]:
+    if isinstance(expr, Operation):
+        return _expression_columns(expr.left) | _expression_columns(expr.right)
+    elif isinstance(expr, ColumnName):
+        return {expr.name}
+    return set()
+
+
+def _formula_columns(formula: str) -> set[str] | None:
+    try:
+        return _expression_columns(FormulaParser(formula).parse())
+    except Exception:
+        # Invalid formulas will fail during the execution, we just don't know what they read
+        return None
+
+
+def _date_extract_new_columns(step) -> set[str]:
+    if step.operation:
+        return {step.new_column_name or f"{step.column}_{step.operation}"}
+    return set(step.new_columns)
+
+
+def row_wise_columns(step: PipelineStep) -> tuple[set[str] | None, set[str]] | None:
+    """
+    For steps computing each output row from the matching input row only, returns the columns read (None if
+    unknown) and the columns written by the step.
+
+    Returns None for any other step.
+    """
+    match step.name:
+        case "absolutevalue":
+            return {step.column}, {step.new_column}
+        case "comparetext":
+            return {step.str_col_1, step.str_col_2}, {step.new_column_name}
+        case "concatenate":
+            return set(step.columns), {step.new_column_name}
+        case "convert":
+            return set(step.columns), set(step.columns)
+        case "dateextract":
+            return {step.column}, _date_extract_new_columns(step)
+        case "dategranularity":
+            return {step.column}, {step.new_column or step.column}
+        case "duplicate":
+            return {step.column}, {step.new_column_name}
+        case "duration":
+            # start and end columns are converted to dates in place
+            dates = {step.start_date_column, step.end_date_column}
+            return dates, dates | {step.new_column_name}
+        case "fillna":
+            return set(step.columns), set(step.columns)
+        case "formula":
+            return _formula_columns(step.formula), {step.new_column}
+        case "fromdate" | "lowercase" | "uppercase":
+            return {step.column}, {step.column}
+        case "ifthenelse":
+            # "then" and "else" values can be formulas: we can't tell which columns they read
+            return None, {step.new_column}
+        case "replace" | "replacetext":
+            return {step.search_column}, {step.search_column}
+        case "split":
+            return {step.column}, {f"{step.column}_{i + 1}" for i in range(step.number_cols_to_keep)}
+        case "substring":
+            return {step.column}, {step.new_column_name or f"{step.column}_SUBSTR"}
+        case "text":
+            return set(), {step.new_column}
+        case "trim":
+            return set(step.columns), set(step.columns)
+    return None
+
+
+def push_condition_before(condition: Condition, step: PipelineStep) -> Condition | None:
+    """
+    Returns the condition to apply before `step` so that filtering before or after it gives the same result, or None
+    if it is not possible.
+    """
+    columns = condition_columns(condition)
+    match step.name:
+        case "rename":
+            new_to_old = {new: old for old, new in step.to_rename}
+            if len(new_to_old) != len(step.to_rename):
+                return None
+            # A renamed column does not exist anymore after the step: let the filter fail where it is
+            if columns & ({old for old, _ in step.to_rename} - new_to_old.keys()):
+                return None
+            return _rename_condition_columns(condition, new_to_old)
+        case "select":
+            return condition if columns <= set(step.columns) else None
+        case "delete":
+            return None if columns & set(step.columns) else condition
+        case "join":
+            # Only left join keys are guaranteed to reference left columns, and an outer join would add unmatched
+            # right rows
+            if step.type in ("left", "inner") and columns <= {left for left, _ in step.on}:
+                return condition
+            return None
+    if (row_wise := row_wise_columns(step)) is not None:
+        _, written = row_wise
+        return None if columns & written else condition
+    return None
+
+
+def required_columns(step: PipelineStep, downstream: set[str] | None) -> set[str] | None:
+    """
+    Returns the columns a step needs in its input, given the columns needed in its output (None meaning all of them).
+    """
+    match step.name:
+        case "select":
+            return set(step.columns)
+        case "aggregate":
+            if step.keep_original_granularity:
+                return None
+            return set(step.on).union(*(aggregation.columns for aggregation in step.aggregations))
+    if downstream is None:
+        return None
+    match step.name:
+        case "delete":
+            return downstream - set(step.columns)
+        case "rename":
+            return (downstream - {new for _, new in step.to_rename}) | {old for old, _ in step.to_rename}
+        case "filter":
+            return downstream | condition_columns(step.condition)
+        case "sort":
+            return downstream | {sort.column for sort in step.columns}
+        case "top":
+            return downstream | set(step.groups) | {step.rank_on}
+    if (row_wise := row_wise_columns(step)) is not None:
+        read, written = row_wise
+        return None if read is None else (downstream - written) | read
+    return None
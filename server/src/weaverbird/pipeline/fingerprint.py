@@ -0,0 +1,76 @@
+"""
+Canonical fingerprints of pipelines, to be used as cache keys.
+
+Two pipelines that only differ in the way they are spelled (field order, explicit default values, nesting of
+conditions, order of the conditions of a combo or of the values of an inclusion) have the same fingerprint.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from weaverbird.pipeline.pipeline import PipelineStep, PipelineStepWithVariables
+
+_COMBO_KEYS = ("and_", "or_")
+
+
+def _canonical_json(data: Any) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _sorted_unique(items: Iterable[Any]) -> list[Any]:
+    return [item for _, item in sorted({_canonical_json(item): item for item in items}.items())]
+
+
+def _normalize_combo(combo_key: str, conditions: list[Any]) -> Any:
+    flattened: list[Any] = []
+    for condition in conditions:
+        condition = _normalize(condition)
+        # (a AND (b AND c)) is (a AND b AND c)
+        if isinstance(condition, dict) and list(condition.keys()) == [combo_key]:
+            flattened.extend(condition[combo_key])
+        else:
+            flattened.append(condition)
+    flattened = _sorted_unique(flattened)
+    # A combo of a single condition is that condition
+    return flattened[0] if len(flattened) == 1 else {combo_key: flattened}
+
+
+def _normalize(data: Any) -> Any:
+    if isinstance(data, list):
+        return [_normalize(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    if len(data) == 1 and (combo_key := next(iter(data))) in _COMBO_KEYS and isinstance(data[combo_key], list):
+        return _normalize_combo(combo_key, data[combo_key])
+    normalized = {key: _normalize(value) for key, value in data.items()}
+    if normalized.get("operator") in ("in", "nin") and isinstance(normalized.get("value"), list):
+        normalized["value"] = _sorted_unique(normalized["value"])
+    return normalized
+
+
+def canonical_step(step: "PipelineStep | PipelineStepWithVariables") -> str:
+    """Returns a canonical JSON representation of a step"""
+    return _canonical_json(_normalize(step.model_dump(mode="json", exclude_none=True)))
+
+
+class PipelineFingerprint(BaseModel):
+    # Digest of the whole pipeline
+    digest: str
+    # The nth digest is the one of the pipeline made of the n+1 first steps
+    prefix_digests: list[str]
+
+
+def fingerprint_steps(steps: Iterable["PipelineStep | PipelineStepWithVariables"]) -> PipelineFingerprint:
+    hash_ = hashlib.sha256()
+    prefix_digests = []
+    for step in steps:
+        hash_.update(canonical_step(step).encode())
+        # Separating steps, so that their representations can not overlap
+        hash_.update(b"\n")
+        prefix_digests.append(hash_.hexdigest())
+    return PipelineFingerprint(digest=hash_.hexdigest(), prefix_digests=prefix_digests)
@@ -18,6 +18,7 @@ from weaverbird.pipeline.conditions import (
     InclusionCondition,
     MatchCondition,
 )
+from weaverbird.pipeline.fingerprint import PipelineFingerprint, fingerprint_steps
 from weaverbird.pipeline.steps import (
     AbsoluteValueStep,
     AbsoluteValueStepWithVariable,
@@ -171,6 +172,14 @@ class Pipeline(BaseModel):
     def dict(self, *, exclude_none: bool = True, **kwargs) -> dict:
         return self.model_dump(exclude_none=exclude_none, **kwargs)
 
+    def fingerprint(self) -> PipelineFingerprint:
+        """
+        Returns a canonical digest of the pipeline, along with the digest of each of its prefixes.
+
+        Equivalent spellings of the same pipeline have the same digest, which makes it suitable as a cache key.
+        """
+        return fingerprint_steps(self.steps)
+
     async def resolve_references(self, reference_resolver: ReferenceResolver) -> Self | None:
         """
         Walk the pipeline steps and replace any reference by its corresponding pipeline.
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from tests.utils import assert_dataframes_equals
+from weaverbird.backends.pandas_executor import (
+    PipelineExecutionFailure,
+    execute_pipeline,
+    execute_pipeline_async,
+    preview_pipeline,
+    preview_pipeline_async,
+)
+from weaverbird.pipeline import Pipeline
+
+DOMAINS = {
+    "sales": pd.DataFrame({"city": ["Paris", "Lyon"], "price": [10, 20]}),
+    "cities": pd.DataFrame({"city": ["Paris", "Lyon"], "country": ["FR", "FR"]}),
+    "other_sales": pd.DataFrame({"city": ["Nice"], "price": [30]}),
+}
+
+PIPELINE = Pipeline(
+    steps=[
+        {"name": "domain", "domain": "sales"},
+        {"name": "append", "pipelines": ["other_sales", [{"name": "domain", "domain": "sales"}]]},
+        {"name": "join", "type": "left", "right_pipeline": "cities", "on": [["city", "city"]]},
+        {"name": "sort", "columns": [{"column": "price", "order": "asc"}]},
+    ]
+)
+
+
+@pytest.mark.asyncio
+async def test_domains_are_retrieved_concurrently():
+    retrieved: list[str] = []
+    # Every retrieval must be in progress at the same time for the barrier to be passed
+    barrier = asyncio.Barrier(3)
+
+    async def domain_retriever(domain: str) -> pd.DataFrame:
+        retrieved.append(domain)
+        await asyncio.wait_for(barrier.wait(), timeout=5)
+        return DOMAINS[domain]
+
+    df, report = await execute_pipeline_async(PIPELINE, domain_retriever)
+    expected, expected_report = execute_pipeline(PIPELINE, DOMAINS.__getitem__)
+    assert_dataframes_equals(df, expected)
+    assert [r.step_index for r in report.steps_reports] == [r.step_index for r in expected_report.steps_reports]
+    assert sorted(retrieved) == ["cities", "other_sales", "sales"]
+
+
+@pytest.mark.asyncio
+async def test_preview_pipeline_async():
+    async def domain_retriever(domain: str) -> pd.DataFrame:
+        return DOMAINS[domain]
+
+    result = await preview_pipeline_async(PIPELINE, domain_retriever, limit=2, offset=1)
+    assert json.loads(result) == json.loads(preview_pipeline(PIPELINE, DOMAINS.__getitem__, limit=2, offset=1))
+
+
+@pytest.mark.asyncio
+async def test_retrieval_failure_is_reported_by_the_step_reading_the_domain():
+    async def domain_retriever(domain: str) -> pd.DataFrame:
+        if domain == "cities":
+            raise ValueError("unavailable")
+        return DOMAINS[domain]
+
+    with pytest.raises(PipelineExecutionFailure) as excinfo:
+        await execute_pipeline_async(PIPELINE, domain_retriever)
+    assert excinfo.value.index == 2
+    assert isinstance(excinfo.value.original_exception, ValueError)
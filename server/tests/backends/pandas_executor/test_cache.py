@@ -0,0 +1,95 @@
+import json
+
+import pandas as pd
+import pytest
+from pytest_mock import MockFixture
+
+from tests.utils import assert_dataframes_equals
+from weaverbird.backends.pandas_executor import PipelineCache
+from weaverbird.backends.pandas_executor.pipeline_executor import execute_pipeline, preview_pipeline
+from weaverbird.pipeline import Pipeline
+
+DOMAINS = {
+    "sales": pd.DataFrame({"city": ["Paris", "Lyon", "Paris"], "price": [10, 20, 30]}),
+    "cities": pd.DataFrame({"name": ["Paris", "Lyon"], "country": ["FR", "FR"]}),
+}
+
+STEPS = [
+    {"name": "domain", "domain": "sales"},
+    {"name": "formula", "new_column": "double", "formula": "[price] * 2"},
+    {"name": "join", "type": "left", "right_pipeline": "cities", "on": [["city", "name"]]},
+    {"name": "trim", "columns": ["city"]},
+]
+
+
+@pytest.fixture
+def domain_retriever(mocker: MockFixture):
+    return mocker.Mock(side_effect=lambda name: DOMAINS[name])
+
+
+def test_only_steps_after_cached_prefix_are_executed(domain_retriever):
+    cache = PipelineCache(max_size_in_bytes=10**6)
+    expected, _ = execute_pipeline(Pipeline(steps=STEPS), domain_retriever, cache=cache)
+    assert len(cache) == len(STEPS)
+    domain_retriever.reset_mock()
+
+    new_steps = [*STEPS[:-1], {"name": "uppercase", "column": "city"}]
+    result, report = execute_pipeline(Pipeline(steps=new_steps), domain_retriever, cache=cache)
+
+    domain_retriever.assert_not_called()
+    assert [r.step_index for r in report.steps_reports] == [3]
+    assert result["city"].tolist() == ["PARIS", "LYON", "PARIS"]
+    # Steps modifying their input in place must not alter cached results
+    cached, report = execute_pipeline(Pipeline(steps=STEPS), domain_retriever, cache=cache)
+    assert report.steps_reports == []
+    assert_dataframes_equals(cached, expected)
+
+
+def test_domain_version_invalidates_prefixes(domain_retriever):
+    versions = {"sales": 1, "cities": 1}
+    cache = PipelineCache(max_size_in_bytes=10**6, domain_version=lambda domain: versions[domain])
+    execute_pipeline(Pipeline(steps=STEPS), domain_retriever, cache=cache)
+    versions["cities"] = 2
+    _, report = execute_pipeline(Pipeline(steps=STEPS), domain_retriever, cache=cache)
+    # The prefixes before the join do not read "cities"
+    assert [r.step_index for r in report.steps_reports] == [2, 3]
+
+
+def test_lru_eviction_under_byte_budget():
+    df = pd.DataFrame({"a": range(100)})
+    size = int(df.memory_usage(deep=True).sum())
+    cache = PipelineCache(max_size_in_bytes=2 * size)
+    cache.put("first", df)
+    cache.put("second", df)
+    cache.get("first")
+    cache.put("third", df)
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.size_in_bytes == 2 * size
+
+    cache.put("too big", pd.concat([df] * 3))
+    assert cache.get("too big") is None
+
+
+def test_optimized_execution_caches_pipeline_prefixes(domain_retriever):
+    cache = PipelineCache(max_size_in_bytes=10**6)
+    steps = [
+        *STEPS[:2],
+        {"name": "filter", "condition": {"column": "city", "operator": "eq", "value": "Paris"}},
+    ]
+    execute_pipeline(Pipeline(steps=steps), domain_retriever, cache=cache, optimize=True)
+    keys = cache.prefix_keys(Pipeline(steps=steps).steps)
+    # The filter is executed right after the domain: only the domain and the full pipeline match a prefix
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_preview_uses_cache(domain_retriever):
+    cache = PipelineCache(max_size_in_bytes=10**6)
+    preview_pipeline(Pipeline(steps=STEPS), domain_retriever, cache=cache)
+    domain_retriever.reset_mock()
+    result = json.loads(preview_pipeline(Pipeline(steps=STEPS), domain_retriever, limit=1, cache=cache))
+    domain_retriever.assert_not_called()
+    assert result["total"] == 3
+    assert len(result["data"]) == 1
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pandas as pd
+import pytest
+from pytest_mock import MockFixture
+
+from tests.utils import assert_dataframes_equals
+from weaverbird.backends.pandas_executor import compile_pipeline, execute_pipeline_as_dag
+from weaverbird.backends.pandas_executor.pipeline_executor import PipelineExecutionFailure, execute_pipeline
+from weaverbird.pipeline import Pipeline
+
+DOMAINS = {
+    "sales": pd.DataFrame({"city": ["Paris", "Lyon", "Paris", "Nice"], "price": [10, 20, 30, 40]}),
+    "cities": pd.DataFrame({"city": ["Paris", "Lyon", "Nice"], "country": ["FR", "FR", "FR"]}),
+}
+
+SALES_BY_CITY = [
+    {"name": "domain", "domain": "sales"},
+    {"name": "filter", "condition": {"column": "price", "operator": "gt", "value": 10}},
+    {
+        "name": "aggregate",
+        "on": ["city"],
+        "aggregations": [{"columns": ["price"], "newcolumns": ["price"], "aggfunction": "sum"}],
+    },
+]
+
+PIPELINE = Pipeline(
+    steps=[
+        {"name": "domain", "domain": "cities"},
+        {"name": "join", "type": "left", "right_pipeline": SALES_BY_CITY, "on": [["city", "city"]]},
+        {
+            "name": "append",
+            "pipelines": [
+                SALES_BY_CITY,
+                SALES_BY_CITY[:2] + [{"name": "uppercase", "column": "city"}],
+                "cities",
+            ],
+        },
+    ]
+)
+
+
+@pytest.fixture
+def domain_retriever(mocker: MockFixture):
+    return mocker.Mock(side_effect=lambda domain: DOMAINS[domain].copy())
+
+
+def test_identical_sub_pipelines_share_nodes():
+    dag = compile_pipeline(PIPELINE)
+    # The main pipeline has 3 steps, the sales sub-pipelines 4 distinct steps, "cities" is the main domain
+    assert len(dag.nodes) == 7
+    join_node, append_node = (dag.nodes[key] for key in dag.main_keys[1:])
+    assert append_node.sub_pipelines[0] == join_node.sub_pipelines[0]
+    assert append_node.sub_pipelines[1][:2] == join_node.sub_pipelines[0][:2]
+    assert append_node.sub_pipelines[2] == dag.main_keys[:1]
+    # Failures of shared steps are attributed to the first step of the main pipeline requiring them
+    assert dag.nodes[append_node.sub_pipelines[0][-1]].main_step_index == 1
+    assert dag.nodes[append_node.sub_pipelines[1][-1]].main_step_index == 2
+    # Nodes are in a topological order
+    keys = list(dag.nodes)
+    for index, node in enumerate(dag.nodes.values()):
+        assert all(keys.index(dependency) < index for dependency in node.dependencies)
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_dag_execution_gives_same_result(domain_retriever, max_workers):
+    expected, expected_report = execute_pipeline(PIPELINE, lambda domain: DOMAINS[domain].copy())
+    if max_workers is None:
+        result, report = execute_pipeline_as_dag(PIPELINE, domain_retriever)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            result, report = execute_pipeline_as_dag(PIPELINE, domain_retriever, pool=pool)
+
+    assert_dataframes_equals(result, expected)
+    # Each domain is retrieved once, and the domains are not mutated
+    assert sorted(call.args[0] for call in domain_retriever.call_args_list) == ["cities", "sales"]
+    pd.testing.assert_frame_equal(DOMAINS["cities"], domain_retriever("cities"))
+    assert [r.step_index for r in report.steps_reports] == [r.step_index for r in expected_report.steps_reports]
+    assert [len(r.sub_pipelines_reports) for r in report.steps_reports] == [0, 1, 2]
+    assert [len(r.steps_reports) for r in report.steps_reports[2].sub_pipelines_reports] == [3, 3]
+
+
+def test_independent_branches_run_concurrently():
+    # Both domains must be retrieved at the same time for the barrier to be passed
+    barrier = Barrier(2, timeout=5)
+
+    def domain_retriever(domain: str) -> pd.DataFrame:
+        barrier.wait()
+        return DOMAINS[domain]
+
+    pipeline = Pipeline(
+        steps=[{"name": "domain", "domain": "cities"}, {"name": "append", "pipelines": [SALES_BY_CITY[:2]]}]
+    )
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        result, _ = execute_pipeline_as_dag(pipeline, domain_retriever, pool=pool)
+    assert len(result) == 6
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_dag_execution_failure(max_workers):
+    pipeline = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "cities"},
+            {"name": "rename", "to_rename": [["city", "town"]]},
+            {
+                "name": "append",
+                "pipelines": [[{"name": "domain", "domain": "sales"}, {"name": "trim", "columns": ["x"]}]],
+            },
+        ]
+    )
+    if max_workers is None:
+        with pytest.raises(PipelineExecutionFailure) as excinfo:
+            execute_pipeline_as_dag(pipeline, DOMAINS.__getitem__)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool, pytest.raises(PipelineExecutionFailure) as excinfo:
+            execute_pipeline_as_dag(pipeline, DOMAINS.__getitem__, pool=pool)
+    assert excinfo.value.index == 2
+    assert isinstance(excinfo.value.original_exception, PipelineExecutionFailure)
+    assert excinfo.value.original_exception.index == 1
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+from pytest_mock import MockFixture
+
+from weaverbird.backends.pandas_executor import CachingDomainRetriever
+from weaverbird.backends.pandas_executor.pipeline_executor import execute_pipeline
+from weaverbird.pipeline import Pipeline
+from weaverbird.pipeline.steps.utils.combination import Reference
+
+DOMAINS = {
+    "sales": pd.DataFrame({"city": [" Paris", "Lyon "], "price": [10, 20]}),
+    "cities": pd.DataFrame({"name": ["Paris", "Lyon"], "country": ["FR", "FR"]}),
+}
+
+
+@pytest.fixture
+def domain_retriever(mocker: MockFixture):
+    return mocker.Mock(side_effect=lambda domain: DOMAINS[domain if isinstance(domain, str) else domain.uid].copy())
+
+
+def test_domain_referenced_several_times_is_retrieved_once(domain_retriever):
+    retriever = CachingDomainRetriever(domain_retriever)
+    df, _ = execute_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "append", "pipelines": ["sales", [{"name": "domain", "domain": "sales"}]]},
+                {"name": "trim", "columns": ["city"]},
+            ]
+        ),
+        retriever,
+    )
+    assert len(df) == 6
+    domain_retriever.assert_called_once_with("sales")
+    assert (retriever.hits, retriever.misses) == (2, 1)
+
+
+def test_cached_domains_are_not_mutated(domain_retriever):
+    retriever = CachingDomainRetriever(domain_retriever)
+    execute_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "trim", "columns": ["city"]},
+                {"name": "rename", "to_rename": [["price", "cost"]]},
+            ]
+        ),
+        retriever,
+    )
+    pd.testing.assert_frame_equal(retriever("sales"), DOMAINS["sales"])
+
+
+def test_cached_domains_are_not_mutated_in_place(domain_retriever):
+    retriever = CachingDomainRetriever(domain_retriever)
+    retriever("sales").loc[0, "price"] = 99
+    retriever("sales").loc[:, "city"] = "Bordeaux"
+    pd.testing.assert_frame_equal(retriever("sales"), DOMAINS["sales"])
+    assert (retriever.hits, retriever.misses) == (2, 1)
+
+
+def test_invalidation(domain_retriever):
+    retriever = CachingDomainRetriever(domain_retriever)
+    retriever("sales")
+    retriever(Reference(uid="cities"))
+    retriever.invalidate(Reference(uid="cities"))
+    retriever("sales")
+    retriever(Reference(uid="cities"))
+    assert domain_retriever.call_count == 3
+
+    retriever.invalidate()
+    assert len(retriever) == 0
+    assert retriever.size_in_bytes == 0
+
+
+def test_ttl(domain_retriever):
+    now = 0.0
+    retriever = CachingDomainRetriever(domain_retriever, ttl_in_seconds=10, clock=lambda: now)
+    retriever("sales")
+    now = 5
+    retriever("sales")
+    assert domain_retriever.call_count == 1
+    now = 20
+    retriever("sales")
+    assert domain_retriever.call_count == 2
+
+
+def test_size_eviction(domain_retriever):
+    max_size = max(int(df.memory_usage(deep=True).sum()) for df in DOMAINS.values())
+    retriever = CachingDomainRetriever(domain_retriever, max_size_in_bytes=max_size)
+    retriever("sales")
+    retriever("cities")
+    assert len(retriever) == 1
+    retriever("sales")
+    assert domain_retriever.call_count == 3
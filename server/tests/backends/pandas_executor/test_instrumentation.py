@@ -0,0 +1,118 @@
+import logging
+
+import pandas as pd
+import pytest
+
+from weaverbird.backends.pandas_executor import Instrumentation, InstrumentationLevel, execute_pipeline
+from weaverbird.backends.pandas_executor.instrumentation import estimate_memory_usage
+from weaverbird.pipeline import Pipeline
+
+DOMAINS = {"sales": pd.DataFrame({"city": ["Paris", "Lyon"] * 50, "price": range(100)})}
+PIPELINE = Pipeline(
+    steps=[
+        {"name": "domain", "domain": "sales"},
+        {"name": "filter", "condition": {"column": "price", "operator": "lt", "value": 10}},
+        {"name": "uppercase", "column": "city"},
+    ]
+)
+
+
+def _monitored_steps(caplog) -> list[dict]:
+    return [record.step for record in caplog.records if record.getMessage() == "[step-monitor]"]
+
+
+def test_callbacks():
+    events = []
+    instrumentation = Instrumentation(
+        before_step=[
+            lambda step, index, df: events.append(("before", step.name, index, None if df is None else len(df)))
+        ],
+        after_step=[lambda step, index, df, report: events.append(("after", step.name, report.step_index, len(df)))],
+    )
+    execute_pipeline(PIPELINE, DOMAINS.__getitem__, instrumentation=instrumentation)
+    assert events == [
+        ("before", "domain", 0, None),
+        ("after", "domain", 0, 100),
+        ("before", "filter", 1, 100),
+        ("after", "filter", 1, 10),
+        ("before", "uppercase", 2, 10),
+        ("after", "uppercase", 2, 10),
+    ]
+
+
+@pytest.mark.parametrize("level", list(InstrumentationLevel))
+def test_levels(caplog, level):
+    caplog.set_level(logging.INFO)
+    _, report = execute_pipeline(PIPELINE, DOMAINS.__getitem__, instrumentation=Instrumentation(level=level))
+    monitored_steps = _monitored_steps(caplog)
+
+    if level == InstrumentationLevel.OFF:
+        assert monitored_steps == []
+        assert all(r.memory_used_in_bytes == 0 for r in report.steps_reports)
+        return
+    assert [s["sizes"]["rows"] for s in monitored_steps] == [100, 10, 10]
+    assert all(r.memory_used_in_bytes > 0 for r in report.steps_reports)
+    if level == InstrumentationLevel.CHEAP:
+        assert all("details" not in s and "memory_used" not in s["sizes"] for s in monitored_steps)
+    else:
+        assert monitored_steps[1]["details"]["name"] == "filter"
+        assert all("memory_used" in s["sizes"] for s in monitored_steps)
+
+
+def test_cheap_level_is_the_default(caplog):
+    caplog.set_level(logging.INFO)
+    execute_pipeline(PIPELINE, DOMAINS.__getitem__)
+    assert len(_monitored_steps(caplog)) == 3
+    assert "memory_used" not in _monitored_steps(caplog)[0]["sizes"]
+
+
+def test_estimate_memory_usage():
+    df = pd.DataFrame({"text": [f"some text {i}" for i in range(100_000)], "number": range(100_000)})
+    exact = estimate_memory_usage(df)
+    assert exact == df.memory_usage(deep=True).sum()
+    assert estimate_memory_usage(df, sample_size=1000) == pytest.approx(exact, rel=0.05)
+
+
+def test_profile(tmp_path):
+    pipeline = Pipeline(
+        steps=[
+            *PIPELINE.steps,
+            {"name": "trim", "columns": ["city"]},
+            {"name": "append", "pipelines": [[{"name": "domain", "domain": "sales"}]]},
+        ]
+    )
+    _, report = execute_pipeline(
+        pipeline,
+        DOMAINS.__getitem__,
+        instrumentation=Instrumentation(profile=True, profile_calls=True, calls_stats_directory=tmp_path),
+    )
+    domain_profile, filter_profile, uppercase_profile, trim_profile, append_profile = (
+        r.profile for r in report.steps_reports
+    )
+    assert (domain_profile.rows_in, domain_profile.rows_out, domain_profile.copied_columns) == (None, 100, None)
+    assert (filter_profile.rows_in, filter_profile.rows_out) == (100, 10)
+    assert (uppercase_profile.columns_in, uppercase_profile.columns_out) == (2, 2)
+    # `DataFrame.assign` copies every column
+    assert uppercase_profile.copied_columns == 2
+    # The trimmed column is replaced in place, the other one is shared with the input
+    assert trim_profile.copied_columns == 1
+    assert append_profile.rows_out == 110
+    assert all(
+        p.wall_time_in_ms >= 0 and p.cpu_time_in_ms >= 0 and p.peak_memory_in_bytes >= 0 for p in (filter_profile,)
+    )
+    assert "cumulative" in filter_profile.calls_stats
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "0-domain.pstats",
+        "1-filter.pstats",
+        "2-uppercase.pstats",
+        "3-trim.pstats",
+        "4-append.pstats",
+    ]
+    # Sub-pipelines are not profiled
+    assert report.steps_reports[4].sub_pipelines_reports[0].steps_reports[0].profile is None
+    assert '"rows_out":10' in report.model_dump_json()
+
+
+def test_no_profile_by_default():
+    _, report = execute_pipeline(PIPELINE, DOMAINS.__getitem__)
+    assert all(r.profile is None for r in report.steps_reports)
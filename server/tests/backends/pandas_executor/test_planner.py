@@ -0,0 +1,168 @@
+import pandas as pd
+import pytest
+
+from tests.utils import assert_dataframes_equals
+from weaverbird.backends.pandas_executor.pipeline_executor import execute_pipeline
+from weaverbird.backends.pandas_executor.planner import plan_pipeline
+from weaverbird.pipeline import Pipeline
+
+DOMAINS = {
+    "sales": pd.DataFrame(
+        {
+            "city": ["Paris", "Lyon", "Paris", "Nantes", "Lyon"],
+            "product": ["a", "b", "c", "a", "b"],
+            "price": [10, 20, 30, 40, 50],
+            "quantity": [1, 2, 3, 4, 5],
+            "comment": ["x", "y", "z", "t", "u"],
+        }
+    ),
+    "cities": pd.DataFrame({"name": ["Paris", "Lyon", "Nantes"], "country": ["FR", "FR", "FR"]}),
+}
+
+
+def _domain_retriever(name):
+    return DOMAINS[name].copy()
+
+
+def test_filter_pushed_before_row_wise_steps():
+    plan = plan_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "formula", "new_column": "total", "formula": "[price] * [quantity]"},
+                {"name": "uppercase", "column": "product"},
+                {"name": "filter", "condition": {"column": "city", "operator": "eq", "value": "Paris"}},
+            ]
+        )
+    )
+    assert [s.step.name for s in plan.steps] == ["domain", "filter", "formula", "uppercase"]
+    assert [s.indexes for s in plan.steps] == [(0,), (3,), (1,), (2,)]
+
+
+def test_filter_not_pushed_before_step_writing_its_column():
+    plan = plan_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "text", "new_column": "other", "text": "foo"},
+                {"name": "formula", "new_column": "total", "formula": "[price] * [quantity]"},
+                {"name": "filter", "condition": {"column": "total", "operator": "gt", "value": 50}},
+            ]
+        )
+    )
+    assert [s.step.name for s in plan.steps] == ["domain", "text", "formula", "filter"]
+
+
+def test_filter_pushed_through_rename():
+    plan = plan_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "rename", "to_rename": [["city", "town"]]},
+                {"name": "filter", "condition": {"column": "town", "operator": "eq", "value": "Paris"}},
+            ]
+        )
+    )
+    assert [s.step.name for s in plan.steps] == ["domain", "filter", "rename"]
+    assert plan.steps[1].step.condition.column == "city"
+
+
+def test_filter_not_pushed_through_outer_join():
+    plan = plan_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "join", "type": "left outer", "right_pipeline": "cities", "on": [["city", "name"]]},
+                {"name": "filter", "condition": {"column": "city", "operator": "eq", "value": "Paris"}},
+            ]
+        )
+    )
+    assert [s.step.name for s in plan.steps] == ["domain", "join", "filter"]
+
+
+def test_adjacent_filters_are_fused():
+    plan = plan_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "filter", "condition": {"column": "city", "operator": "eq", "value": "Paris"}},
+                {"name": "text", "new_column": "other", "text": "foo"},
+                {"name": "filter", "condition": {"column": "price", "operator": "gt", "value": 15}},
+            ]
+        )
+    )
+    assert [s.step.name for s in plan.steps] == ["domain", "filter", "text"]
+    assert plan.steps[1].indexes == (1, 3)
+
+
+def test_domain_columns_pruned():
+    plan = plan_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "rename", "to_rename": [["city", "town"]]},
+                {"name": "formula", "new_column": "total", "formula": "[price] * [quantity]"},
+                {
+                    "name": "aggregate",
+                    "on": ["town"],
+                    "aggregations": [{"columns": ["total"], "aggfunction": "sum", "newcolumns": ["total"]}],
+                },
+            ]
+        )
+    )
+    assert plan.steps[0].keep_columns == {"city", "price", "quantity"}
+
+
+def test_domain_columns_not_pruned_without_projection():
+    plan = plan_pipeline(
+        Pipeline(
+            steps=[
+                {"name": "domain", "domain": "sales"},
+                {"name": "formula", "new_column": "total", "formula": "[price] * [quantity]"},
+            ]
+        )
+    )
+    assert plan.steps[0].keep_columns is None
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        [
+            {"name": "domain", "domain": "sales"},
+            {"name": "rename", "to_rename": [["city", "town"], ["price", "city"]]},
+            {"name": "formula", "new_column": "total", "formula": "[city] * [quantity]"},
+            {"name": "filter", "condition": {"column": "town", "operator": "ne", "value": "Lyon"}},
+            {"name": "filter", "condition": {"column": "city", "operator": "gt", "value": 10}},
+            {"name": "select", "columns": ["total", "town"]},
+        ],
+        [
+            {"name": "domain", "domain": "sales"},
+            {"name": "join", "type": "inner", "right_pipeline": "cities", "on": [["city", "name"]]},
+            {"name": "lowercase", "column": "product"},
+            {"name": "filter", "condition": {"column": "city", "operator": "in", "value": ["Paris", "Nantes"]}},
+        ],
+        [
+            {"name": "domain", "domain": "sales"},
+            {
+                "name": "append",
+                "pipelines": [
+                    [
+                        {"name": "domain", "domain": "sales"},
+                        {"name": "text", "new_column": "comment", "text": "appended"},
+                        {"name": "filter", "condition": {"column": "product", "operator": "eq", "value": "a"}},
+                    ]
+                ],
+            },
+            {"name": "delete", "columns": ["quantity"]},
+            {"name": "delete", "columns": ["price"]},
+        ],
+    ],
+)
+def test_optimized_execution_gives_same_result(steps):
+    pipeline = Pipeline(steps=steps)
+    expected, _ = execute_pipeline(pipeline, _domain_retriever)
+    result, report = execute_pipeline(pipeline, _domain_retriever, optimize=True)
+    assert_dataframes_equals(result, expected)
+    assert list(result.columns) == list(expected.columns)
+    assert len(report.steps_reports) == len(plan_pipeline(pipeline).steps)
@@ -0,0 +1,64 @@
+import json
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.io.json import build_table_schema
+from shapely.geometry import Point
+
+from weaverbird.backends.pandas_executor.serialization import serialize_preview
+
+DF = pd.DataFrame(
+    {
+        "name": ["a", None, "c", "d"],
+        "value": [0.1 + 0.2, np.nan, np.inf, 4.0],
+        "count": [1, 2, 3, 4],
+        "date": pd.to_datetime(["2020-01-01 00:00:00", None, "2021-06-30 12:00:00", "2022-01-01 00:00:00"]),
+        "flag": [True, False, True, False],
+    }
+)
+
+
+def _round_trip_preview(df: pd.DataFrame, limit: int, offset: int) -> dict:
+    """The payload as it used to be built, parsing pandas' JSON and serializing it again"""
+
+    def _default_formatter(obj):
+        if hasattr(obj, "geom_type"):
+            return obj.geom_type
+        return obj
+
+    return {
+        "schema": build_table_schema(df, index=False),
+        "offset": offset,
+        "limit": limit,
+        "total": df.shape[0],
+        "data": json.loads(df[offset : offset + limit].to_json(orient="records", default_handler=_default_formatter)),
+    }
+
+
+@pytest.mark.parametrize("limit,offset", [(50, 0), (2, 1), (2, 10)])
+def test_records_payload_is_unchanged(limit, offset):
+    assert json.loads(serialize_preview(DF, limit, offset)) == _round_trip_preview(DF, limit, offset)
+
+
+def test_geometries_are_serialized_as_their_type():
+    # Like in `execute_pipeline` results
+    df = pd.DataFrame(gpd.GeoDataFrame({"name": ["a", "b"], "geometry": [Point(0, 0), None]}))
+    assert json.loads(serialize_preview(df, 50, 0))["data"] == _round_trip_preview(df, 50, 0)["data"]
+    assert json.loads(serialize_preview(df, 50, 0, orient="columns"))["data"]["geometry"] == ["Point", None]
+
+
+def test_columns_payload():
+    records_payload = json.loads(serialize_preview(DF, 2, 1))
+    columns_payload = json.loads(serialize_preview(DF, 2, 1, orient="columns"))
+    assert columns_payload == {
+        **records_payload,
+        "data": {column: [row[column] for row in records_payload["data"]] for column in DF.columns},
+    }
+
+
+def test_total_override():
+    payload = json.loads(serialize_preview(DF, 2, 0, total=100, total_is_approximate=True))
+    assert (payload["total"], payload["total_is_approximate"]) == (100, True)
+    assert "total_is_approximate" not in json.loads(serialize_preview(DF, 2, 0))
@@ -0,0 +1,66 @@
+from collections.abc import Iterator
+from itertools import islice
+
+import pandas as pd
+import pytest
+
+from tests.utils import assert_dataframes_equals
+from weaverbird.backends.pandas_executor import PipelineExecutionFailure, chunked, execute_pipeline, stream_pipeline
+from weaverbird.pipeline import Pipeline
+
+DOMAINS = {
+    "sales": pd.DataFrame({"city": [" Paris", "Lyon ", "Nice"] * 10, "price": range(30)}),
+    "cities": pd.DataFrame({"city": ["Paris", "Lyon", "Nice"], "country": ["FR", "FR", "FR"]}),
+}
+
+PIPELINE = Pipeline(
+    steps=[
+        {"name": "domain", "domain": "sales"},
+        {"name": "trim", "columns": ["city"]},
+        {"name": "filter", "condition": {"column": "price", "operator": "gt", "value": 3}},
+        {
+            "name": "aggregate",
+            "on": ["city"],
+            "aggregations": [{"columns": ["price"], "newcolumns": ["price"], "aggfunction": "sum"}],
+        },
+        {"name": "formula", "new_column": "double", "formula": "price * 2"},
+        {"name": "join", "type": "left", "right_pipeline": "cities", "on": [["city", "city"]]},
+        {"name": "sort", "columns": [{"column": "city", "order": "asc"}]},
+    ]
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_stream_pipeline_gives_same_result(chunk_size):
+    expected, _ = execute_pipeline(PIPELINE, lambda domain: DOMAINS[domain].copy())
+    chunks = list(stream_pipeline(PIPELINE, chunked(DOMAINS.__getitem__, chunk_size)))
+    assert len(chunks) == 1
+    assert_dataframes_equals(chunks[0], expected)
+    # Domains are not mutated
+    assert DOMAINS["sales"]["city"].tolist()[:2] == [" Paris", "Lyon "]
+
+
+def test_row_wise_steps_are_applied_lazily():
+    retrieved_chunks = 0
+
+    def domain_retriever(domain: str) -> Iterator[pd.DataFrame]:
+        nonlocal retrieved_chunks
+        for chunk in chunked(DOMAINS.__getitem__, 5)(domain):
+            retrieved_chunks += 1
+            yield chunk
+
+    chunks = stream_pipeline(Pipeline(steps=PIPELINE.steps[:3]), domain_retriever)
+    first_chunks = list(islice(chunks, 2))
+    assert retrieved_chunks == 2
+    assert first_chunks[0]["price"].tolist() == [4]
+    assert first_chunks[1]["city"].tolist() == ["Nice", "Paris", "Lyon", "Nice", "Paris"]
+
+    assert len(list(chunks)) == 4
+    assert retrieved_chunks == 6
+
+
+def test_stream_pipeline_failure():
+    pipeline = Pipeline(steps=[PIPELINE.steps[0], {"name": "trim", "columns": ["unknown"]}])
+    with pytest.raises(PipelineExecutionFailure) as excinfo:
+        list(stream_pipeline(pipeline, chunked(DOMAINS.__getitem__, 10)))
+    assert excinfo.value.index == 1
@@ -0,0 +1,181 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Barrier
+
+import pandas as pd
+import pytest
+
+from tests.utils import assert_dataframes_equals
+from weaverbird.backends.pandas_executor.pipeline_executor import PipelineExecutionFailure, execute_pipeline
+from weaverbird.backends.pandas_executor.steps.utils.combination import SubPipelinesExecutor
+from weaverbird.pipeline import Pipeline
+
+DOMAINS = {name: pd.DataFrame({"name": [name] * 2, "value": [1, 2]}) for name in ("main", "a", "b", "c")}
+
+PIPELINE = Pipeline(
+    steps=[
+        {"name": "domain", "domain": "main"},
+        {
+            "name": "append",
+            "pipelines": [
+                [{"name": "domain", "domain": "a"}, {"name": "uppercase", "column": "name"}],
+                "b",
+                [
+                    {"name": "domain", "domain": "c"},
+                    {"name": "join", "type": "left", "right_pipeline": "a", "on": [["value", "value"]]},
+                    {"name": "filter", "condition": {"column": "value", "operator": "eq", "value": 1}},
+                ],
+            ],
+        },
+        {
+            "name": "join",
+            "type": "left",
+            "right_pipeline": [{"name": "domain", "domain": "b"}, {"name": "rename", "to_rename": [["name", "b"]]}],
+            "on": [["value", "value"]],
+        },
+    ]
+)
+
+
+def _domain_retriever(name: str) -> pd.DataFrame:
+    return DOMAINS[name]
+
+
+def test_sub_pipelines_reports_are_kept():
+    _, report = execute_pipeline(PIPELINE, _domain_retriever)
+    append_report, join_report = report.steps_reports[1:]
+    # The domain "b" is not a pipeline, so it has no report
+    assert [len(r.steps_reports) for r in append_report.sub_pipelines_reports] == [2, 3]
+    assert [len(r.steps_reports) for r in join_report.sub_pipelines_reports] == [2]
+    assert report.steps_reports[0].sub_pipelines_reports == []
+
+
+@pytest.mark.parametrize("pool_class", [None, ThreadPoolExecutor])
+def test_identical_sub_pipelines_are_reported_once(pool_class):
+    sub_pipeline = [{"name": "domain", "domain": "a"}, {"name": "uppercase", "column": "name"}]
+    pipeline = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "main"},
+            {"name": "append", "pipelines": [sub_pipeline, sub_pipeline]},
+            {"name": "append", "pipelines": [sub_pipeline]},
+        ]
+    )
+    if pool_class is None:
+        result, report = execute_pipeline(pipeline, _domain_retriever)
+    else:
+        with pool_class(max_workers=2) as pool:
+            result, report = execute_pipeline(pipeline, _domain_retriever, pool=pool)
+    assert result["name"].tolist() == ["main", "main"] + ["A", "A"] * 3
+    assert [len(r.sub_pipelines_reports) for r in report.steps_reports] == [0, 1, 0]
+
+
+class _RecordingExecutor(Executor):
+    """Executes submitted calls right away, keeping track of them"""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        self.calls.append(args)
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def _counting_pipeline_executor(executions: list[Pipeline]):
+    def _execute_pipeline(pipeline, domain_retriever):
+        executions.append(pipeline)
+        return execute_pipeline(pipeline, domain_retriever)
+
+    return _execute_pipeline
+
+
+def test_sub_pipelines_results_are_only_kept_for_their_consumers():
+    shared_pipeline = [{"name": "domain", "domain": "a"}, {"name": "uppercase", "column": "name"}]
+    single_pipeline = [{"name": "domain", "domain": "b"}]
+    steps = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "main"},
+            {"name": "append", "pipelines": [shared_pipeline, single_pipeline]},
+            {"name": "append", "pipelines": [shared_pipeline]},
+        ]
+    ).steps
+    executions: list[Pipeline] = []
+    sub_pipelines_executor = SubPipelinesExecutor(_counting_pipeline_executor(executions))
+    sub_pipelines_executor.submit(steps, _domain_retriever)
+
+    shared_pipeline, single_pipeline = steps[1].pipelines
+    for pipeline in (shared_pipeline, single_pipeline, steps[2].pipelines[0]):
+        sub_pipelines_executor.resolve(pipeline, _domain_retriever)
+    # The shared sub-pipeline is executed once for its two consumers
+    assert len(executions) == 2
+    assert len(sub_pipelines_executor.pop_reports()) == 2
+
+    # Once consumed, results are not kept anymore
+    sub_pipelines_executor.resolve(shared_pipeline, _domain_retriever)
+    assert len(executions) == 3
+
+
+def test_sub_pipelines_executed_ahead_are_bounded():
+    steps = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "main"},
+            {"name": "append", "pipelines": ["a", "b"]},
+            {"name": "append", "pipelines": ["c", "a"]},
+        ]
+    ).steps
+    pool = _RecordingExecutor()
+    sub_pipelines_executor = SubPipelinesExecutor(execute_pipeline, pool=pool, max_pending=2)
+    sub_pipelines_executor.submit(steps, _domain_retriever)
+    assert pool.calls == [("a",), ("b",)]
+
+    assert_dataframes_equals(sub_pipelines_executor.resolve("a", _domain_retriever), DOMAINS["a"])
+    # "a" is still kept for its second consumer
+    assert pool.calls == [("a",), ("b",)]
+    sub_pipelines_executor.resolve("b", _domain_retriever)
+    assert pool.calls == [("a",), ("b",), ("c",)]
+    for name in ("c", "a"):
+        assert_dataframes_equals(sub_pipelines_executor.resolve(name, _domain_retriever), DOMAINS[name])
+    assert len(pool.calls) == 3
+
+
+@pytest.mark.parametrize("pool_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_sub_pipelines_in_pool_give_same_result(pool_class):
+    expected, expected_report = execute_pipeline(PIPELINE, _domain_retriever)
+    with pool_class(max_workers=2) as pool:
+        result, report = execute_pipeline(PIPELINE, _domain_retriever, pool=pool)
+    assert_dataframes_equals(result, expected)
+    assert [len(r.sub_pipelines_reports) for r in report.steps_reports] == [
+        len(r.sub_pipelines_reports) for r in expected_report.steps_reports
+    ]
+
+
+def test_sub_pipelines_run_concurrently():
+    # Both sub-pipelines must be running at the same time for the barrier to be passed
+    barrier = Barrier(2, timeout=5)
+
+    def domain_retriever(name: str) -> pd.DataFrame:
+        if name in ("a", "b"):
+            barrier.wait()
+        return DOMAINS[name]
+
+    pipeline = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "main"},
+            {"name": "append", "pipelines": [[{"name": "domain", "domain": "a"}], [{"name": "domain", "domain": "b"}]]},
+        ]
+    )
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        result, _ = execute_pipeline(pipeline, domain_retriever, pool=pool)
+    assert result["name"].tolist() == ["main", "main", "a", "a", "b", "b"]
+
+
+def test_sub_pipeline_failure_in_pool():
+    pipeline = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "main"},
+            {"name": "append", "pipelines": [[{"name": "domain", "domain": "unknown"}]]},
+        ]
+    )
+    with ThreadPoolExecutor(max_workers=2) as pool, pytest.raises(PipelineExecutionFailure) as excinfo:
+        execute_pipeline(pipeline, _domain_retriever, pool=pool)
+    assert excinfo.value.index == 1
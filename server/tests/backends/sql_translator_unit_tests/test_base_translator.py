@@ -9,7 +9,7 @@ from pypika.queries import QueryBuilder
 from pypika.terms import LiteralValue, Term, ValueWrapper
 from pytest_mock import MockFixture
 
-from weaverbird.backends.pypika_translator.translators.base import DataTypeMapping, Order, SQLTranslator
+from weaverbird.backends.pypika_translator.translators.base import CTEsBuilder, DataTypeMapping, Order, SQLTranslator
 from weaverbird.backends.pypika_translator.translators.exceptions import (
     ForbiddenSQLStep,
     UnknownTableColumns,
@@ -108,6 +108,21 @@ def test_get_query_builder_raises_translation_step_error(base_translator: BaseTr
     assert isinstance(exc_info.value.original_exception, ValueError)
 
 
+def test_translation_failure_index_with_pushed_down_filter(base_translator: BaseTranslator, mocker: MockFixture):
+    mocker.patch.object(base_translator, "text", side_effect=ValueError("something went wrong"))
+    pipeline_steps = [
+        DomainStep(domain="users"),
+        RenameStep(to_rename=[("age", "old")]),
+        steps.TextStep(new_column="greeting", text="hello"),
+        steps.FilterStep(condition={"column": "old", "operator": "gt", "value": 18}),
+    ]
+    # The filter is merged with the domain step, the failing step keeps its index in the pipeline
+    with pytest.raises(PipelineFailure) as exc_info:
+        base_translator.get_query_str(steps=pipeline_steps)
+    assert exc_info.value.details["index"] == 2
+    assert exc_info.value.details["step_config"] == {"name": "text", "new_column": "greeting", "text": "hello"}
+
+
 def test_get_query_builder_with_custom_query(base_translator: BaseTranslator):
     pipeline_steps = [steps.CustomSqlStep(query="SELECT 1")]
 
@@ -120,6 +135,42 @@ def test_get_query_builder_with_custom_query(base_translator: BaseTranslator):
     )
 
 
+def test_get_query_builder_with_query_builder(base_translator: BaseTranslator):
+    query_builder = Query.with_(Query.from_("projects").select("id"), "projects_ids")
+    pipeline_steps = [DomainStep(domain="users"), steps.RenameStep(toRename=[("age", "old")])]
+
+    qb_context = base_translator.get_query_builder(steps=pipeline_steps, query_builder=query_builder)
+    sql = qb_context.materialize().get_sql()
+    assert sql.startswith('WITH projects_ids AS (SELECT "id" FROM "projects") ,__step_1_basetranslator__ AS')
+    # The given builder is left untouched, and the context can be materialized several times
+    assert query_builder.from_("projects_ids").select("id").get_sql() == (
+        'WITH projects_ids AS (SELECT "id" FROM "projects") SELECT "id" FROM "projects_ids"'
+    )
+    assert qb_context.materialize(limit=1).get_sql() == f"{sql} LIMIT 1"
+    assert qb_context.materialize().get_sql() == sql
+
+
+def test_ctes_builder():
+    ctes_builder = CTEsBuilder(query_class=Query)
+    first = Query.from_("a").select("x")
+    builder = ctes_builder.with_(None, first, "step_0")
+    # A query derived from the builder is a copy, which is not affected by the following CTEs
+    derived = builder.from_("step_0").select("x")
+    # CTEs are added in place to the builder created by the CTEs builder
+    assert ctes_builder.with_(builder, Query.from_("step_0").select("x"), "step_1") is builder
+    assert builder.immutable
+    assert derived.get_sql() == 'WITH step_0 AS (SELECT "x" FROM "a") SELECT "x" FROM "step_0"'
+    assert builder.from_("step_1").select("x").get_sql() == (
+        'WITH step_0 AS (SELECT "x" FROM "a") ,step_1 AS (SELECT "x" FROM "step_0") SELECT "x" FROM "step_1"'
+    )
+    # Other builders are copied
+    other_builder = Query.with_(first, "other")
+    assert ctes_builder.with_(other_builder, first, "step_2") is not other_builder
+    assert other_builder.from_("other").select("x").get_sql() == (
+        'WITH other AS (SELECT "x" FROM "a") SELECT "x" FROM "other"'
+    )
+
+
 def test_get_query_builder_more_than_one_step(base_translator: BaseTranslator):
     to_rename = "age"
     rename_as = "old"
@@ -131,10 +182,8 @@ def test_get_query_builder_more_than_one_step(base_translator: BaseTranslator):
     schema = Schema(DB_SCHEMA)
 
     step_0_query = Query.from_(schema.users).select(*ALL_TABLES["users"])
-    expected = Query.with_(step_0_query, "__step_0_basetranslator__").from_(schema.users).select("*")
-
-    columns = (Field(col) if col is not to_rename else Field(col).as_(rename_as) for col in ALL_TABLES["users"])
-    expected_cols = (col if col != to_rename else rename_as for col in ALL_TABLES["users"])
+    columns = [Field(col) if col is not to_rename else Field(col).as_(rename_as) for col in ALL_TABLES["users"]]
+    expected_cols = [col if col != to_rename else rename_as for col in ALL_TABLES["users"]]
     step_1_query = Query.from_(AliasedQuery('"__step_0_basetranslator__"')).select(*columns)
 
     expected = (
@@ -144,6 +193,16 @@ def test_get_query_builder_more_than_one_step(base_translator: BaseTranslator):
         .select(*expected_cols)
     )
 
+    # Both steps are row-wise: their queries are fused into a single CTE
+    fused_expected = (
+        Query.with_(Query.from_(schema.users).select(*columns), "__step_1_basetranslator__")
+        .from_("__step_1_basetranslator__")
+        .select(*expected_cols)
+    )
+    qb_context = base_translator.get_query_builder(steps=pipeline_steps)
+    assert qb_context.materialize().get_sql() == fused_expected.get_sql()
+
+    base_translator.FUSABLE_STEPS = frozenset()
     qb_context = base_translator.get_query_builder(steps=pipeline_steps)
     assert qb_context.materialize().get_sql() == expected.get_sql()
 
@@ -934,8 +993,7 @@ def test_unpivot_step_is_always_wrapped(base_translator: BaseTranslator, unwrap:
     assert (
         base_translator.get_query_str(steps=steps, offset=5, limit=10)
         == """WITH __step_0_basetranslator__ AS (SELECT * FROM foo\n) ,"""
-        """__step_0_basetranslator1__ AS (SELECT "bar","baz" FROM "__step_0_basetranslator__") ,"""
-        """__step_1_basetranslator1__ AS (SELECT "bar",CAST("baz" AS FLOAT) "baz" FROM "__step_0_basetranslator1__") ,"""  # noqa: E501
+        """__step_1_basetranslator1__ AS (SELECT "bar",CAST("baz" AS FLOAT) "baz" FROM "__step_0_basetranslator__") ,"""  # noqa: E501
         """__step_1_basetranslator__ AS (SELECT "bar","variable","value" FROM "__step_1_basetranslator1__"  t1 CROSS JOIN UNNEST(ARRAY['baz'], ARRAY["baz"]) t2 ("variable", "value")) """  # noqa: E501
         """SELECT "bar","variable","value" FROM "__step_1_basetranslator__" ORDER BY "bar","variable","value" LIMIT 10 OFFSET 5"""  # noqa: E501
     )
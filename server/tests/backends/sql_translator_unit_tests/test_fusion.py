@@ -0,0 +1,98 @@
+# ruff:noqa: E501
+from pypika import Query
+from pypika.terms import LiteralValue
+
+from weaverbird.backends.pypika_translator.translators.base import SQLTranslator
+from weaverbird.backends.pypika_translator.utils.fusion import fuse_queries
+from weaverbird.pipeline.pipeline import Pipeline
+
+_DOMAIN_STEP = {"name": "domain", "domain": "beers_tiny"}
+
+
+def _query_str(translator: SQLTranslator, steps: list[dict]) -> str:
+    return translator.get_query_str(steps=Pipeline(steps=steps).steps)
+
+
+def test_row_wise_steps_are_fused(translator: SQLTranslator) -> None:
+    steps = [
+        _DOMAIN_STEP,
+        {"name": "rename", "to_rename": [["name", "beer"]]},
+        {"name": "formula", "new_column": "price", "formula": "price_per_l * volume_ml"},
+        {"name": "filter", "condition": {"column": "price", "operator": "gt", "value": 10}},
+        {"name": "select", "columns": ["beer", "price"]},
+    ]
+    assert _query_str(translator, steps) == (
+        'WITH __step_3_dummy__ AS (SELECT "price_per_l","name" "beer","volume_ml","price_per_l"*"volume_ml" "price" '
+        'FROM "beers_tiny" WHERE "price_per_l"*"volume_ml">10) '
+        'SELECT "beer","price" FROM "__step_3_dummy__"'
+    )
+
+
+def test_fusion_can_be_disabled(translator: SQLTranslator) -> None:
+    steps = [_DOMAIN_STEP, {"name": "rename", "to_rename": [["name", "beer"]]}, {"name": "select", "columns": ["beer"]}]
+    translator.FUSABLE_STEPS = frozenset()
+    assert _query_str(translator, steps) == (
+        'WITH __step_0_dummy__ AS (SELECT "name" FROM "beers_tiny") ,'
+        '__step_1_dummy__ AS (SELECT "name" "beer" FROM "__step_0_dummy__") '
+        'SELECT "beer" FROM "__step_1_dummy__"'
+    )
+
+
+def test_filters_are_not_fused(translator: SQLTranslator) -> None:
+    steps = [
+        _DOMAIN_STEP,
+        {"name": "filter", "condition": {"column": "cost", "operator": "gt", "value": 10}},
+        {"name": "filter", "condition": {"column": "price_per_l", "operator": "gt", "value": 1}},
+        {"name": "select", "columns": ["name"]},
+    ]
+    assert _query_str(translator, steps) == (
+        'WITH __step_0_dummy__ AS (SELECT "price_per_l","name","cost" FROM "beers_tiny" WHERE "cost">10) ,'
+        '__step_1_dummy__ AS (SELECT "price_per_l","name","cost" FROM "__step_0_dummy__" WHERE "price_per_l">1) '
+        'SELECT "name" FROM "__step_1_dummy__"'
+    )
+
+
+def test_expressions_are_not_copied_several_times(translator: SQLTranslator) -> None:
+    steps = [
+        _DOMAIN_STEP,
+        {"name": "formula", "new_column": "x", "formula": "cost + 1"},
+        {"name": "formula", "new_column": "y", "formula": "x * x"},
+        {"name": "select", "columns": ["y"]},
+    ]
+    assert _query_str(translator, steps) == (
+        'WITH __step_1_dummy__ AS (SELECT "cost","cost"+1 "x" FROM "beers_tiny") ,'
+        '__step_2_dummy__ AS (SELECT "cost","x","x"*"x" "y" FROM "__step_1_dummy__") '
+        'SELECT "y" FROM "__step_2_dummy__"'
+    )
+
+
+def test_steps_following_a_non_row_wise_step_are_not_fused(translator: SQLTranslator) -> None:
+    steps = [
+        _DOMAIN_STEP,
+        {
+            "name": "aggregate",
+            "on": ["beer_kind"],
+            "aggregations": [{"aggfunction": "sum", "columns": ["cost"], "new_columns": ["cost"]}],
+        },
+        {"name": "rename", "to_rename": [["cost", "total"]]},
+        {"name": "select", "columns": ["total"]},
+    ]
+    assert _query_str(translator, steps) == (
+        'WITH __step_0_dummy__ AS (SELECT "cost","beer_kind" FROM "beers_tiny") ,'
+        '__step_1_dummy__ AS (SELECT "beer_kind",SUM("cost") "cost" FROM "__step_0_dummy__" GROUP BY "beer_kind" ORDER BY "beer_kind" ASC NULLS LAST) ,'
+        '__step_2_dummy__ AS (SELECT "beer_kind","cost" "total" FROM "__step_1_dummy__") '
+        'SELECT "total" FROM "__step_2_dummy__"'
+    )
+
+
+def test_fuse_queries() -> None:
+    previous_query = Query.from_("beers").select("name", LiteralValue("1").as_("one"))
+    query = Query.from_("step_0").select("name")
+    # Raw SQL can not be moved to another query
+    assert fuse_queries(previous_query=previous_query, previous_table="step_0", query=query, query_class=Query) is None
+
+    previous_query = Query.from_("beers").select("name", "cost")
+    fused = fuse_queries(previous_query=previous_query, previous_table="step_0", query=query, query_class=Query)
+    assert fused is not None and fused.get_sql() == 'SELECT "name" FROM "beers"'
+    # The query must select from the previous table
+    assert fuse_queries(previous_query=previous_query, previous_table="other", query=query, query_class=Query) is None
@@ -0,0 +1,73 @@
+# ruff:noqa: E501
+import pytest
+
+from weaverbird.backends.pypika_translator.translators.base import SQLTranslator
+from weaverbird.pipeline.pipeline import Pipeline
+
+_DOMAIN_STEP = {"name": "domain", "domain": "beers_tiny"}
+_ALL_COLUMNS = '"price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name"'
+
+
+def _query_str(translator: SQLTranslator, steps: list[dict]) -> str:
+    return translator.get_query_str(steps=Pipeline(steps=steps).steps)
+
+
+def test_only_read_columns_are_selected(translator: SQLTranslator) -> None:
+    steps = [
+        _DOMAIN_STEP,
+        {"name": "rename", "to_rename": [["cost", "price"]]},
+        {"name": "sort", "columns": [{"column": "volume_ml", "order": "asc"}]},
+        {"name": "select", "columns": ["name", "price"]},
+    ]
+    assert _query_str(translator, steps) == (
+        'WITH __step_1_dummy__ AS (SELECT "name","cost" "price","volume_ml" FROM "beers_tiny") ,'
+        '__step_2_dummy__ AS (SELECT "name","price","volume_ml" FROM "__step_1_dummy__" ORDER BY "volume_ml" ASC) '
+        'SELECT "name","price" FROM "__step_2_dummy__"'
+    )
+
+
+@pytest.mark.parametrize(
+    "step",
+    [
+        # The columns read by the conditions of an ifthenelse step are unknown
+        {
+            "name": "ifthenelse",
+            "new_column": "x",
+            "if": {"column": "cost", "operator": "gt", "value": 0},
+            "then": "1",
+            "else": "0",
+        },
+        # No column of the domain is read
+        {"name": "text", "new_column": "x", "text": "a"},
+    ],
+)
+def test_all_columns_are_selected(translator: SQLTranslator, step: dict) -> None:
+    query = _query_str(translator, [_DOMAIN_STEP, step, {"name": "select", "columns": ["x"]}])
+    assert query.startswith(f"WITH __step_1_dummy__ AS (SELECT {_ALL_COLUMNS},")
+
+
+def test_appended_pipelines_are_pruned(translator: SQLTranslator) -> None:
+    steps = [_DOMAIN_STEP, {"name": "append", "pipelines": [[_DOMAIN_STEP]]}, {"name": "select", "columns": ["name"]}]
+    assert _query_str(translator, steps) == (
+        'WITH __step_0_dummy__ AS (SELECT "name" FROM "beers_tiny") ,'
+        '__step_0_dummy1__ AS (SELECT "name" FROM "beers_tiny") ,'
+        '__step_1_dummy__ AS ((SELECT "name" FROM "__step_0_dummy__") UNION ALL (SELECT "name" FROM "__step_0_dummy1__") ORDER BY "name") '
+        'SELECT "name" FROM "__step_1_dummy__"'
+    )
+
+
+def test_joined_pipelines_are_pruned(translator: SQLTranslator) -> None:
+    steps = [
+        _DOMAIN_STEP,
+        {"name": "join", "type": "left", "right_pipeline": [_DOMAIN_STEP], "on": [["beer_kind", "beer_kind"]]},
+        {"name": "select", "columns": ["price_per_l", "cost_right"]},
+    ]
+    # "cost" is kept on the left, so that the right one is still suffixed
+    assert _query_str(translator, steps) == (
+        'WITH __step_0_dummy__ AS (SELECT "price_per_l","cost","beer_kind" FROM "beers_tiny") ,'
+        '__step_0_dummy1__ AS (SELECT "price_per_l","cost","beer_kind" FROM "beers_tiny") ,'
+        '__step_1_dummy__ AS (SELECT "__step_0_dummy__"."price_per_l","__step_0_dummy__"."cost","__step_0_dummy__"."beer_kind",'
+        '"__step_0_dummy1__"."price_per_l" "price_per_l_right","__step_0_dummy1__"."cost" "cost_right","__step_0_dummy1__"."beer_kind" "beer_kind_right" '
+        'FROM "__step_0_dummy__" LEFT JOIN "__step_0_dummy1__" ON "__step_0_dummy__"."beer_kind"="__step_0_dummy1__"."beer_kind" ORDER BY "__step_0_dummy__"."beer_kind") '
+        'SELECT "price_per_l","cost_right" FROM "__step_1_dummy__"'
+    )
@@ -0,0 +1,145 @@
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from weaverbird.backends.pypika_translator.translators.base import SQLTranslator
+from weaverbird.backends.pypika_translator.translators.postgresql import PostgreSQLTranslator
+from weaverbird.pipeline.pipeline import Pipeline
+
+_DOMAIN_STEP = {"name": "domain", "domain": "beers_tiny"}
+
+
+def _where_clause(translator: SQLTranslator, steps: list[dict]) -> str:
+    query = translator.get_query_str(steps=Pipeline(steps=steps).steps)
+    return query[query.index(" WHERE ") + len(" WHERE ") :]
+
+
+def _filter_where_clause(translator: SQLTranslator, column_type: str | None, condition: dict) -> str:
+    if column_type is not None:
+        translator._tables_columns_types = {"beers_tiny": {"brewing_date": column_type}}
+    return _where_clause(translator, [_DOMAIN_STEP, {"name": "filter", "condition": condition}])
+
+
+@pytest.mark.parametrize(
+    "condition,column_type,expected",
+    [
+        # Without types, the column is cast
+        (
+            {"column": "brewing_date", "operator": "ge", "value": datetime(2022, 1, 1, 12)},
+            None,
+            "CAST(\"brewing_date\" AS TIMESTAMP)>=CAST('2022-01-01T12:00:00' AS TIMESTAMP)",
+        ),
+        (
+            {"column": "brewing_date", "operator": "ge", "value": datetime(2022, 1, 1, 12)},
+            "timestamp",
+            "\"brewing_date\">=CAST('2022-01-01T12:00:00' AS TIMESTAMP)",
+        ),
+        # Datetimes are not timestamps in this dialect
+        (
+            {"column": "brewing_date", "operator": "ne", "value": datetime(2022, 1, 1, 12)},
+            "datetime",
+            "CAST(\"brewing_date\" AS TIMESTAMP)<>CAST('2022-01-01T12:00:00' AS TIMESTAMP)",
+        ),
+        # Date columns are compared to the day of the value, rounded depending on the operator
+        (
+            {"column": "brewing_date", "operator": "ge", "value": datetime(2022, 1, 1)},
+            "date",
+            "\"brewing_date\">=CAST('2022-01-01' AS DATE)",
+        ),
+        (
+            {"column": "brewing_date", "operator": "ge", "value": datetime(2022, 1, 1, 12)},
+            "date",
+            "\"brewing_date\">CAST('2022-01-01' AS DATE)",
+        ),
+        (
+            {"column": "brewing_date", "operator": "lt", "value": datetime(2022, 1, 1, 12)},
+            "date",
+            "\"brewing_date\"<=CAST('2022-01-01' AS DATE)",
+        ),
+        (
+            {"column": "brewing_date", "operator": "eq", "value": datetime(2022, 1, 1)},
+            "date",
+            "\"brewing_date\"=CAST('2022-01-01' AS DATE)",
+        ),
+        # No day equals a value within a day, and the offset of aware values is handled by the cast
+        (
+            {"column": "brewing_date", "operator": "eq", "value": datetime(2022, 1, 1, 12)},
+            "date",
+            "CAST(\"brewing_date\" AS TIMESTAMP)=CAST('2022-01-01T12:00:00' AS TIMESTAMP)",
+        ),
+        (
+            {"column": "brewing_date", "operator": "gt", "value": datetime(2022, 1, 1, tzinfo=UTC)},
+            "date",
+            "CAST(\"brewing_date\" AS TIMESTAMP)>CAST('2022-01-01T00:00:00+00:00' AS TIMESTAMP)",
+        ),
+        (
+            {"column": "brewing_date", "operator": "in", "value": [datetime(2022, 1, 1), None]},
+            "date",
+            '"brewing_date" IS NULL OR "brewing_date" IN (CAST(\'2022-01-01\' AS DATE))',
+        ),
+        (
+            {"column": "brewing_date", "operator": "nin", "value": [datetime(2022, 1, 1)]},
+            "timestamp",
+            '"brewing_date" IS NOT NULL AND "brewing_date" NOT IN (CAST(\'2022-01-01T00:00:00\' AS TIMESTAMP))',
+        ),
+        (
+            {"column": "brewing_date", "operator": "in", "value": [datetime(2022, 1, 1, 12)]},
+            "date",
+            "CAST(\"brewing_date\" AS TIMESTAMP) IN (CAST('2022-01-01T12:00:00' AS TIMESTAMP))",
+        ),
+        # Date bounds become ranges on the column
+        (
+            {"column": "brewing_date", "operator": "from", "value": datetime(2022, 1, 1, 12)},
+            "timestamp",
+            "\"brewing_date\">=CAST('2022-01-01 12:00:00' AS TIMESTAMP)",
+        ),
+        (
+            {"column": "brewing_date", "operator": "from", "value": datetime(2022, 1, 1, 12)},
+            "date",
+            "\"brewing_date\">CAST('2022-01-01' AS DATE)",
+        ),
+        (
+            {
+                "column": "brewing_date",
+                "operator": "until",
+                "value": datetime(2022, 1, 1, tzinfo=timezone(timedelta(hours=2))),
+            },
+            "date",
+            "\"brewing_date\"<=CAST('2021-12-31' AS DATE)",
+        ),
+        (
+            {"column": "brewing_date", "operator": "until", "value": datetime(2022, 1, 1)},
+            "text",
+            "CAST(\"brewing_date\" AS TIMESTAMP)<=CAST('2022-01-01 00:00:00' AS TIMESTAMP)",
+        ),
+    ],
+)
+def test_date_filters_on_typed_columns(
+    translator: SQLTranslator, condition: dict, column_type: str | None, expected: str
+) -> None:
+    assert _filter_where_clause(translator, column_type, condition) == expected
+
+
+def test_only_filters_merged_with_the_domain_step_use_types(translator: SQLTranslator) -> None:
+    translator._tables_columns_types = {"beers_tiny": {"brewing_date": "timestamp"}}
+    condition = {"column": "brewing_date", "operator": "ge", "value": datetime(2022, 1, 1)}
+    steps = [
+        _DOMAIN_STEP,
+        {"name": "sort", "columns": [{"column": "name", "order": "asc"}]},
+        {"name": "filter", "condition": condition},
+    ]
+    # The column may have been computed by a previous step
+    assert _where_clause(translator, steps) == (
+        "CAST(\"brewing_date\" AS TIMESTAMP)>=CAST('2022-01-01T00:00:00' AS TIMESTAMP)"
+    )
+
+
+def test_datetime_columns_are_not_cast_when_they_are_timestamps() -> None:
+    translator = PostgreSQLTranslator(
+        tables_columns={"beers_tiny": ["brewing_date"]},
+        tables_columns_types={"beers_tiny": {"brewing_date": "datetime"}},
+    )
+    condition = {"column": "brewing_date", "operator": "from", "value": datetime(2022, 1, 1)}
+    assert _filter_where_clause(translator, None, condition) == (
+        "\"brewing_date\">=CAST('2022-01-01 00:00:00' AS TIMESTAMP)"
+    )
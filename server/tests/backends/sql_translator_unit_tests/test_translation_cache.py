@@ -0,0 +1,95 @@
+import pytest
+from pytest_mock import MockFixture
+
+from weaverbird.backends.pypika_translator.cache import TranslationCache
+from weaverbird.backends.pypika_translator.dialects import SQLDialect
+from weaverbird.backends.pypika_translator.translate import translate_pipeline
+from weaverbird.backends.pypika_translator.translators.base import SQLTranslator
+from weaverbird.exceptions import PipelineFailure
+from weaverbird.pipeline.pipeline import Pipeline
+
+_TABLES_COLUMNS = {"my_table": ["a", "b", "c"], "other_table": ["a", "d"]}
+
+PIPELINE = Pipeline(
+    steps=[
+        {"name": "domain", "domain": "my_table"},
+        {
+            "name": "filter",
+            "condition": {
+                "and": [
+                    {"column": "a", "operator": "gt", "value": 1},
+                    {"column": "b", "operator": "in", "value": ["x", "y"]},
+                ]
+            },
+        },
+        {
+            "name": "join",
+            "type": "left",
+            "right_pipeline": [{"name": "domain", "domain": "other_table"}],
+            "on": [["a", "a"]],
+        },
+        {"name": "sort", "columns": [{"column": "a", "order": "asc"}]},
+    ]
+)
+
+
+@pytest.fixture
+def cache() -> TranslationCache:
+    return TranslationCache(max_entries=2)
+
+
+def _translate(pipeline: Pipeline = PIPELINE, **kwargs) -> str:
+    return translate_pipeline(
+        **{"sql_dialect": SQLDialect.POSTGRES, "pipeline": pipeline, "tables_columns": _TABLES_COLUMNS, **kwargs}
+    )
+
+
+def test_pages_share_a_translation(cache: TranslationCache, mocker: MockFixture):
+    get_query_builder = mocker.spy(SQLTranslator, "get_query_builder")
+    for offset, limit in [(None, None), (0, 50), (50, 50), (0, 50)]:
+        assert _translate(offset=offset, limit=limit, cache=cache) == _translate(offset=offset, limit=limit)
+    # Once for each uncached translation, once for the cached ones (the join step translates its right pipeline too)
+    assert get_query_builder.call_count == 2 * 4 + 2
+    assert (cache.hits, cache.builder_hits, cache.misses) == (1, 2, 1)
+    assert len(cache) == 2
+
+
+def test_translation_key(cache: TranslationCache):
+    _translate(cache=cache)
+    # Equivalent pipelines share their translation, as well as tables given in another order
+    equivalent_pipeline = Pipeline(
+        steps=[PIPELINE.steps[0], PIPELINE.steps[1].model_copy(deep=True), *PIPELINE.steps[2:]]
+    )
+    equivalent_pipeline.steps[1].condition.and_.reverse()
+    _translate(equivalent_pipeline, tables_columns=dict(reversed(_TABLES_COLUMNS.items())), cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # The dialect, the order of the columns, the schema, the source rows subset and the types of the columns are part
+    # of the key
+    _translate(sql_dialect=SQLDialect.SNOWFLAKE, cache=cache)
+    _translate(tables_columns={**_TABLES_COLUMNS, "my_table": ["c", "b", "a"]}, cache=cache)
+    _translate(db_schema="schema", cache=cache)
+    _translate(source_rows_subset=10, cache=cache)
+    _translate(tables_columns_types={"my_table": {"a": "date"}}, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 6)
+
+
+def test_least_recently_used_translations_are_evicted(cache: TranslationCache):
+    first, second, third = (Pipeline(steps=PIPELINE.steps[:length]) for length in (2, 3, 4))
+    for pipeline in (first, second, first, third):
+        _translate(pipeline, cache=cache)
+    assert len(cache) == 2
+    _translate(first, cache=cache)
+    _translate(second, cache=cache)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_failures_are_not_cached(cache: TranslationCache):
+    pipeline = Pipeline(steps=[{"name": "domain", "domain": "unknown_table"}])
+    for _ in range(2):
+        with pytest.raises(PipelineFailure):
+            _translate(pipeline, cache=cache)
+    assert (cache.hits, cache.builder_hits, cache.misses) == (0, 0, 2)
@@ -128,30 +128,14 @@ def test_nested_combinations_append_at_root(translator: SQLTranslator) -> None:
     )
 
     assert translator.get_query_str(steps=pipeline.steps) == (
-        # Root domain step
-        """WITH __step_0_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny") ,"""
-        # Root text step
-        """__step_1_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name",CAST('root' AS TEXT) "root" FROM "__step_0_dummy__") ,"""
-        # Root pipeline select step
-        """__step_2_dummy__ AS (SELECT "root" FROM "__step_1_dummy__") ,"""
-        # First pipeline domain step
-        """__step_0_dummy1__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny") ,"""
-        # First pipeline text step
-        """__step_1_dummy1__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name",CAST('pipe1' AS TEXT) "col1" FROM "__step_0_dummy1__") ,"""
-        # First pipeline select step
-        """__step_2_dummy1__ AS (SELECT "col1" FROM "__step_1_dummy1__") ,"""
-        # Second pipeline domain step
-        """__step_0_dummy2__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny") ,"""
-        # Second pipeline text step
-        """__step_1_dummy2__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name",CAST('pipe2' AS TEXT) "col2" FROM "__step_0_dummy2__") ,"""
-        # Second pipeline select step
-        """__step_2_dummy2__ AS (SELECT "col2" FROM "__step_1_dummy2__") ,"""
-        # Third pipeline domain step
-        """__step_0_dummy3__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny") ,"""
-        # Third pipeline text step
-        """__step_1_dummy3__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name",CAST('pipe3' AS TEXT) "col3" FROM "__step_0_dummy3__") ,"""
-        # Third pipeline select step
-        """__step_2_dummy3__ AS (SELECT "col3" FROM "__step_1_dummy3__") ,"""
+        # Root domain, text and select steps, fused into a single CTE
+        """WITH __step_2_dummy__ AS (SELECT CAST('root' AS TEXT) "root" FROM "beers_tiny") ,"""
+        # First pipeline domain, text and select steps, fused into a single CTE
+        """__step_2_dummy1__ AS (SELECT CAST('pipe1' AS TEXT) "col1" FROM "beers_tiny") ,"""
+        # Second pipeline domain, text and select steps, fused into a single CTE
+        """__step_2_dummy2__ AS (SELECT CAST('pipe2' AS TEXT) "col2" FROM "beers_tiny") ,"""
+        # Third pipeline domain, text and select steps, fused into a single CTE
+        """__step_2_dummy3__ AS (SELECT CAST('pipe3' AS TEXT) "col3" FROM "beers_tiny") ,"""
         # Second pipeline join   step
         """__step_3_dummy2__ AS (SELECT "__step_2_dummy2__"."col2","__step_2_dummy3__"."col3" FROM "__step_2_dummy2__" LEFT JOIN "__step_2_dummy3__" ON "__step_2_dummy2__"."name"="__step_2_dummy3__"."name" AND "__step_2_dummy2__"."beer_kind"="__step_2_dummy3__"."beer_kind" ORDER BY "__step_2_dummy2__"."name","__step_2_dummy2__"."beer_kind") ,"""
         ## Start of append step
@@ -202,27 +186,15 @@ def test_nested_combinations_join_at_root(translator: SQLTranslator) -> None:
         ]
     )
     assert translator.get_query_str(steps=pipeline.steps) == (
-        # Root domain step
-        """WITH __step_0_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny") ,"""
-        # Root text step
-        """__step_1_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name",CAST('root' AS TEXT) "root" FROM "__step_0_dummy__") ,"""
-        # Root select step
-        """__step_2_dummy__ AS (SELECT "root" FROM "__step_1_dummy__") ,"""
-        # Join step pipeline domain step
-        """__step_0_dummy1__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny") ,"""
-        # Join step pipeline text step
-        """__step_1_dummy1__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name",CAST('pipe1' AS TEXT) "col1" FROM "__step_0_dummy1__") ,"""
-        # Join step pipeline select step
-        """__step_2_dummy1__ AS (SELECT "col1" FROM "__step_1_dummy1__") ,"""
+        # Root domain, text and select steps, fused into a single CTE
+        """WITH __step_2_dummy__ AS (SELECT CAST('root' AS TEXT) "root" FROM "beers_tiny") ,"""
+        # Join step pipeline domain, text and select steps, fused into a single CTE
+        """__step_2_dummy1__ AS (SELECT CAST('pipe1' AS TEXT) "col1" FROM "beers_tiny") ,"""
         ## start of join step pipeline append step
         # first append pipeline
-        """__step_0_dummy2__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny") ,"""
-        """__step_1_dummy2__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name",CAST('pipe2' AS TEXT) "col2" FROM "__step_0_dummy2__") ,"""
-        """__step_2_dummy2__ AS (SELECT "col2" FROM "__step_1_dummy2__") ,"""
+        """__step_2_dummy2__ AS (SELECT CAST('pipe2' AS TEXT) "col2" FROM "beers_tiny") ,"""
         # second append pipeline
-        """__step_0_dummy3__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny") ,"""
-        """__step_1_dummy3__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name",CAST('pipe3' AS TEXT) "col3" FROM "__step_0_dummy3__") ,"""
-        """__step_2_dummy3__ AS (SELECT "col3" FROM "__step_1_dummy3__") ,"""
+        """__step_2_dummy3__ AS (SELECT CAST('pipe3' AS TEXT) "col3" FROM "beers_tiny") ,"""
         # union all step
         """__step_3_dummy1__ AS ((SELECT "col1",NULL "col2",NULL "col3" FROM "__step_2_dummy1__") UNION ALL (SELECT NULL "col1","col2",NULL "col3" FROM "__step_2_dummy2__") UNION ALL (SELECT NULL "col1",NULL "col2","col3" FROM "__step_2_dummy3__") ORDER BY "col1","col2","col3") ,"""
         ## end of join step pipeline append step
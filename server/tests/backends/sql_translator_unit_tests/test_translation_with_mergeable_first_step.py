@@ -45,6 +45,26 @@ _CASES = [
         {"name": "domain", "domain": "beers_tiny"},
         {"name": "top", "limit": 5, "rank_on": "alcohol_degree", "sort": "desc"},
     ],
+    # The filter should be pushed down and merged with the domain step, reading the column before it is renamed. Only
+    # the selected columns should be read from the table
+    [
+        {"name": "domain", "domain": "beers_tiny"},
+        {"name": "rename", "to_rename": [["volume_ml", "volume"]]},
+        {"name": "select", "columns": ["name", "volume"]},
+        {"name": "filter", "condition": {"column": "volume", "operator": "le", "value": 10}},
+    ],
+    # The filter reads the column written by the formula, it can not be pushed down
+    [
+        {"name": "domain", "domain": "beers_tiny"},
+        {"name": "formula", "new_column": "volume_ml", "formula": "volume_ml / 10"},
+        {"name": "filter", "condition": {"column": "volume_ml", "operator": "le", "value": 10}},
+    ],
+    # Pushing the filter down would make the lowercase step the last one, selecting the columns in another order
+    [
+        {"name": "domain", "domain": "beers_tiny"},
+        {"name": "lowercase", "column": "name"},
+        {"name": "filter", "condition": {"column": "volume_ml", "operator": "le", "value": 10}},
+    ],
 ]
 
 _EXPECTED_NO_SOURCE_ROW_SUBSET = [
@@ -55,6 +75,9 @@ _EXPECTED_NO_SOURCE_ROW_SUBSET = [
     'WITH __step_0_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny" WHERE "volume_ml"<=10) SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "__step_0_dummy__" WHERE "nullable_name" IS NOT NULL',
     'WITH __step_0_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny" ORDER BY "alcohol_degree" ASC LIMIT 50) SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "__step_0_dummy__" WHERE "nullable_name" IS NOT NULL',
     'SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny" ORDER BY "alcohol_degree" DESC LIMIT 5',
+    'WITH __step_1_dummy__ AS (SELECT "name","volume_ml" "volume" FROM "beers_tiny" WHERE "volume_ml"<=10) SELECT "name","volume" FROM "__step_1_dummy__"',
+    'WITH __step_1_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name","volume_ml"/NULLIF(10,0) "volume_ml" FROM "beers_tiny") SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name","volume_ml" FROM "__step_1_dummy__" WHERE "volume_ml"<=10',
+    'WITH __step_1_dummy__ AS (SELECT "price_per_l","alcohol_degree","cost","beer_kind","volume_ml","brewing_date","nullable_name",LOWER("name") "name" FROM "beers_tiny") SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "__step_1_dummy__" WHERE "volume_ml"<=10',
 ]
 
 
@@ -73,6 +96,9 @@ _EXPECTED_WITH_SOURCE_ROW_SUBSET = [
     'WITH __step_0_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny" WHERE "volume_ml"<=10 LIMIT 42) SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "__step_0_dummy__" WHERE "nullable_name" IS NOT NULL',
     'WITH __step_0_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny" ORDER BY "alcohol_degree" ASC LIMIT 42) SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "__step_0_dummy__" WHERE "nullable_name" IS NOT NULL',
     'SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny" ORDER BY "alcohol_degree" DESC LIMIT 5',
+    'WITH __step_0_dummy__ AS (SELECT "name","volume_ml" FROM "beers_tiny" WHERE "volume_ml"<=10 LIMIT 42) ,__step_1_dummy__ AS (SELECT "name","volume_ml" "volume" FROM "__step_0_dummy__") SELECT "name","volume" FROM "__step_1_dummy__"',
+    'WITH __step_0_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny" LIMIT 42) ,__step_1_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name","volume_ml"/NULLIF(10,0) "volume_ml" FROM "__step_0_dummy__") SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name","volume_ml" FROM "__step_1_dummy__" WHERE "volume_ml"<=10',
+    'WITH __step_0_dummy__ AS (SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "beers_tiny" LIMIT 42) ,__step_1_dummy__ AS (SELECT "price_per_l","alcohol_degree","cost","beer_kind","volume_ml","brewing_date","nullable_name",LOWER("name") "name" FROM "__step_0_dummy__") SELECT "price_per_l","alcohol_degree","name","cost","beer_kind","volume_ml","brewing_date","nullable_name" FROM "__step_1_dummy__" WHERE "volume_ml"<=10',
 ]
 
 
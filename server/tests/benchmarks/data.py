@@ -0,0 +1,91 @@
+"""
+Deterministic synthetic data for benchmarks.
+
+The same `DataSpec` always produces the same DataFrame, so that benchmark reports of different versions can be
+compared.
+"""
+
+from dataclasses import dataclass
+from functools import cache
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+from geopandas import GeoDataFrame, points_from_xy
+
+START_DATE = pd.Timestamp("2020-01-01")
+# Dates are spread over two years
+DATES_COUNT = 731
+
+
+@dataclass(frozen=True, kw_only=True)
+class DataSpec:
+    rows: int
+    # Number of distinct values of the `category` column. `group` has ten times fewer distinct values
+    cardinality: int = 100
+    # Ratio of missing values in the `label` and `value` columns
+    null_ratio: float = 0.0
+    # dtype of the text columns
+    text_dtype: Literal["object", "string"] = "object"
+    # Adds a `geometry` column of points, making the DataFrame a GeoDataFrame
+    geometry: bool = False
+    seed: int = 0
+
+
+def _texts(template: str, count: int, codes: np.ndarray) -> np.ndarray:
+    return np.array([template.format(i) for i in range(count)], dtype=object)[codes]
+
+
+def _with_nulls(values: np.ndarray, null_ratio: float, rng: np.random.Generator) -> np.ndarray:
+    if null_ratio == 0:
+        return values
+    values = values.astype(object) if values.dtype.kind != "f" else values.copy()
+    values[rng.random(len(values)) < null_ratio] = None if values.dtype == object else np.nan
+    return values
+
+
+@cache
+def generate_dataframe(spec: DataSpec) -> pd.DataFrame:
+    """
+    Generates a DataFrame with the following columns:
+
+    - `id`: unique integers
+    - `group` and `category`: texts of low and configurable cardinality
+    - `label`: texts with surrounding spaces, mixed case and a "-" delimiter, one distinct value per category
+    - `amount` and `year` (2019 or 2020): integers, `value` and `ratio` (between 0 and 1): floats
+    - `date` and `end_date`: dates, `date_text`: `date` formatted as "%Y-%m-%d"
+    - `timestamp`: unique dates
+    - `flag`: booleans
+
+    Generated DataFrames are cached: they must not be modified.
+    """
+    rng = np.random.default_rng(spec.seed)
+    rows = spec.rows
+    category_codes = rng.integers(0, spec.cardinality, rows)
+    group_count = max(spec.cardinality // 10, 1)
+    day_offsets = rng.integers(0, DATES_COUNT, rows)
+    dates = pd.date_range(START_DATE, periods=DATES_COUNT, freq="D")
+
+    df = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "group": _texts("group_{}", group_count, category_codes % group_count),
+            "category": _texts("category_{}", spec.cardinality, category_codes),
+            "label": _with_nulls(_texts("  Label-{} Text  ", spec.cardinality, category_codes), spec.null_ratio, rng),
+            "amount": rng.integers(0, 1000, rows),
+            "year": rng.integers(2019, 2021, rows),
+            "value": _with_nulls(rng.normal(100, 25, rows), spec.null_ratio, rng),
+            "ratio": rng.random(rows),
+            "date": dates[day_offsets],
+            "end_date": dates[day_offsets] + pd.to_timedelta(rng.integers(0, 30, rows), unit="D"),
+            "date_text": np.array(dates.strftime("%Y-%m-%d"), dtype=object)[day_offsets],
+            "timestamp": START_DATE + pd.to_timedelta(np.arange(rows), unit="s"),
+            "flag": rng.random(rows) < 0.5,
+        }
+    )
+    if spec.text_dtype == "string":
+        text_columns = ["group", "category", "label", "date_text"]
+        df[text_columns] = df[text_columns].astype("string")
+    if spec.geometry:
+        return GeoDataFrame(df, geometry=points_from_xy(rng.random(rows) * 10, rng.random(rows) * 10))
+    return df
@@ -0,0 +1,206 @@
+"""
+Benchmarked pandas steps and pipelines, applying to DataFrames produced by `data.generate_dataframe`.
+
+Every step executor must have a case here.
+"""
+
+# Domain of the generated DataFrame
+DOMAIN = "data"
+
+_SUM_OF_AMOUNTS = {"columns": ["amount"], "aggfunction": "sum", "newcolumns": ["amount"]}
+_AVERAGE_OF_VALUES = {"columns": ["value"], "aggfunction": "avg", "newcolumns": ["average_value"]}
+
+STEP_CASES: dict[str, dict] = {
+    "absolutevalue": {"name": "absolutevalue", "column": "value", "new_column": "absolute_value"},
+    "addmissingdates": {
+        "name": "addmissingdates",
+        "dates_column": "date",
+        "dates_granularity": "day",
+        "groups": ["group"],
+    },
+    "aggregate": {
+        "name": "aggregate",
+        "on": ["group", "category"],
+        "aggregations": [_SUM_OF_AMOUNTS, _AVERAGE_OF_VALUES],
+    },
+    "append": {"name": "append", "pipelines": [DOMAIN]},
+    "argmax": {"name": "argmax", "column": "amount", "groups": ["group"]},
+    "argmin": {"name": "argmin", "column": "value"},
+    "comparetext": {
+        "name": "comparetext",
+        "str_col_1": "group",
+        "str_col_2": "category",
+        "new_column_name": "same_text",
+    },
+    "concatenate": {
+        "name": "concatenate",
+        "columns": ["group", "category"],
+        "separator": " - ",
+        "new_column_name": "group_and_category",
+    },
+    "convert": {"name": "convert", "columns": ["amount"], "data_type": "float"},
+    "cumsum": {
+        "name": "cumsum",
+        "to_cumsum": [["amount", "cumulated_amount"]],
+        "reference_column": "timestamp",
+        "groupby": ["group"],
+    },
+    "dateextract": {
+        "name": "dateextract",
+        "column": "date",
+        "date_info": ["year", "month", "week"],
+        "new_columns": ["date_year", "date_month", "date_week"],
+    },
+    "dategranularity": {"name": "dategranularity", "column": "date", "granularity": "month", "new_column": "month"},
+    "delete": {"name": "delete", "columns": ["label", "ratio"]},
+    "dissolve": {
+        "name": "dissolve",
+        "groups": ["group"],
+        "aggregations": [{"columns": ["amount"], "agg_function": "sum", "new_columns": ["amount"]}],
+    },
+    "domain": {"name": "domain", "domain": DOMAIN},
+    "duplicate": {"name": "duplicate", "column": "label", "new_column_name": "label_copy"},
+    "duration": {
+        "name": "duration",
+        "new_column_name": "duration",
+        "start_date_column": "date",
+        "end_date_column": "end_date",
+        "duration_in": "days",
+    },
+    "evolution": {
+        "name": "evolution",
+        "date_col": "timestamp",
+        "value_col": "amount",
+        "evolution_type": "vsLastDay",
+        "evolution_format": "pct",
+    },
+    "fillna": {"name": "fillna", "columns": ["value"], "value": 0},
+    "filter": {"name": "filter", "condition": {"column": "amount", "operator": "gt", "value": 500}},
+    "formula": {"name": "formula", "new_column": "total", "formula": "amount * ratio + value"},
+    "fromdate": {"name": "fromdate", "column": "date", "format": "%Y-%m-%d"},
+    "hierarchy": {"name": "hierarchy", "hierarchy": ["group", "category"]},
+    "ifthenelse": {
+        "name": "ifthenelse",
+        "new_column": "size",
+        "if": {"column": "amount", "operator": "gt", "value": 500},
+        "then": "'large'",
+        "else": "'small'",
+    },
+    "join": {
+        "name": "join",
+        "type": "left",
+        "right_pipeline": [
+            {"name": "domain", "domain": DOMAIN},
+            {"name": "aggregate", "on": ["category"], "aggregations": [_AVERAGE_OF_VALUES]},
+        ],
+        "on": [["category", "category"]],
+    },
+    "lowercase": {"name": "lowercase", "column": "group"},
+    "movingaverage": {
+        "name": "movingaverage",
+        "value_column": "amount",
+        "column_to_sort": "timestamp",
+        "moving_window": 7,
+        "groups": ["group"],
+    },
+    "percentage": {"name": "percentage", "column": "amount", "group": ["group"]},
+    "pivot": {
+        "name": "pivot",
+        "index": ["group"],
+        "column_to_pivot": "year",
+        "value_column": "amount",
+        "agg_function": "sum",
+    },
+    "rank": {"name": "rank", "value_col": "amount", "order": "desc", "method": "dense", "groupby": ["group"]},
+    "rename": {"name": "rename", "to_rename": [["label", "text"]]},
+    "replace": {"name": "replace", "search_column": "group", "to_replace": [["group_1", "first group"]]},
+    "replacetext": {"name": "replacetext", "search_column": "label", "old_str": "Text", "new_str": "text"},
+    "rollup": {"name": "rollup", "hierarchy": ["group", "category"], "aggregations": [_SUM_OF_AMOUNTS]},
+    "select": {"name": "select", "columns": ["id", "group", "amount"]},
+    "simplify": {"name": "simplify", "tolerance": 1},
+    "sort": {
+        "name": "sort",
+        "columns": [{"column": "amount", "order": "desc"}, {"column": "id", "order": "asc"}],
+    },
+    "split": {"name": "split", "column": "label", "delimiter": "-", "number_cols_to_keep": 2},
+    "statistics": {
+        "name": "statistics",
+        "column": "value",
+        "groupby_columns": ["group"],
+        "statistics": ["average", "count"],
+        "quantiles": [{"label": "median", "nth": 1, "order": 2}],
+    },
+    "substring": {"name": "substring", "column": "category", "start_index": 1, "end_index": 5},
+    "text": {"name": "text", "text": "constant", "new_column": "constant"},
+    "todate": {"name": "todate", "column": "date_text", "format": "%Y-%m-%d"},
+    "top": {"name": "top", "rank_on": "amount", "sort": "desc", "limit": 10, "groups": ["group"]},
+    "totals": {
+        "name": "totals",
+        "total_dimensions": [{"total_column": "group", "total_rows_label": "All groups"}],
+        "aggregations": [_SUM_OF_AMOUNTS],
+        "groups": ["year"],
+    },
+    "trim": {"name": "trim", "columns": ["label"]},
+    "uniquegroups": {"name": "uniquegroups", "on": ["group", "year"]},
+    "unpivot": {
+        "name": "unpivot",
+        "keep": ["id"],
+        "unpivot": ["amount", "value"],
+        "unpivot_column_name": "metric",
+        "value_column_name": "metric_value",
+        "dropna": True,
+    },
+    "uppercase": {"name": "uppercase", "column": "label"},
+    "waterfall": {
+        "name": "waterfall",
+        "valueColumn": "amount",
+        "milestonesColumn": "year",
+        "start": 2019,
+        "end": 2020,
+        "labelsColumn": "category",
+        "sortBy": "value",
+        "order": "desc",
+    },
+}
+
+# Steps requiring a GeoDataFrame
+GEOMETRY_STEPS = {"dissolve", "hierarchy", "simplify"}
+
+PIPELINE_CASES: dict[str, list[dict]] = {
+    "dashboard": [
+        {"name": "domain", "domain": DOMAIN},
+        {"name": "filter", "condition": {"column": "year", "operator": "eq", "value": 2020}},
+        {"name": "formula", "new_column": "total", "formula": "amount * ratio"},
+        {"name": "aggregate", "on": ["group"], "aggregations": [_SUM_OF_AMOUNTS, _AVERAGE_OF_VALUES]},
+        {"name": "sort", "columns": [{"column": "amount", "order": "desc"}]},
+    ],
+    "cleaning": [
+        {"name": "domain", "domain": DOMAIN},
+        {"name": "trim", "columns": ["label"]},
+        {"name": "uppercase", "column": "label"},
+        {"name": "split", "column": "label", "delimiter": "-", "number_cols_to_keep": 2},
+        {"name": "convert", "columns": ["amount"], "data_type": "float"},
+        {"name": "fillna", "columns": ["value"], "value": 0},
+        {"name": "select", "columns": ["id", "label_1", "label_2", "amount", "value"]},
+    ],
+    "enrichment": [
+        {"name": "domain", "domain": DOMAIN},
+        STEP_CASES["join"],
+        {"name": "top", "rank_on": "amount", "sort": "desc", "limit": 100, "groups": ["category"]},
+        {"name": "percentage", "column": "amount", "group": ["group"]},
+    ],
+    "time_series": [
+        {"name": "domain", "domain": DOMAIN},
+        {"name": "dategranularity", "column": "date", "granularity": "month"},
+        {"name": "aggregate", "on": ["group", "date"], "aggregations": [_SUM_OF_AMOUNTS]},
+        {
+            "name": "evolution",
+            "date_col": "date",
+            "value_col": "amount",
+            "evolution_type": "vsLastMonth",
+            "evolution_format": "abs",
+            "index_columns": ["group"],
+        },
+        {"name": "cumsum", "to_cumsum": [["amount", "cumulated_amount"]], "reference_column": "date"},
+    ],
+}
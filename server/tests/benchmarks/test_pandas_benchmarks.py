@@ -0,0 +1,160 @@
+"""
+Benchmarks of the pandas executor.
+
+They run on 10,000 rows by default, for every combination of cardinality (100 and 10,000 distinct categories), ratio
+of missing values (0 and 10%) and dtype of the text columns (object and string). Other values can be given as
+comma-separated lists in the `WEAVERBIRD_BENCHMARK_ROWS`, `WEAVERBIRD_BENCHMARK_CARDINALITIES`,
+`WEAVERBIRD_BENCHMARK_NULL_RATIOS` and `WEAVERBIRD_BENCHMARK_TEXT_DTYPES` environment variables. Use `make benchmark`
+to produce a JSON report which can be compared with previous ones (see pytest-benchmark's `--benchmark-compare`). The
+benchmarks of the waterfall step with many labels and of the addmissingdates and top steps with many groups have sizes
+of their own.
+
+Benchmarks are marked as `slow_benchmark`, so that they are only run with `--benchmark-only`.
+"""
+
+import os
+from dataclasses import replace
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.benchmarks.data import START_DATE, DataSpec, generate_dataframe
+from tests.benchmarks.pandas_steps import GEOMETRY_STEPS, PIPELINE_CASES, STEP_CASES
+from weaverbird.backends.pandas_executor import execute_pipeline
+from weaverbird.backends.pandas_executor.steps import steps_executors
+from weaverbird.pipeline import Pipeline
+from weaverbird.pipeline.steps import AddMissingDatesStep, TopStep, WaterfallStep
+
+ROWS = [int(rows) for rows in os.environ.get("WEAVERBIRD_BENCHMARK_ROWS", "10000").split(",")]
+CARDINALITIES = [int(value) for value in os.environ.get("WEAVERBIRD_BENCHMARK_CARDINALITIES", "100,10000").split(",")]
+NULL_RATIOS = [float(value) for value in os.environ.get("WEAVERBIRD_BENCHMARK_NULL_RATIOS", "0,0.1").split(",")]
+TEXT_DTYPES = os.environ.get("WEAVERBIRD_BENCHMARK_TEXT_DTYPES", "object,string").split(",")
+ROUNDS = 5
+
+
+def _domain_retriever(spec: DataSpec):
+    # Shallow copies, so that steps modifying their input do not alter the cached DataFrame
+    return lambda domain: generate_dataframe(spec).copy(deep=False)
+
+
+def test_every_step_is_benchmarked():
+    assert STEP_CASES.keys() == steps_executors.keys()
+
+
+def _data_specs(**kwargs) -> list[DataSpec]:
+    return [
+        DataSpec(rows=rows, cardinality=cardinality, null_ratio=null_ratio, text_dtype=text_dtype, **kwargs)
+        for rows, cardinality, null_ratio, text_dtype in product(ROWS, CARDINALITIES, NULL_RATIOS, TEXT_DTYPES)
+    ]
+
+
+def _data_spec_id(spec: DataSpec) -> str:
+    return f"rows={spec.rows}-cardinality={spec.cardinality}-nulls={spec.null_ratio}-text={spec.text_dtype}"
+
+
+def _data_spec_info(spec: DataSpec) -> dict:
+    return {
+        "rows": spec.rows,
+        "cardinality": spec.cardinality,
+        "null_ratio": spec.null_ratio,
+        "text_dtype": spec.text_dtype,
+    }
+
+
+@pytest.mark.slow_benchmark
+@pytest.mark.parametrize("spec", _data_specs(), ids=_data_spec_id)
+@pytest.mark.parametrize("step_name", sorted(STEP_CASES))
+def test_benchmark_step(benchmark, step_name, spec):
+    spec = replace(spec, geometry=step_name in GEOMETRY_STEPS)
+    step = Pipeline(steps=[STEP_CASES[step_name]]).steps[0]
+    df = generate_dataframe(spec)
+    domain_retriever = _domain_retriever(spec)
+
+    benchmark.group = f"step:{step_name}"
+    benchmark.extra_info.update({"step": step_name, **_data_spec_info(spec)})
+    benchmark.pedantic(
+        steps_executors[step.name],
+        setup=lambda: (
+            (step, df.copy(deep=False)),
+            {"domain_retriever": domain_retriever, "execute_pipeline": execute_pipeline},
+        ),
+        rounds=ROUNDS,
+    )
+
+
+@pytest.mark.slow_benchmark
+@pytest.mark.parametrize("spec", _data_specs(), ids=_data_spec_id)
+@pytest.mark.parametrize("pipeline_name", sorted(PIPELINE_CASES))
+def test_benchmark_pipeline(benchmark, pipeline_name, spec):
+    pipeline = Pipeline(steps=PIPELINE_CASES[pipeline_name])
+
+    benchmark.group = f"pipeline:{pipeline_name}"
+    benchmark.extra_info.update({"pipeline": pipeline_name, **_data_spec_info(spec)})
+    benchmark.pedantic(execute_pipeline, args=(pipeline, _domain_retriever(spec)), rounds=ROUNDS)
+
+
+@pytest.mark.slow_benchmark
+@pytest.mark.parametrize("backfill", [True, False])
+def test_benchmark_waterfall_with_many_labels(benchmark, backfill):
+    # 1M rows and 10k labels. Milestones are single days, so that many labels are missing at the start or at the end
+    # of the waterfall, and are either backfilled or removed
+    spec = DataSpec(rows=1_000_000, cardinality=10_000)
+    step = WaterfallStep(
+        valueColumn="amount",
+        milestonesColumn="date",
+        start=START_DATE,
+        end=START_DATE + pd.Timedelta(days=365),
+        labelsColumn="category",
+        groupby=["group"],
+        sortBy="value",
+        order="desc",
+        backfill=backfill,
+    )
+    df = generate_dataframe(spec)
+
+    benchmark.group = "step:waterfall-many-labels"
+    benchmark.extra_info.update({"step": "waterfall", "rows": spec.rows, "labels": spec.cardinality})
+    benchmark.pedantic(steps_executors["waterfall"], setup=lambda: ((step, df.copy(deep=False)), {}), rounds=ROUNDS)
+
+
+@pytest.mark.slow_benchmark
+def test_benchmark_addmissingdates_with_many_groups(benchmark):
+    # 50k groups of 10 rows, with dates spread over 30 days, so that most of the dates of each group are missing
+    rng = np.random.default_rng(0)
+    groups_count = 50_000
+    rows_count = 10 * groups_count
+    df = pd.DataFrame(
+        {
+            "group": rng.integers(0, groups_count, rows_count),
+            "date": START_DATE + pd.to_timedelta(rng.integers(0, 30, rows_count), "D"),
+            "value": rng.random(rows_count),
+        }
+    )
+    step = AddMissingDatesStep(dates_column="date", dates_granularity="day", groups=["group"])
+
+    benchmark.group = "step:addmissingdates-many-groups"
+    benchmark.extra_info.update({"step": "addmissingdates", "rows": rows_count, "groups": groups_count})
+    benchmark.pedantic(
+        steps_executors["addmissingdates"], setup=lambda: ((step, df.copy(deep=False)), {}), rounds=ROUNDS
+    )
+
+
+@pytest.mark.slow_benchmark
+@pytest.mark.parametrize("groups_count", [100, 10_000, 100_000])
+def test_benchmark_top_with_many_groups(benchmark, groups_count):
+    rng = np.random.default_rng(0)
+    rows_count = 10 * groups_count
+    df = pd.DataFrame(
+        {
+            "value": rng.random(rows_count),
+            "id": np.arange(rows_count),
+            "group": rng.integers(0, groups_count, rows_count),
+        }
+    )
+    step = TopStep(rank_on="value", groups=["group"], sort="desc", limit=3)
+
+    benchmark.group = "step:top-many-groups"
+    benchmark.extra_info.update({"step": "top", "rows": rows_count, "groups": groups_count})
+    benchmark.pedantic(steps_executors["top"], setup=lambda: ((step, df.copy(deep=False)), {}), rounds=ROUNDS)
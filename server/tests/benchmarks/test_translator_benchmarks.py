@@ -0,0 +1,110 @@
+"""
+Benchmarks of the translation of pipelines into SQL queries and Mongo aggregation pipelines.
+
+Translations do not depend on any data: they are benchmarked against the number of steps of the pipeline, the depth
+of its nested sub-pipelines and the SQL dialect. The peak memory allocated by a translation is reported in the
+`peak_memory_in_bytes` extra info of each benchmark. They are only run with `--benchmark-only`.
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from itertools import count
+
+import pytest
+
+from tests.benchmarks.translator_pipelines import TABLES_COLUMNS, dashboard_steps, nested_steps
+from weaverbird.backends.mongo_translator.mongo_pipeline_translator import translate_pipeline as translate_to_mongo
+from weaverbird.backends.pypika_translator.cache import TranslationCache
+from weaverbird.backends.pypika_translator.dialects import SQLDialect
+from weaverbird.backends.pypika_translator.translate import translate_pipeline as translate_to_sql
+from weaverbird.pipeline import Pipeline
+
+pytestmark = pytest.mark.slow_benchmark
+
+STEPS_COUNTS = [10, 40, 80]
+DEPTHS = [1, 2, 4]
+ROUNDS = 5
+# The MySQL translator is not fully implemented, and cannot be instantiated
+SQL_DIALECTS = [dialect for dialect in SQLDialect if dialect != SQLDialect.MYSQL]
+
+
+def _peak_memory(translate: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        translate()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _benchmark_translation(benchmark, translate: Callable[[], object], group: str, **extra_info) -> None:
+    benchmark.group = group
+    benchmark.extra_info.update({**extra_info, "peak_memory_in_bytes": _peak_memory(translate)})
+    benchmark.pedantic(translate, rounds=ROUNDS)
+
+
+def _translate_to_sql(sql_dialect: SQLDialect, pipeline: Pipeline) -> Callable[[], str]:
+    return lambda: translate_to_sql(sql_dialect=sql_dialect, pipeline=pipeline, tables_columns=TABLES_COLUMNS)
+
+
+@pytest.mark.parametrize("steps_count", STEPS_COUNTS)
+@pytest.mark.parametrize("sql_dialect", SQL_DIALECTS)
+def test_benchmark_sql_translation(benchmark, sql_dialect, steps_count):
+    pipeline = Pipeline(steps=dashboard_steps(steps_count))
+    _benchmark_translation(
+        benchmark,
+        _translate_to_sql(sql_dialect, pipeline),
+        group=f"sql:steps:{steps_count}",
+        dialect=sql_dialect.value,
+        steps_count=steps_count,
+    )
+
+
+@pytest.mark.parametrize("steps_count", STEPS_COUNTS)
+def test_benchmark_cached_sql_translation(benchmark, steps_count):
+    # Every round requests another page of a pipeline, whose query builder is cached
+    pipeline = Pipeline(steps=dashboard_steps(steps_count))
+    cache = TranslationCache()
+    pages = count()
+
+    def translate() -> str:
+        return translate_to_sql(
+            sql_dialect=SQLDialect.POSTGRES,
+            pipeline=pipeline,
+            tables_columns=TABLES_COLUMNS,
+            offset=next(pages) * 50,
+            limit=50,
+            cache=cache,
+        )
+
+    translate()
+    _benchmark_translation(
+        benchmark, translate, group=f"sql:steps:{steps_count}", dialect="postgresql-cached", steps_count=steps_count
+    )
+
+
+@pytest.mark.parametrize("depth", DEPTHS)
+@pytest.mark.parametrize("sql_dialect", SQL_DIALECTS)
+def test_benchmark_nested_sql_translation(benchmark, sql_dialect, depth):
+    pipeline = Pipeline(steps=nested_steps(depth))
+    _benchmark_translation(
+        benchmark,
+        _translate_to_sql(sql_dialect, pipeline),
+        group=f"sql:depth:{depth}",
+        dialect=sql_dialect.value,
+        depth=depth,
+    )
+
+
+@pytest.mark.parametrize("steps_count", STEPS_COUNTS)
+def test_benchmark_mongo_translation(benchmark, steps_count):
+    pipeline = Pipeline(steps=dashboard_steps(steps_count))
+    _benchmark_translation(
+        benchmark, lambda: translate_to_mongo(pipeline), group="mongo:steps", steps_count=steps_count
+    )
+
+
+@pytest.mark.parametrize("depth", DEPTHS)
+def test_benchmark_nested_mongo_translation(benchmark, depth):
+    pipeline = Pipeline(steps=nested_steps(depth))
+    _benchmark_translation(benchmark, lambda: translate_to_mongo(pipeline), group="mongo:depth", depth=depth)
@@ -0,0 +1,85 @@
+"""
+Benchmarked pipelines for the SQL and Mongo translators.
+
+They are built from blocks of steps typical of dashboards (filters, computed columns, text formatting, renames,
+aggregations and sorts), repeated to reach a given number of steps, and can nest `append` and `join` sub-pipelines
+to a given depth.
+"""
+
+# Table queried by the pipelines, and its columns
+TABLE = "sales"
+TABLE_COLUMNS = ["id", "region", "city", "product", "label", "amount", "price", "quantity", "date"]
+TABLES_COLUMNS = {TABLE: TABLE_COLUMNS}
+
+
+def _dashboard_block(index: int) -> list[dict]:
+    return [
+        {"name": "filter", "condition": {"column": "amount", "operator": "gt", "value": index}},
+        {"name": "formula", "new_column": f"revenue_{index}", "formula": "price * quantity"},
+        {
+            "name": "ifthenelse",
+            "new_column": f"size_{index}",
+            "if": {"column": "amount", "operator": "ge", "value": 1000},
+            "then": "'large'",
+            "else": "'small'",
+        },
+        {"name": "uppercase", "column": "city"},
+        {"name": "text", "new_column": f"currency_{index}", "text": "EUR"},
+        {"name": "rename", "to_rename": [[f"currency_{index}", f"unit_{index}"]]},
+        {"name": "sort", "columns": [{"column": "amount", "order": "desc"}]},
+        {
+            "name": "filter",
+            "condition": {
+                "or": [
+                    {"column": "region", "operator": "in", "value": ["north", "south"]},
+                    {"column": "label", "operator": "matches", "value": f"^promo_{index}"},
+                ]
+            },
+        },
+    ]
+
+
+def dashboard_steps(steps_count: int) -> list[dict]:
+    """A pipeline of `steps_count` steps (including its domain step), ending with an aggregation"""
+    steps: list[dict] = [{"name": "domain", "domain": TABLE}]
+    index = 0
+    while len(steps) < steps_count - 1:
+        steps.extend(_dashboard_block(index))
+        index += 1
+    steps = steps[: steps_count - 1]
+    steps.append(
+        {
+            "name": "aggregate",
+            "on": ["region", "city"],
+            "aggregations": [
+                {"columns": ["amount"], "newcolumns": ["total_amount"], "aggfunction": "sum"},
+                {"columns": ["price"], "newcolumns": ["average_price"], "aggfunction": "avg"},
+            ],
+        }
+    )
+    return steps
+
+
+def nested_steps(depth: int) -> list[dict]:
+    """
+    A pipeline whose `append` and `join` steps have sub-pipelines, themselves having sub-pipelines, down to `depth`
+    levels.
+    """
+    steps: list[dict] = [
+        {"name": "domain", "domain": TABLE},
+        {"name": "filter", "condition": {"column": "amount", "operator": "gt", "value": depth}},
+        {"name": "select", "columns": ["region", "city", "amount"]},
+    ]
+    if depth == 0:
+        return steps
+    sub_steps = nested_steps(depth - 1)
+    return steps + [
+        {"name": "append", "pipelines": [sub_steps]},
+        {
+            "name": "join",
+            "type": "left",
+            "right_pipeline": sub_steps + [{"name": "rename", "to_rename": [["amount", f"amount_{depth}"]]}],
+            "on": [["region", "region"], ["city", "city"]],
+        },
+        {"name": "select", "columns": ["region", "city", "amount"]},
+    ]
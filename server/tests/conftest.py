@@ -13,3 +13,13 @@ def available_variables():
         "INTEGER_LIST": [1, 2, 3],
         "VOID": "__VOID__",
     }
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    # Slow benchmarks are only run with `--benchmark-only` (cf. `make benchmark`)
+    if config.getoption("benchmark_only"):
+        return
+    slow_benchmarks = [item for item in items if item.get_closest_marker("slow_benchmark")]
+    if slow_benchmarks:
+        config.hook.pytest_deselected(items=slow_benchmarks)
+        items[:] = [item for item in items if not item.get_closest_marker("slow_benchmark")]
@@ -0,0 +1,84 @@
+from weaverbird.pipeline import Pipeline, PipelineWithVariables
+
+
+def _filter_pipeline(condition: dict) -> Pipeline:
+    return Pipeline(steps=[{"name": "domain", "domain": "sales"}, {"name": "filter", "condition": condition}])
+
+
+def test_fingerprint_prefix_digests():
+    fingerprint = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "sales"},
+            {"name": "uppercase", "column": "city"},
+            {"name": "lowercase", "column": "city"},
+        ]
+    ).fingerprint()
+    assert len(fingerprint.prefix_digests) == 3
+    assert fingerprint.digest == fingerprint.prefix_digests[-1]
+    assert len(set(fingerprint.prefix_digests)) == 3
+
+    prefix_fingerprint = Pipeline(
+        steps=[{"name": "domain", "domain": "sales"}, {"name": "uppercase", "column": "city"}]
+    ).fingerprint()
+    assert prefix_fingerprint.prefix_digests == fingerprint.prefix_digests[:2]
+
+
+def test_fingerprint_ignores_field_order_and_defaults():
+    first = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "sales"},
+            {"name": "rename", "toRename": [["a", "b"]]},
+            {"aggregations": [], "on": ["b"], "name": "aggregate", "keepOriginalGranularity": False},
+        ]
+    )
+    second = Pipeline(
+        steps=[
+            {"domain": "sales", "name": "domain"},
+            {"name": "rename", "oldname": "a", "newname": "b"},
+            {"name": "aggregate", "on": ["b"], "aggregations": []},
+        ]
+    )
+    assert first.fingerprint() == second.fingerprint()
+
+
+def test_fingerprint_normalizes_conditions():
+    a = {"column": "a", "operator": "eq", "value": 1}
+    b = {"column": "b", "operator": "in", "value": [2, 1, 2]}
+    c = {"column": "c", "operator": "isnull"}
+
+    reference = _filter_pipeline({"and": [a, b, c]}).fingerprint()
+    assert _filter_pipeline({"and": [c, {"and": [b, a]}]}).fingerprint() == reference
+    assert _filter_pipeline({"and": [a, {"column": "b", "operator": "in", "value": [1, 2]}, c]}).fingerprint() == (
+        reference
+    )
+    assert _filter_pipeline({"or": [a]}).fingerprint() == _filter_pipeline(a).fingerprint()
+    assert _filter_pipeline({"or": [a, b, c]}).fingerprint() != reference
+
+
+def test_fingerprint_of_sub_pipelines_and_variables():
+    steps = [
+        {"name": "domain", "domain": "sales"},
+        {
+            "name": "append",
+            "pipelines": [
+                [
+                    {"name": "domain", "domain": "other"},
+                    {"name": "filter", "condition": {"and": [{"column": "a", "operator": "eq", "value": None}]}},
+                ]
+            ],
+        },
+    ]
+    equivalent_steps = [
+        steps[0],
+        {
+            "name": "append",
+            "pipelines": [
+                [
+                    {"name": "domain", "domain": "other"},
+                    {"name": "filter", "condition": {"column": "a", "operator": "eq", "value": None}},
+                ]
+            ],
+        },
+    ]
+    assert Pipeline(steps=steps).fingerprint() == Pipeline(steps=equivalent_steps).fingerprint()
+    assert PipelineWithVariables(steps=steps).fingerprint() == Pipeline(steps=steps).fingerprint()
@@ -3,6 +3,7 @@ import random
 from datetime import timedelta
 from typing import Any, cast
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -186,3 +187,64 @@ def test_add_missing_dates_with_tz_aware_timestamps():
     assert_dataframes_equals(result, expected_result)
     assert isinstance(result["date"][1], pd.Timestamp)
     assert result["date"].dtype.name.startswith("datetime64")
+
+
+def test_missing_weeks_with_groups_and_several_dates_in_a_period():
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2022-01-05", "2022-01-04", "2022-01-26", "2022-01-12", "2022-01-03"]),
+            "country": ["France", "France", "France", "USA", "USA"],
+            "value": [1, 2, 3, 4, 5],
+        }
+    )
+    step = AddMissingDatesStep(name="addmissingdates", datesColumn="date", datesGranularity="week", groups=["country"])
+    result = execute_addmissingdates(step, df)
+    # The earliest date of a week is kept, and missing weeks start on mondays
+    expected_result = pd.DataFrame(
+        {
+            "date": pd.to_datetime(
+                ["2022-01-04", "2022-01-10", "2022-01-17", "2022-01-26", "2022-01-03", "2022-01-12"]
+            ),
+            "country": ["France"] * 4 + ["USA"] * 2,
+            "value": [2, None, None, 3, 5, 4],
+        }
+    )
+    assert_dataframes_equals(result, expected_result)
+
+
+def test_missing_dates_with_categorical_groups():
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2022-01-01", "2022-01-04", "2022-01-03"]),
+            "country": pd.Categorical(["France", "France", "USA"], categories=["France", "USA", "Spain"]),
+            "value": [1, 2, 3],
+        }
+    )
+    step = AddMissingDatesStep(name="addmissingdates", datesColumn="date", datesGranularity="day", groups=["country"])
+    result = execute_addmissingdates(step, df)
+    # Unused categories have no dates, and each group only spans its own dates
+    expected_result = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2022-01-01", "2022-01-02", "2022-01-03", "2022-01-04", "2022-01-03"]),
+            "country": pd.Categorical(["France"] * 4 + ["USA"], categories=["France", "USA", "Spain"]),
+            "value": [1, None, None, 2, 3],
+        }
+    )
+    assert_dataframes_equals(result, expected_result)
+
+
+def test_benchmark_addmissingdates_with_many_groups(benchmark):
+    # Larger sizes are benchmarked in tests/benchmarks
+    rng = np.random.default_rng(0)
+    groups_count = 1_000
+    rows_count = 10 * groups_count
+    df = pd.DataFrame(
+        {
+            "group": rng.integers(0, groups_count, rows_count),
+            "date": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 30, rows_count), "D"),
+            "value": rng.random(rows_count),
+        }
+    )
+
+    step = AddMissingDatesStep(name="addmissingdates", datesColumn="date", datesGranularity="day", groups=["group"])
+    benchmark(execute_addmissingdates, step, df)
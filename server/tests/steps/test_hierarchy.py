@@ -0,0 +1,29 @@
+import geopandas as gpd
+from shapely.geometry import MultiPoint, Point
+
+from weaverbird.backends.pandas_executor.steps.hierarchy import execute_hierarchy
+from weaverbird.pipeline.steps.hierarchy import HierarchyStep
+
+
+def test_hierarchy_with_null_values():
+    df = gpd.GeoDataFrame(
+        {
+            "country": ["space", "space", "space", None],
+            "region": ["region_1", "region_1", None, "region_2"],
+            "city": ["city_1", None, "city_3", "city_4"],
+            "geometry": [Point(0, 0), Point(1, 1), Point(2, 2), Point(3, 3)],
+        }
+    )
+    step = HierarchyStep(name="hierarchy", hierarchy=["country", "region", "city"], hierarchy_level_column="level")
+    df_result = execute_hierarchy(step, df)
+
+    assert df_result["level"].tolist() == [3, 3, 3, 3, 2, 1, 0]
+    dissolved = df_result[df_result["level"] < 3]
+    assert dissolved["country"].tolist() == ["space", "space", "space"]
+    assert dissolved["region"].tolist()[:2] == ["region_1", "region_1"]
+    # Rows with null values at a level are still part of the coarser levels
+    assert (
+        gpd.GeoSeries(dissolved["geometry"].tolist())
+        .geom_equals(gpd.GeoSeries([Point(0, 0), MultiPoint([(0, 0), (1, 1)]), MultiPoint([(0, 0), (1, 1), (2, 2)])]))
+        .all()
+    )
@@ -1,11 +1,13 @@
 import random
 
+import numpy as np
 import pytest
 from pandas import DataFrame
 
 from tests.utils import assert_dataframes_equals
+from weaverbird.backends.pandas_executor.steps.aggregate import execute_aggregate
 from weaverbird.backends.pandas_executor.steps.rollup import execute_rollup
-from weaverbird.pipeline.steps import RollupStep
+from weaverbird.pipeline.steps import AggregateStep, RollupStep
 
 
 @pytest.fixture
@@ -160,6 +162,65 @@ def test_complex_rollup(sample_df: DataFrame):
     assert_dataframes_equals(df_result, expected_result)
 
 
+@pytest.mark.parametrize("categorical", [False, True])
+def test_rollup_levels_are_aggregations_of_the_input(categorical: bool):
+    rng = np.random.default_rng(42)
+    size = 500
+    sample_df = DataFrame(
+        {
+            "CONTINENT": rng.choice(["Europe", "Asia", None], size),
+            "COUNTRY": rng.choice(["A", "B", "C", None], size),
+            "CITY": rng.choice(["X", "Y", "Z", None], size),
+            "YEAR": rng.choice([2018, 2019], size),
+            "VALUE": np.where(rng.random(size) < 0.2, np.nan, rng.normal(size=size)),
+            "COUNT": rng.integers(0, 10, size),
+            "NAME": rng.choice(["a", "b", "c"], size),
+            "NULLABLE_NAME": rng.choice(["a", "b", "c", None], size),
+        }
+    )
+    if categorical:
+        sample_df["CONTINENT"] = sample_df["CONTINENT"].astype("category").cat.add_categories("Africa")
+    # Coarser levels are derived from finer ones, except for count distinct and sums of strings
+    aggregations = [
+        {
+            "newcolumns": ["VALUE-sum", "COUNT-sum", "NAME-sum"],
+            "aggfunction": "sum",
+            "columns": ["VALUE", "COUNT", "NAME"],
+        },
+        {"newcolumns": ["VALUE-avg", "COUNT-avg"], "aggfunction": "avg", "columns": ["VALUE", "COUNT"]},
+        {"newcolumns": ["VALUE-min", "NAME-min"], "aggfunction": "min", "columns": ["VALUE", "NAME"]},
+        {"newcolumns": ["VALUE-max", "NAME-max"], "aggfunction": "max", "columns": ["VALUE", "NAME"]},
+        {
+            "newcolumns": ["VALUE-count", "NULLABLE_NAME-count"],
+            "aggfunction": "count",
+            "columns": ["VALUE", "NULLABLE_NAME"],
+        },
+        {
+            "newcolumns": ["VALUE-first", "NULLABLE_NAME-first"],
+            "aggfunction": "first",
+            "columns": ["VALUE", "NULLABLE_NAME"],
+        },
+        {
+            "newcolumns": ["VALUE-last", "NULLABLE_NAME-last"],
+            "aggfunction": "last",
+            "columns": ["VALUE", "NULLABLE_NAME"],
+        },
+        {"newcolumns": ["NULLABLE_NAME-count-distinct"], "aggfunction": "count distinct", "columns": ["NULLABLE_NAME"]},
+    ]
+    hierarchy = ["CONTINENT", "COUNTRY", "CITY"]
+    step = RollupStep(name="rollup", hierarchy=hierarchy, groupby=["YEAR"], aggregations=aggregations)
+    df_result = execute_rollup(step, sample_df)
+
+    for idx, level in enumerate(hierarchy):
+        on = ["YEAR"] + hierarchy[: idx + 1]
+        expected_result = execute_aggregate(
+            AggregateStep(name="aggregate", on=on, aggregations=aggregations, keep_original_granularity=False),
+            sample_df,
+        )
+        level_result = df_result[df_result["level"] == level][expected_result.columns]
+        assert_dataframes_equals(level_result, expected_result)
+
+
 def _make_benchmark_data():
     cities = {
         "France": ["Paris", "Bordeaux"],
@@ -187,3 +248,21 @@ def test_benchmark_rollup(benchmark):
         ],
     )
     benchmark(execute_rollup, step, df)
+
+
+def test_benchmark_rollup_deep_hierarchy(benchmark):
+    rng = np.random.default_rng(42)
+    size = 100_000
+    hierarchy = ["LEVEL_1", "LEVEL_2", "LEVEL_3", "LEVEL_4", "LEVEL_5"]
+    df = DataFrame({level: rng.integers(0, 5, size).astype(str) for level in hierarchy})
+    df["VALUE"] = rng.random(size)
+
+    step = RollupStep(
+        name="rollup",
+        hierarchy=hierarchy,
+        aggregations=[
+            {"newcolumns": ["VALUE-sum"], "aggfunction": "sum", "columns": ["VALUE"]},
+            {"newcolumns": ["VALUE-avg"], "aggfunction": "avg", "columns": ["VALUE"]},
+        ],
+    )
+    benchmark(execute_rollup, step, df)
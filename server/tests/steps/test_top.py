@@ -62,3 +62,42 @@ def test_benchmark_top(benchmark):
 
     step = TopStep(name="top", rank_on="value", groups=["group"], sort="desc", limit=1)
     benchmark(execute_top, step, df)
+
+
+def test_top_with_groups_keeps_ties_in_order_and_drops_null_groups():
+    df = DataFrame(
+        {
+            "Label": [f"Label {i + 1}" for i in range(6)],
+            "Group": ["Group 2", None, "Group 1", "Group 2", "Group 1", "Group 2"],
+            "Value": [5, 100, 3, 5, 4, 1],
+        }
+    )
+    step = TopStep(name="top", rank_on="Value", groups=["Group"], sort="desc", limit=2)
+    result = execute_top(step, df)
+    assert_dataframes_equals(
+        result,
+        DataFrame(
+            {
+                "Label": ["Label 5", "Label 3", "Label 1", "Label 4"],
+                "Group": ["Group 1", "Group 1", "Group 2", "Group 2"],
+                "Value": [4, 3, 5, 5],
+            }
+        ),
+    )
+
+
+def test_benchmark_top_with_many_groups(benchmark):
+    # The top rows of all the groups are computed with a single sort, instead of sorting each group in a callback.
+    # Larger sizes are benchmarked in tests/benchmarks
+    groups_count = 1_000
+    rows_count = 10 * groups_count
+    df = DataFrame(
+        {
+            "value": np.random.random(rows_count),
+            "id": list(range(rows_count)),
+            "group": np.random.randint(0, groups_count, rows_count),
+        }
+    )
+
+    step = TopStep(name="top", rank_on="value", groups=["group"], sort="desc", limit=3)
+    benchmark(execute_top, step, df)
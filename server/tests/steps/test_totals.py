@@ -160,3 +160,69 @@ def test_benchmark_totals(benchmark):
         groups=[],
     )
     benchmark(execute_totals, step, df)
+
+
+def test_totals_4_dimensions_with_groups():
+    sample_df = pd.DataFrame(
+        {
+            "COUNTRY": ["France", "USA"] * 8,
+            "PRODUCT": (["product A"] * 2 + ["product B"] * 2) * 4,
+            "YEAR": (["2019"] * 4 + ["2020"] * 4) * 2,
+            "CHANNEL": ["online"] * 8 + ["store"] * 8,
+            "REGION": ["EMEA", "AMER"] * 8,
+            "VALUE": list(range(16)),
+        }
+    )
+    step = TotalsStep(
+        name="totals",
+        totalDimensions=[
+            TotalDimension(total_column="PRODUCT", total_rows_label="All products"),
+            TotalDimension(total_column="YEAR", total_rows_label="All years"),
+            TotalDimension(total_column="CHANNEL", total_rows_label="All channels"),
+            TotalDimension(total_column="COUNTRY", total_rows_label="All countries"),
+        ],
+        aggregations=[Aggregation(columns=["VALUE"], aggfunction="sum", newcolumns=["VALUE"])],
+        groups=["REGION"],
+    )
+
+    result = execute_totals(step, sample_df)
+    # Each region has a single country, and two products, years and channels. Along with their totals, that makes
+    # 3 * 3 * 3 * 2 combinations per region, 8 of which are the original rows
+    assert len(result) == 16 + 2 * (3**3 * 2 - 8)
+    grand_totals = result[
+        (result["PRODUCT"] == "All products")
+        & (result["YEAR"] == "All years")
+        & (result["CHANNEL"] == "All channels")
+        & (result["COUNTRY"] == "All countries")
+    ]
+    assert_dataframes_equals(
+        grand_totals.reset_index(drop=True),
+        pd.DataFrame(
+            {
+                "REGION": ["AMER", "EMEA"],
+                "PRODUCT": ["All products"] * 2,
+                "YEAR": ["All years"] * 2,
+                "CHANNEL": ["All channels"] * 2,
+                "VALUE": [64, 56],
+                "COUNTRY": ["All countries"] * 2,
+            }
+        ),
+    )
+
+
+def test_benchmark_totals_4_dimensions(benchmark):
+    rows = 100_000
+    df = pd.DataFrame(
+        {
+            **{f"dimension_{i}": np.random.randint(0, 10, rows).astype(str) for i in range(4)},
+            "value": np.random.random(rows),
+        }
+    )
+
+    step = TotalsStep(
+        name="totals",
+        totalDimensions=[TotalDimension(total_column=f"dimension_{i}", total_rows_label=f"All {i}") for i in range(4)],
+        aggregations=[Aggregation(columns=["value"], aggfunction="sum", newcolumns=["value"])],
+        groups=[],
+    )
+    benchmark(execute_totals, step, df)
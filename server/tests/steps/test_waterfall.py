@@ -1,6 +1,7 @@
 import random
 
 import pandas as pd
+import pytest
 
 from tests.utils import assert_dataframes_equals
 from weaverbird.backends.pandas_executor.steps.waterfall import execute_waterfall
@@ -242,6 +243,102 @@ def _make_benchmark_data():
     return pd.DataFrame(data, columns=columns)
 
 
+def test_waterfall_with_categorical_labels():
+    sample_df = pd.DataFrame(
+        {
+            "city": pd.Categorical(["Bordeaux", "Paris"] * 2, categories=["Bordeaux", "Paris", "Boston"]),
+            "year": [2018] * 2 + [2019] * 2,
+            "revenue": [98, 385, 135, 450],
+        }
+    )
+    step = WaterfallStep(
+        name="waterfall",
+        valueColumn="revenue",
+        milestonesColumn="year",
+        start=2018,
+        end=2019,
+        labelsColumn="city",
+        sortBy="label",
+        order="asc",
+    )
+    result_df = execute_waterfall(step, sample_df)
+
+    # Unused categories have no rows
+    expected_df = pd.DataFrame(
+        {
+            "LABEL_waterfall": ["2018", "Bordeaux", "Paris", "2019"],
+            "TYPE_waterfall": [None, "parent", "parent", None],
+            "revenue": [483, 37, 65, 585],
+        }
+    )
+    assert_dataframes_equals(result_df, expected_df)
+
+
+def test_waterfall_without_backfill_removes_null_labels_of_a_single_milestone():
+    sample_df = pd.DataFrame(
+        {
+            "city": ["Bordeaux", "Paris", None, "Bordeaux", "Paris"],
+            "year": [2018] * 3 + [2019] * 2,
+            "revenue": [98, 385, 16, 135, 450],
+        }
+    )
+    step = WaterfallStep(
+        name="waterfall",
+        valueColumn="revenue",
+        milestonesColumn="year",
+        start=2018,
+        end=2019,
+        labelsColumn="city",
+        sortBy="label",
+        order="asc",
+        backfill=False,
+    )
+    result_df = execute_waterfall(step, sample_df)
+
+    # Null labels are a group of their own, which is only found at the start: its rows are not part of the total
+    expected_df = pd.DataFrame(
+        {
+            "LABEL_waterfall": ["2018", "Bordeaux", "Paris", "2019"],
+            "TYPE_waterfall": [None, "parent", "parent", None],
+            "revenue": [483, 37, 65, 585],
+        }
+    )
+    assert_dataframes_equals(result_df, expected_df)
+
+
+@pytest.mark.parametrize("backfill", [True, False])
+def test_waterfall_with_null_labels_at_both_milestones(backfill):
+    sample_df = pd.DataFrame(
+        {
+            "city": ["Bordeaux", "Paris", None] * 2,
+            "year": [2018] * 3 + [2019] * 3,
+            "revenue": [98, 385, 16, 135, 450, 40],
+        }
+    )
+    step = WaterfallStep(
+        name="waterfall",
+        valueColumn="revenue",
+        milestonesColumn="year",
+        start=2018,
+        end=2019,
+        labelsColumn="city",
+        sortBy="label",
+        order="asc",
+        backfill=backfill,
+    )
+    result_df = execute_waterfall(step, sample_df)
+
+    # Null labels have a delta of their own, so that the deltas add up from the start total to the end one
+    expected_df = pd.DataFrame(
+        {
+            "LABEL_waterfall": ["2018", "Bordeaux", "Paris", "nan", "2019"],
+            "TYPE_waterfall": [None, "parent", "parent", "parent", None],
+            "revenue": [499, 37, 65, 24, 625],
+        }
+    )
+    assert_dataframes_equals(result_df, expected_df)
+
+
 def test_benchmark_waterfall(benchmark):
     df = _make_benchmark_data()
 
@@ -167,3 +167,52 @@ def test_report(pipeline_executor):
     )
     # there should be one step_report per step in the pipeline
     assert len(report.steps_reports) == 2
+
+
+LARGE_DOMAINS = {"large": pd.DataFrame({"id": range(10_000), "city": [" Paris", "Lyon "] * 5_000})}
+ROW_WISE_PIPELINE = Pipeline(
+    steps=[
+        {"name": "domain", "domain": "large"},
+        {"name": "trim", "columns": ["city"]},
+        {"name": "filter", "condition": {"column": "city", "operator": "eq", "value": "Paris"}},
+        {"name": "formula", "new_column": "double_id", "formula": "id * 2"},
+    ]
+)
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_preview_pipeline_limit_aware(optimize):
+    exact = json.loads(preview_pipeline(ROW_WISE_PIPELINE, LARGE_DOMAINS.__getitem__, limit=10, offset=20))
+    result = json.loads(
+        preview_pipeline(
+            ROW_WISE_PIPELINE, LARGE_DOMAINS.__getitem__, limit=10, offset=20, optimize=optimize, exact_total=False
+        )
+    )
+    assert result["data"] == exact["data"]
+    assert result["schema"] == exact["schema"]
+    # Only the first chunk was processed: half of its rows are kept
+    assert result["total_is_approximate"] is True
+    assert result["total"] == exact["total"] == 5_000
+
+
+def test_preview_pipeline_limit_aware_processes_the_whole_domain_if_needed():
+    pipeline = Pipeline(
+        steps=[
+            {"name": "domain", "domain": "large"},
+            {"name": "filter", "condition": {"column": "id", "operator": "ge", "value": 9_990}},
+        ]
+    )
+    result = json.loads(preview_pipeline(pipeline, LARGE_DOMAINS.__getitem__, exact_total=False))
+    assert [row["id"] for row in result["data"]] == list(range(9_990, 10_000))
+    assert result["total"] == 10
+    assert result["total_is_approximate"] is False
+
+
+def test_preview_pipeline_limit_aware_falls_back_to_complete_execution():
+    pipeline = Pipeline(
+        steps=[*ROW_WISE_PIPELINE.steps, {"name": "sort", "columns": [{"column": "id", "order": "desc"}]}]
+    )
+    result = json.loads(preview_pipeline(pipeline, LARGE_DOMAINS.__getitem__, limit=1, exact_total=False))
+    assert result["data"][0]["id"] == 9_998
+    assert result["total"] == 5_000
+    assert result["total_is_approximate"] is False